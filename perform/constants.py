@@ -21,6 +21,16 @@ CFL_DEFAULT = 1.0
 VNN_DEFAULT = 20.0
 
 FD_STEP_DEFAULT = 1.0e-6
+FORWARD_JACOB_MAX_DIM_DEFAULT = 64
+
+# boundary parameters which may vary between ensemble members
+ENSEMBLE_VARS = [var + "_" + bound for bound in ["inlet", "outlet"]
+				for var in ["press", "vel", "temp", "rho", "pert_perc", "pert_freq"]]
+
+# output defaults
+PROBE_BLOCK_SIZE_DEFAULT = 1000
+POD_MAX_MODES_DEFAULT = 100
+POD_BLOCK_SIZE_DEFAULT = 10
 
 # visualization constants
 FIG_WIDTH_DEFAULT = 12
@@ -31,7 +41,13 @@ UNSTEADY_OUTPUT_DIR_NAME = "unsteady_field_results"
 PROBE_OUTPUT_DIR_NAME = "probe_results"
 IMAGE_OUTPUT_DIR_NAME = "image_results"
 RESTART_OUTPUT_DIR_NAME = "restart_files"
+POD_OUTPUT_DIR_NAME = "pod_data"
 
 # input files
 PARAM_INPUTS = "solver_params.inp"
 ROM_INPUTS = "rom_params.inp"
+SWEEP_INPUTS = "sweep_params.inp"
+
+# sweep outputs
+SWEEP_SUMMARY_FILE = "sweep_summary.dat"
+SWEEP_LOG_FILE = "perform.log"
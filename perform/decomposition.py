@@ -0,0 +1,357 @@
+import os
+import argparse
+import multiprocessing
+import traceback
+import warnings
+from multiprocessing.shared_memory import SharedMemory
+from threading import BrokenBarrierError
+from time import time
+
+import numpy as np
+
+import perform.constants as const
+from perform.input_funcs import read_input_file, catch_input
+from perform.system_solver import SystemSolver
+from perform.simulation import Simulation
+from perform.solution.solution_domain import SolutionDomain
+from perform.misc_funcs import blas_thread_env
+
+# snapshot arrays which may be collected from subdomains,
+# 	as (output flag, solution attribute, snapshot attribute, snapshot index offset)
+SNAP_FIELDS = [("prim_out", "sol_prim", "prim_snap", 0),
+				("cons_out", "sol_cons", "cons_snap", 0),
+				("source_out", "source", "source_snap", -1),
+				("rhs_out", "rhs", "rhs_snap", -1)]
+
+
+class DomainDecomposition:
+	"""
+	Explicit time integration of a single case, split into contiguous subdomains
+	which are each advanced by a separate worker process
+
+	Each subdomain is padded by halo cells owned by its neighbors,
+	which are exchanged through shared memory after every explicit stage.
+	Physical boundary conditions are only applied by the first and last subdomains
+	"""
+
+	def __init__(self, sol_domain, solver, num_subdomains):
+
+		assert (sol_domain.time_integrator.time_type == "explicit"), \
+			"Domain decomposition is only supported for explicit time integrators"
+		assert (not solver.calc_rom), "Domain decomposition is not supported for ROMs"
+		assert (not solver.run_steady), "Domain decomposition is not supported for steady runs"
+		assert (solver.num_members == 1), \
+			"Domain decomposition is not supported for ensemble runs"
+		assert (sol_domain.num_probes == 0), \
+			"Domain decomposition does not support probe measurements"
+		assert (not solver.save_restarts), \
+			"Domain decomposition does not support writing restart files"
+
+		self.sol_domain = sol_domain
+		self.solver = solver
+		self.num_subdomains = num_subdomains
+		assert (self.num_subdomains > 0), "num_subdomains must be a positive integer"
+
+		# halo cells required by face reconstruction stencil
+		if solver.space_order == 1:
+			self.halo_width = 1
+		else:
+			self.halo_width = 2
+
+		# contiguous subdomains of (nearly) equal size
+		num_cells = solver.mesh.num_cells
+		self.bounds = (np.arange(self.num_subdomains + 1) * num_cells) // self.num_subdomains
+		min_cells = np.amin(np.diff(self.bounds))
+		assert (min_cells >= max(2 * self.halo_width, 2)), \
+			("Too many subdomains (" + str(self.num_subdomains) + ") for "
+			+ str(num_cells) + " cells, each subdomain must have at least "
+			+ str(max(2 * self.halo_width, 2)) + " cells")
+
+		self.gas_dict = read_input_file(str(solver.param_dict["gas_file"]))
+		self.blas_threads = catch_input(solver.param_dict, "blas_threads", 1)
+
+	def run(self):
+		"""
+		Advance all subdomains to the final time step, and gather results into sol_domain
+		Returns wall time of the slowest subdomain's time stepping loop,
+		excluding process startup and subdomain setup
+		"""
+
+		solver = self.solver
+		sol_int = self.sol_domain.sol_int
+		gas = self.sol_domain.gas_model
+		num_cells = solver.mesh.num_cells
+
+		# shared arrays, as name: (shared memory block name, shape, dtype)
+		shm_list = []
+		shm_specs = {}
+		shm_shapes = {
+			# halo edges are double-buffered, so that a single barrier per exchange suffices
+			"edges": ((2, self.num_subdomains, 2, gas.num_eqs, self.halo_width), const.REAL_TYPE),
+			"sol_cons": ((gas.num_eqs, num_cells), const.REAL_TYPE),
+			# completed iterations and failure flag
+			"status": ((self.num_subdomains, 2), np.int64),
+			# wall time of time stepping loop
+			"runtime": ((self.num_subdomains,), const.REAL_TYPE),
+		}
+		for out_flag, field, snap_name, idx_offset in SNAP_FIELDS:
+			if getattr(solver, out_flag):
+				shm_shapes[snap_name] = (getattr(sol_int, snap_name).shape, const.REAL_TYPE)
+
+		shm_arrs = {}
+		for name, (shape, dtype) in shm_shapes.items():
+			shm = SharedMemory(create=True, size=int(np.prod(shape)) * np.dtype(dtype).itemsize)
+			shm_list.append(shm)
+			shm_specs[name] = (shm.name, shape, dtype)
+			shm_arrs[name] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+			if name in ["edges", "status", "runtime"]:
+				shm_arrs[name][:] = 0
+			else:
+				shm_arrs[name][:] = getattr(sol_int, name)
+
+		mp_context = multiprocessing.get_context("spawn")
+		barrier = mp_context.Barrier(self.num_subdomains)
+		processes = []
+		for rank in range(self.num_subdomains):
+			config = self.get_worker_config(rank, shm_specs)
+			processes.append(mp_context.Process(target=run_subdomain, args=(config, barrier)))
+
+		try:
+			with blas_thread_env(self.blas_threads):
+				for process in processes:
+					process.start()
+			for process in processes:
+				process.join()
+			runtime = float(np.amax(shm_arrs["runtime"]))
+
+			# gather results
+			status = shm_arrs["status"]
+			solver.solve_failed = bool(np.any(status[:, 1] != 0))
+			num_steps_taken = int(np.amin(status[:, 0]))
+			if solver.solve_failed:
+				solver.iter = num_steps_taken + 1
+			else:
+				solver.iter = num_steps_taken
+			solver.time_iter += num_steps_taken
+			solver.sol_time += num_steps_taken * solver.dt
+			sol_int.sol_cons = shm_arrs["sol_cons"].copy()
+			sol_int.update_state(from_cons=True)
+			for out_flag, field, snap_name, idx_offset in SNAP_FIELDS:
+				if snap_name in shm_arrs:
+					getattr(sol_int, snap_name)[:] = shm_arrs[snap_name]
+
+		finally:
+			shm_arrs.clear()
+			for shm in shm_list:
+				shm.close()
+				shm.unlink()
+
+		return runtime
+
+	def get_worker_config(self, rank, shm_specs):
+		"""
+		Collect picklable inputs for a single subdomain worker
+		"""
+
+		solver = self.solver
+		mesh = solver.mesh
+		halo = self.halo_width
+
+		own_start, own_end = self.bounds[rank], self.bounds[rank + 1]
+		local_start = own_start - halo if (rank > 0) else own_start
+		local_end = own_end + halo if (rank < self.num_subdomains - 1) else own_end
+
+		# initial state already includes bulk velocity, which must not be added again by the worker
+		param_dict = dict(solver.param_dict)
+		param_dict["vel_add"] = 0.0
+
+		config = {
+			"rank": rank,
+			"num_subdomains": self.num_subdomains,
+			"halo_width": halo,
+			"param_dict": param_dict,
+			"gas_dict": self.gas_dict,
+			"mesh_dict": {"x_left": mesh.x_face[local_start],
+						"x_right": mesh.x_face[local_end],
+						"num_cells": local_end - local_start},
+			"x_face": mesh.x_face[local_start:local_end + 1].copy(),
+			"dx": mesh.dx,
+			"sol_time": solver.sol_time,
+			"sol_prim_init": self.sol_domain.sol_int.sol_prim[:, local_start:local_end].copy(),
+			"own_slice": (own_start, own_end),
+			"local_own_slice": (own_start - local_start, own_end - local_start),
+			"shm_specs": shm_specs,
+		}
+
+		return config
+
+
+class HaloExchange:
+	"""
+	Exchange of halo cells between neighboring subdomains through shared memory
+	"""
+
+	def __init__(self, rank, num_subdomains, halo_width, edges, barrier):
+
+		self.rank = rank
+		self.halo_width = halo_width
+		self.edges = edges
+		self.barrier = barrier
+		self.has_left = (rank > 0)
+		self.has_right = (rank < num_subdomains - 1)
+		self.buffer_idx = 0
+
+	def exchange(self, sol):
+		"""
+		Publish owned edge cells, then overwrite halo cells with neighbors' edge cells
+		"""
+
+		halo = self.halo_width
+		edges = self.edges[self.buffer_idx]
+
+		if self.has_left:
+			edges[self.rank, 0] = sol[:, halo:2 * halo]
+		if self.has_right:
+			edges[self.rank, 1] = sol[:, -2 * halo:-halo]
+
+		self.barrier.wait()
+
+		if self.has_left:
+			sol[:, :halo] = edges[self.rank - 1, 1]
+		if self.has_right:
+			sol[:, -halo:] = edges[self.rank + 1, 0]
+
+		self.buffer_idx = 1 - self.buffer_idx
+
+
+def run_subdomain(config, barrier):
+	"""
+	Advance a single subdomain in a worker process
+	"""
+
+	rank = config["rank"]
+	num_subdomains = config["num_subdomains"]
+	shm_list = []
+	shm_arrs = {}
+	for name, (shm_name, shape, dtype) in config["shm_specs"].items():
+		shm = SharedMemory(name=shm_name)
+		shm_list.append(shm)
+		shm_arrs[name] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+	status = shm_arrs["status"]
+	own_slice = slice(*config["own_slice"])
+	local_own_slice = slice(*config["local_own_slice"])
+	sol_int = None
+
+	try:
+		param_dict = dict(config["param_dict"])
+		param_dict["sol_time_init"] = config["sol_time"]
+		sim = Simulation(param_dict, config["gas_dict"], config["mesh_dict"], config["sol_prim_init"])
+		solver = sim.solver
+		sol_domain = sim.sol_domain
+		sol_int = sol_domain.sol_int
+
+		# use exact global mesh
+		solver.mesh.x_face = config["x_face"]
+		solver.mesh.x_cell = (solver.mesh.x_face[1:] + solver.mesh.x_face[:-1]) / 2.0
+		solver.mesh.dx = config["dx"]
+
+		# only end subdomains apply physical boundary conditions
+		if rank > 0:
+			sol_domain.sol_inlet.bound_func = sol_domain.sol_inlet.calc_interface_bc
+		if rank < num_subdomains - 1:
+			sol_domain.sol_outlet.bound_func = sol_domain.sol_outlet.calc_interface_bc
+		sol_domain.halo_exchange = HaloExchange(rank, num_subdomains, config["halo_width"],
+												shm_arrs["edges"], barrier).exchange
+
+		# snapshots are collected by the parent process, as Simulation disables them
+		snap_list = []
+		for out_flag, field, snap_name, idx_offset in SNAP_FIELDS:
+			if snap_name in shm_arrs:
+				snap_list.append((field, shm_arrs[snap_name], idx_offset))
+		out_interval = catch_input(config["param_dict"], "out_interval", 1)
+
+		# all subdomains start time stepping together
+		barrier.wait()
+		time_start = time()
+		for iter_idx in range(1, solver.num_steps + 1):
+			sim.step()
+			status[rank, 0] = iter_idx
+
+			if (iter_idx % out_interval) == 0:
+				store_idx = int((iter_idx - 1) / out_interval) + 1
+				for field, snap, idx_offset in snap_list:
+					snap[:, own_slice, store_idx + idx_offset] = \
+						getattr(sol_int, field)[:, local_own_slice]
+
+		shm_arrs["runtime"][rank] = time() - time_start
+		shm_arrs["sol_cons"][:, own_slice] = sol_int.sol_cons[:, local_own_slice]
+
+	except Exception as e:
+		# BrokenBarrierError indicates that another subdomain failed
+		if not isinstance(e, BrokenBarrierError):
+			print("Subdomain " + str(rank + 1) + " failed")
+			print(traceback.format_exc())
+			barrier.abort()
+		status[rank, 1] = 1
+		if sol_int is not None:
+			shm_arrs["sol_cons"][:, own_slice] = sol_int.sol_cons[:, local_own_slice]
+
+	finally:
+		del status
+		shm_arrs.clear()
+		for shm in shm_list:
+			shm.close()
+
+
+def solve_decomposed(working_dir, num_subdomains=None):
+	"""
+	Run a single simulation in the given working directory with domain decomposition
+	Returns the SystemSolver and the wall time of the parallel solve
+	"""
+
+	with warnings.catch_warnings():
+		warnings.filterwarnings("error")
+
+		assert (os.path.isdir(working_dir)), \
+			"Given working directory does not exist"
+
+		solver = SystemSolver(working_dir)
+		if num_subdomains is None:
+			num_subdomains = catch_input(solver.param_dict, "num_subdomains", 1)
+		sol_domain = SolutionDomain(solver)
+
+		decomp = DomainDecomposition(sol_domain, solver, num_subdomains)
+		print("Running on " + str(num_subdomains) + " subdomains")
+		runtime = decomp.run()
+
+		if solver.solve_failed:
+			print("Solve failed, dumping solution so far to disk")
+		else:
+			print("Solve finished in %.8f seconds, writing to disk" % runtime)
+
+		sol_domain.write_final_outputs(solver)
+
+	return solver, runtime
+
+
+def main():
+
+	# Read working directory input
+	parser = argparse.ArgumentParser(description="Read working directory")
+	parser.add_argument('working_dir', type=str,
+						default="./", help="runtime working directory")
+	parser.add_argument('--num_subdomains', type=int, default=None,
+						help="number of subdomains/worker processes, overrides num_subdomains")
+	args = parser.parse_args()
+	working_dir = os.path.expanduser(args.working_dir)
+
+	solve_decomposed(working_dir, args.num_subdomains)
+
+
+if __name__ == "__main__":
+	try:
+		main()
+	except:
+		print(traceback.format_exc())
+		print("Execution failed")
@@ -9,80 +9,98 @@ from perform.solution.solution_domain import SolutionDomain
 from perform.visualization.visualization_group import VisualizationGroup
 from perform.rom.rom_domain import RomDomain
 
-warnings.filterwarnings("error")
-
 
 def main():
 
-	# ----- Start setup -----
-
 	# Read working directory input
 	parser = argparse.ArgumentParser(description="Read working directory")
 	parser.add_argument('working_dir', type=str,
 						default="./", help="runtime working directory")
 	working_dir = os.path.expanduser(parser.parse_args().working_dir)
-	assert (os.path.isdir(working_dir)),\
-			"Given working directory does not exist"
 
-	# Retrieve solver parameters and initialize mesh
-	# TODO: multi-domain solvers
-	# TODO: move mesh to solution_domain
-	solver = SystemSolver(working_dir)
+	solve(working_dir)
 
-	# Initialize physical and ROM solutions
-	sol_domain = SolutionDomain(solver)
-	if solver.calc_rom:
-		rom_domain = RomDomain(sol_domain, solver)
-	else:
-		rom_domain = None
 
-	# Initialize plots
-	visGroup = VisualizationGroup(sol_domain, solver)
+def solve(working_dir):
+	"""
+	Run a single simulation in the given working directory
+	Returns the SystemSolver, which records whether the solve failed
+	"""
 
-	# ----- End setup -----
+	# warnings are treated as errors only during the solve,
+	# 	so that importing this module does not alter global warning filters
+	with warnings.catch_warnings():
+		warnings.filterwarnings("error")
 
-	# ----- Start unsteady solution -----
+		# ----- Start setup -----
 
-	try:
-		# Loop over time iterations
-		time_start = time()
-		for solver.iter in range(1, solver.num_steps + 1):
-
-			# Advance one physical time step
-			if (solver.calc_rom):
-				rom_domain.advance_iter(sol_domain, solver)
-			else:
-				sol_domain.advance_iter(solver)
-			solver.time_iter += 1
-			solver.sol_time += solver.dt
-
-			# Write unsteady solution outputs
-			sol_domain.write_iter_outputs(solver)
-
-			# Check "steady" solve
-			if solver.run_steady:
-				break_flag = sol_domain.write_steady_outputs(solver)
-				if break_flag:
-					break
-
-			# Visualization
-			visGroup.draw_plots(sol_domain, solver)
-
-		runtime = time() - time_start
-		print("Solve finished in %.8f seconds, writing to disk" % runtime)
-
-	except RuntimeWarning:
-		solver.solve_failed = True
-		print(traceback.format_exc())
-		print("Solve failed, dumping solution so far to disk")
+		assert (os.path.isdir(working_dir)),\
+				"Given working directory does not exist"
+
+		# Retrieve solver parameters and initialize mesh
+		# TODO: multi-domain solvers
+		# TODO: move mesh to solution_domain
+		solver = SystemSolver(working_dir)
+
+		# Initialize physical and ROM solutions
+		sol_domain = SolutionDomain(solver)
+		if solver.calc_rom:
+			rom_domain = RomDomain(sol_domain, solver)
+		else:
+			rom_domain = None
+
+		# Initialize plots
+		visGroup = VisualizationGroup(sol_domain, solver)
+
+		# ----- End setup -----
+
+		# ----- Start unsteady solution -----
+
+		try:
+			# Loop over time iterations
+			time_start = time()
+			for solver.iter in range(1, solver.num_steps + 1):
+
+				# Advance one physical time step
+				if (solver.calc_rom):
+					rom_domain.advance_iter(sol_domain, solver)
+				else:
+					sol_domain.advance_iter(solver)
+				solver.time_iter += 1
+				solver.sol_time += solver.dt
+
+				# Write unsteady solution outputs
+				sol_domain.write_iter_outputs(solver)
+
+				# Check "steady" solve
+				if solver.run_steady:
+					break_flag = sol_domain.write_steady_outputs(solver)
+					if break_flag:
+						break
+
+				# Visualization
+				visGroup.draw_plots(sol_domain, solver)
+
+			runtime = time() - time_start
+			print("Solve finished in %.8f seconds, writing to disk" % runtime)
+
+		except RuntimeWarning:
+			solver.solve_failed = True
+			print(traceback.format_exc())
+			print("Solve failed, dumping solution so far to disk")
+
+		# ----- End unsteady solution -----
 
-	# ----- End unsteady solution -----
+		# ----- Start post-processing -----
 
-	# ----- Start post-processing -----
+		sol_domain.write_final_outputs(solver)
+		if solver.calc_rom:
+			rom_domain.write_final_outputs(solver)
+		visGroup.close_plots()
 
-	sol_domain.write_final_outputs(solver)
+		# ----- End post-processing -----
 
-	# ----- End post-processing -----
+	return solver
 
 
 if __name__ == "__main__":
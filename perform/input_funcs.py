@@ -177,6 +177,22 @@ def parse_bc(bc_name, in_dict):
 	return press, vel, temp, mass_fracs, rho, pert_type, pert_perc, pert_freq
 
 
+def format_input_dict(in_dict):
+	"""
+	Copy input dictionary provided directly from Python,
+	converting lists to NumPy arrays as done by read_input_file
+	"""
+
+	out_dict = {}
+	for key, val in in_dict.items():
+		if isinstance(val, list):
+			out_dict[key] = np.asarray(val)
+		else:
+			out_dict[key] = val
+
+	return out_dict
+
+
 def get_initial_conditions(sol_domain, solver):
 	"""
 	Extract initial condition profile from
@@ -211,11 +227,11 @@ def gen_piecewise_uniform_ic(sol_domain, solver):
 
 	# TODO: generalize to >2 uniform regions
 
-	if os.path.isfile(solver.ic_params_file):
+	if (solver.ic_params_file is not None) and os.path.isfile(solver.ic_params_file):
 		ic_dict = read_input_file(solver.ic_params_file)
 	else:
 		raise ValueError("Could not find initial conditions file at "
-						+ solver.ic_params_file)
+						+ str(solver.ic_params_file))
 
 	split_idx = \
 		np.absolute(solver.mesh.x_cell - ic_dict["x_split"]).argmin() + 1
@@ -308,28 +308,42 @@ def calc_d_roe_flux_d_sol_prim(sol_domain, solver):
 
 	roe_diss *= (0.5 / solver.mesh.dx)
 
+	# left face of each sampled cell, and of those with interior left/right neighbors
+	face_idxs = sol_domain.flux_rhs_idxs
+	face_idxs_left = face_idxs[sol_domain.jacob_left_samp]
+	face_idxs_right = face_idxs[sol_domain.jacob_right_samp] + 1
+
 	# Jacobian wrt current cell
 	d_flux_d_sol_prim = \
-		((d_flux_left_d_sol_prim_left[:, :, 1:] + roe_diss[:, :, 1:])
-		+ (-d_flux_right_d_sol_prim_right[:, :, :-1] + roe_diss[:, :, :-1]))
+		((d_flux_left_d_sol_prim_left[:, :, face_idxs + 1] + roe_diss[:, :, face_idxs + 1])
+		+ (-d_flux_right_d_sol_prim_right[:, :, face_idxs] + roe_diss[:, :, face_idxs]))
 
 	# Jacobian wrt left neighbor
 	d_flux_d_sol_prim_left = \
-		(-d_flux_left_d_sol_prim_left[:, :, 1:-1] - roe_diss[:, :, :-2])
+		(-d_flux_left_d_sol_prim_left[:, :, face_idxs_left] - roe_diss[:, :, face_idxs_left])
 
 	# Jacobian wrt right neighbor
 	d_flux_d_sol_prim_right = \
-		(d_flux_right_d_sol_prim_right[:, :, 1:-1] - roe_diss[:, :, 2:])
+		(d_flux_right_d_sol_prim_right[:, :, face_idxs_right] - roe_diss[:, :, face_idxs_right])
 
 	return d_flux_d_sol_prim, d_flux_d_sol_prim_left, d_flux_d_sol_prim_right
 
 
-def calc_d_res_d_sol_prim(sol_domain, solver):
+def calc_d_res_d_sol_prim(sol_domain, solver, time_integrator=None):
 	"""
 	Compute Jacobian of the RHS function (i.e. fluxes and sources)
+
+	Only rows of sampled cells are assembled, see jacob_row_idxs in SolutionInterior
+	time_integrator defaults to that of sol_domain, ROMs may provide their own
 	"""
 
+	if time_integrator is None:
+		time_integrator = sol_domain.time_integrator
+
 	sol_int = sol_domain.sol_int
+	samp_idxs = sol_domain.direct_samp_idxs
+	left_neigh_idxs = samp_idxs[sol_domain.jacob_left_samp] - 1
+	right_neigh_idxs = samp_idxs[sol_domain.jacob_right_samp] + 1
 	sol_inlet = sol_domain.sol_inlet
 	sol_outlet = sol_domain.sol_outlet
 	gas = sol_domain.gas_model
@@ -359,26 +373,27 @@ def calc_d_res_d_sol_prim(sol_domain, solver):
 	# contribution to main block diagonal from source term Jacobian
 	if solver.source_on:
 		d_source_d_sol_prim = \
-			calc_d_source_d_sol_prim(sol_int, sol_domain.time_integrator.dt)
-		d_rhs_d_sol_prim -= d_source_d_sol_prim
+			calc_d_source_d_sol_prim(sol_int, time_integrator.dt)
+		d_rhs_d_sol_prim -= d_source_d_sol_prim[:, :, samp_idxs]
 
 	# TODO: make this specific for each implicitIntegrator
-	dt_coeff_idx = min(solver.iter, sol_domain.time_integrator.time_order) - 1
-	dt_inv = (sol_domain.time_integrator.coeffs[dt_coeff_idx][0]
-				/ sol_domain.time_integrator.dt)
+	dt_coeff_idx = min(solver.iter, time_integrator.time_order) - 1
+	dt_inv = (time_integrator.coeffs[dt_coeff_idx][0]
+				/ time_integrator.dt)
 
 	# modifications depending on whether dual-time integration is being used
-	if sol_domain.time_integrator.dual_time:
+	if time_integrator.dual_time:
 
 		# contribution to main block diagonal from solution Jacobian
 		gamma_matrix = calc_d_sol_cons_d_sol_prim(sol_int)
-		if sol_domain.time_integrator.adapt_dtau:
-			dtauInv = calc_adaptive_dtau(sol_domain, gamma_matrix, solver)
+		if time_integrator.adapt_dtau:
+			dtauInv = calc_adaptive_dtau(sol_domain, gamma_matrix, solver, time_integrator)
 		else:
-			dtauInv = (1. / sol_domain.time_integrator.dtau
+			dtauInv = (1. / time_integrator.dtau
 				* np.ones(sol_int.num_cells, dtype=const.REAL_TYPE))
 
-		d_rhs_d_sol_prim += gamma_matrix * (dtauInv[None, None, :] + dt_inv)
+		d_rhs_d_sol_prim += (gamma_matrix[:, :, samp_idxs]
+							* (dtauInv[None, None, samp_idxs] + dt_inv))
 
 		# assemble sparse Jacobian from main, upper, and lower block diagonals
 		res_jacob = res_jacob_assemble(d_rhs_d_sol_prim,
@@ -397,19 +412,19 @@ def calc_d_res_d_sol_prim(sol_domain, solver):
 						axes=(2, 0, 1))
 		d_rhs_d_sol_cons = \
 			np.transpose(np.transpose(d_rhs_d_sol_prim, axes=(2, 0, 1))
-						@ gamma_matrix_inv,
+						@ gamma_matrix_inv[samp_idxs, :, :],
 						axes=(1, 2, 0))
 		d_flux_d_sol_cons_left = \
 			np.transpose(np.transpose(d_flux_d_sol_prim_left, axes=(2, 0, 1))
-						@ gamma_matrix_inv[:-1, :, :],
+						@ gamma_matrix_inv[left_neigh_idxs, :, :],
 						axes=(1, 2, 0))
 		d_flux_d_sol_cons_right = \
 			np.transpose(np.transpose(d_flux_d_sol_prim_right, axes=(2, 0, 1))
-						@ gamma_matrix_inv[1:, :, :],
+						@ gamma_matrix_inv[right_neigh_idxs, :, :],
 						axes=(1, 2, 0))
 
 		dtMat = np.repeat(dt_inv * np.eye(gas.num_eqs)[:, :, None],
-							sol_int.num_cells, axis=2)
+							samp_idxs.size, axis=2)
 		d_rhs_d_sol_cons += dtMat
 
 		res_jacob = res_jacob_assemble(d_rhs_d_sol_cons,
@@ -420,11 +435,14 @@ def calc_d_res_d_sol_prim(sol_domain, solver):
 	return res_jacob
 
 
-def calc_adaptive_dtau(sol_domain, gamma_matrix, solver):
+def calc_adaptive_dtau(sol_domain, gamma_matrix, solver, time_integrator=None):
 	"""
 	Adapt dtau for each cell based on user input constraints and local wave speed
 	"""
 
+	if time_integrator is None:
+		time_integrator = sol_domain.time_integrator
+
 	# TODO: move this to implicitIntegrator
 	sol_int = sol_domain.sol_int
 	gas_model = sol_domain.gas_model
@@ -432,7 +450,7 @@ def calc_adaptive_dtau(sol_domain, gamma_matrix, solver):
 	# compute initial dtau from input cfl and srf (max characteristic speed)
 	# srf is computed in calcInvFlux
 	dtaum = 1.0 * solver.mesh.dx / sol_domain.sol_int.srf
-	dtau = sol_domain.time_integrator.cfl * dtaum
+	dtau = time_integrator.cfl * dtaum
 
 	# limit by von Neumann number
 	if solver.visc_scheme > 0:
@@ -442,7 +460,7 @@ def calc_adaptive_dtau(sol_domain, gamma_matrix, solver):
 											mass_fracs=sol_int.sol_prim[3:, :])
 		nu = sol_int.dyn_visc_mix / sol_int.sol_cons[0, :]
 		dtau = np.minimum(dtau,
-				sol_domain.time_integrator.vnn * np.square(solver.mesh.dx) / nu)
+				time_integrator.vnn * np.square(solver.mesh.dx) / nu)
 		dtaum = np.minimum(dtaum, 3.0 / nu)
 
 	# limit dtau
@@ -461,11 +479,45 @@ def res_jacob_assemble(center_block, lower_block, upper_block, sol_int):
 
 	jacob_dim = sol_int.jacob_dim
 
+	# rows of sampled cells only
+	num_rows = center_block.shape[0] * center_block.shape[2]
+
 	data = np.concatenate((center_block.ravel("C"),
 							lower_block.ravel("C"),
 							upper_block.ravel("C")))
 	res_jacob = \
 		csr_matrix((data, (sol_int.jacob_row_idxs, sol_int.jacob_col_idxs)),
-					shape=(jacob_dim, jacob_dim), dtype=const.REAL_TYPE)
+					shape=(num_rows, jacob_dim), dtype=const.REAL_TYPE)
 
 	return res_jacob
+
+
+def calc_jacob_idxs(num_eqs, num_cells, samp_idxs, left_samp, right_samp):
+	"""
+	Compute CSR row and column indices of residual Jacobian blocks
+
+	Rows are ordered by equation, then by sampled cell,
+	and columns by equation, then by cell. left_samp and right_samp index
+	the sampled cells which have an interior left and right neighbor, respectively
+	"""
+
+	num_samp_cells = samp_idxs.size
+	eq_idxs = np.arange(num_eqs)
+
+	def block_idxs(samp, cols):
+		row_idxs = eq_idxs[:, None, None] * num_samp_cells + samp[None, None, :]
+		col_idxs = eq_idxs[None, :, None] * num_cells + cols[None, None, :]
+		row_idxs, col_idxs = np.broadcast_arrays(row_idxs, col_idxs)
+		return row_idxs.ravel(), col_idxs.ravel()
+
+	row_idxs_center, col_idxs_center = \
+		block_idxs(np.arange(num_samp_cells), samp_idxs)
+	row_idxs_lower, col_idxs_lower = \
+		block_idxs(left_samp, samp_idxs[left_samp] - 1)
+	row_idxs_upper, col_idxs_upper = \
+		block_idxs(right_samp, samp_idxs[right_samp] + 1)
+
+	row_idxs = np.concatenate((row_idxs_center, row_idxs_lower, row_idxs_upper))
+	col_idxs = np.concatenate((col_idxs_center, col_idxs_lower, col_idxs_upper))
+
+	return row_idxs.astype(np.int32), col_idxs.astype(np.int32)
@@ -1,5 +1,10 @@
 import os
 import struct
+from contextlib import contextmanager
+
+# environment variables controlling BLAS/OpenMP thread pools
+BLAS_THREAD_VARS = ["OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS",
+					"BLIS_NUM_THREADS", "VECLIB_MAXIMUM_THREADS", "NUMEXPR_NUM_THREADS"]
 
 
 def write_to_file(fid, array, order='F'):
@@ -45,3 +50,26 @@ def mkdir_shallow(base_dir, new_dir_name):
 	if not os.path.isdir(new_dir):
 		os.mkdir(new_dir)
 	return new_dir
+
+
+@contextmanager
+def blas_thread_env(num_threads):
+	"""
+	Limit BLAS/OpenMP threads of processes spawned within the context
+
+	Spawned processes inherit the environment before NumPy is imported,
+	previous environment values are restored on exit
+	"""
+
+	prev_vals = {var: os.environ.get(var) for var in BLAS_THREAD_VARS}
+	for var in BLAS_THREAD_VARS:
+		os.environ[var] = str(num_threads)
+
+	try:
+		yield
+	finally:
+		for var, val in prev_vals.items():
+			if val is None:
+				os.environ.pop(var, None)
+			else:
+				os.environ[var] = val
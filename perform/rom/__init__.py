@@ -1,64 +1,94 @@
-# linear models
-from perform.rom.projection_rom.linear_proj_rom.linear_galerkin_proj import LinearGalerkinProj
-from perform.rom.projection_rom.linear_proj_rom.linear_lspg_proj import LinearLSPGProj
-from perform.rom.projection_rom.linear_proj_rom.linear_splsvt_proj import LinearSPLSVTProj
+import os
+import importlib
+
+# ROM method registry, as (module, class name)
+# Models are only imported when requested, so that FOMs and linear ROMs
+# 	do not pay for importing TensorFlow
+ROM_METHODS = {
+	# linear models
+	"linear_galerkin_proj":
+		("perform.rom.projection_rom.linear_proj_rom.linear_galerkin_proj", "LinearGalerkinProj"),
+	"linear_lspg_proj":
+		("perform.rom.projection_rom.linear_proj_rom.linear_lspg_proj", "LinearLSPGProj"),
+	"linear_splsvt_proj":
+		("perform.rom.projection_rom.linear_proj_rom.linear_splsvt_proj", "LinearSPLSVTProj"),
+
+	# non-intrusive models
+	"linear_dmd":
+		("perform.rom.non_intrusive_rom.linear_dmd", "LinearDMD"),
+	"linear_quad_reg":
+		("perform.rom.non_intrusive_rom.linear_quad_reg", "LinearQuadReg"),
 
-# TensorFlow-Keras autoencoder models
-TFKERAS_IMPORT_SUCCESS = True
-try:
-	import os
-	os.environ['TF_CPP_MIN_LOG_LEVEL'] = "2"  # don't print all the TensorFlow warnings
-	from perform.rom.projection_rom.autoencoder_proj_rom.autoencoder_tfkeras.autoencoder_galerkin_proj_tfkeras import AutoencoderGalerkinProjTFKeras
-	from perform.rom.projection_rom.autoencoder_proj_rom.autoencoder_tfkeras.autoencoder_lspg_proj_tfkeras import AutoencoderLSPGProjTFKeras
-	from perform.rom.projection_rom.autoencoder_proj_rom.autoencoder_tfkeras.autoencoder_splsvt_proj_tfkeras import AutoencoderSPLSVTProjTFKeras
-
-except ImportError:
-	TFKERAS_IMPORT_SUCCESS = False
-
-
-def get_rom_model(model_idx, rom_domain, solver, sol_domain):
+	# TensorFlow-Keras autoencoder models
+	"autoencoder_galerkin_proj_tfkeras":
+		("perform.rom.projection_rom.autoencoder_proj_rom.autoencoder_tfkeras.autoencoder_galerkin_proj_tfkeras",
+		"AutoencoderGalerkinProjTFKeras"),
+	"autoencoder_lspg_proj_tfkeras":
+		("perform.rom.projection_rom.autoencoder_proj_rom.autoencoder_tfkeras.autoencoder_lspg_proj_tfkeras",
+		"AutoencoderLSPGProjTFKeras"),
+	"autoencoder_splsvt_proj_tfkeras":
+		("perform.rom.projection_rom.autoencoder_proj_rom.autoencoder_tfkeras.autoencoder_splsvt_proj_tfkeras",
+		"AutoencoderSPLSVTProjTFKeras"),
+
+	# ONNX Runtime autoencoder models
+	"autoencoder_galerkin_proj_onnx":
+		("perform.rom.projection_rom.autoencoder_proj_rom.autoencoder_onnx.autoencoder_galerkin_proj_onnx",
+		"AutoencoderGalerkinProjONNX"),
+	"autoencoder_lspg_proj_onnx":
+		("perform.rom.projection_rom.autoencoder_proj_rom.autoencoder_onnx.autoencoder_lspg_proj_onnx",
+		"AutoencoderLSPGProjONNX"),
+	"autoencoder_splsvt_proj_onnx":
+		("perform.rom.projection_rom.autoencoder_proj_rom.autoencoder_onnx.autoencoder_splsvt_proj_onnx",
+		"AutoencoderSPLSVTProjONNX"),
+
+	# PyTorch autoencoder models
+	"autoencoder_galerkin_proj_torch":
+		("perform.rom.projection_rom.autoencoder_proj_rom.autoencoder_torch.autoencoder_galerkin_proj_torch",
+		"AutoencoderGalerkinProjTorch"),
+	"autoencoder_lspg_proj_torch":
+		("perform.rom.projection_rom.autoencoder_proj_rom.autoencoder_torch.autoencoder_lspg_proj_torch",
+		"AutoencoderLSPGProjTorch"),
+	"autoencoder_splsvt_proj_torch":
+		("perform.rom.projection_rom.autoencoder_proj_rom.autoencoder_torch.autoencoder_splsvt_proj_torch",
+		"AutoencoderSPLSVTProjTorch"),
+}
+
+# optional model libraries, as (method suffix, library name, required package)
+ROM_LIBRARIES = [("tfkeras", "TF-Keras", "TensorFlow >= 2.0"),
+				("onnx", "ONNX Runtime", "onnxruntime"),
+				("torch", "PyTorch", "PyTorch")]
+
+
+def get_rom_class(rom_method):
 	"""
-	Helper function to retrieve various models
-	Helps keep the clutter our of rom_domain
+	Import and retrieve model class of given ROM method
 	"""
 
-	# linear subspace methods
-	if rom_domain.rom_method == "linear_galerkin_proj":
-		model = LinearGalerkinProj(model_idx, rom_domain, solver, sol_domain)
+	if rom_method not in ROM_METHODS:
+		raise ValueError("Invalid ROM method name: " + rom_method)
+	module_name, class_name = ROM_METHODS[rom_method]
 
-	elif rom_domain.rom_method == "linear_lspg_proj":
-		model = LinearLSPGProj(model_idx, rom_domain, solver, sol_domain)
+	if rom_method[-7:] == "tfkeras":
+		os.environ['TF_CPP_MIN_LOG_LEVEL'] = "2"  # don't print all the TensorFlow warnings
 
-	elif rom_domain.rom_method == "linear_splsvt_proj":
-		model = LinearSPLSVTProj(model_idx, rom_domain, solver, sol_domain)
-
-	# TensorFlow-Keras autoencoder models
-	elif rom_domain.rom_method[-7:] == "tfkeras":
-		if TFKERAS_IMPORT_SUCCESS:
+	try:
+		module = importlib.import_module(module_name)
+	except ImportError:
+		for suffix, library_name, package_name in ROM_LIBRARIES:
+			if rom_method.endswith("_" + suffix):
+				raise ValueError(library_name + " models failed to import,"
+								+ " please check that " + package_name + " is installed")
+		raise
 
-			if rom_domain.rom_method == "autoencoder_galerkin_proj_tfkeras":
-				model = AutoencoderGalerkinProjTFKeras(model_idx, rom_domain,
-														solver, sol_domain)
+	return getattr(module, class_name)
 
-			elif rom_domain.rom_method == "autoencoder_lspg_proj_tfkeras":
-				model = AutoencoderLSPGProjTFKeras(model_idx, rom_domain,
-													solver, sol_domain)
 
-			elif rom_domain.rom_method == "autoencoder_splsvt_proj_tfkeras":
-				model = AutoencoderSPLSVTProjTFKeras(model_idx, rom_domain,
-													solver, sol_domain)
-
-			else:
-				raise ValueError("Invalid TF-Keras ROM method name: "
-								+ rom_domain.rom_method)
-
-		else:
-			raise ValueError("TF-Keras models failed to import,"
-							+ " please check that TensorFlow >= 2.0 is installed")
-
-	# TODO: PyTorch autoencoder models
+def get_rom_model(model_idx, rom_domain, solver, sol_domain):
+	"""
+	Helper function to retrieve various models
+	Helps keep the clutter our of rom_domain
+	"""
 
-	else:
-		raise ValueError("Invalid ROM method name: " + rom_domain.rom_method)
+	model_class = get_rom_class(rom_domain.rom_method)
 
-	return model
+	return model_class(model_idx, rom_domain, solver, sol_domain)
@@ -0,0 +1,57 @@
+# Collection of functions for online adaptation of linear trial bases
+# 	by low-rank updates from sparse full-order samples, following AADEIM
+import numpy as np
+
+
+def calc_samp_rows(samp_idxs, num_vars, num_cells):
+	"""
+	Rows of flattened [num_vars * num_cells] arrays at given cells, in [num_vars, num_samp] order
+	"""
+
+	return (samp_idxs[None, :] + num_cells * np.arange(num_vars)[:, None]).ravel(order="C")
+
+
+def select_samp_cells(res, num_vars, samp_budget):
+	"""
+	Select at most samp_budget sampled cells with largest windowed residual norm
+
+	res is in [num_vars * num_samp, window] order
+	Returns rows of res at selected cells
+	"""
+
+	res_norms = np.sum(np.square(np.reshape(res, (num_vars, -1, res.shape[-1]), order="C")), axis=(0, 2))
+	num_samp = res_norms.shape[0]
+
+	if (samp_budget <= 0) or (samp_budget >= num_samp):
+		cell_idxs = np.arange(num_samp)
+	else:
+		cell_idxs = np.sort(np.argpartition(res_norms, -samp_budget)[-samp_budget:])
+
+	return calc_samp_rows(cell_idxs, num_vars, num_samp)
+
+
+def calc_basis_update(codes, res, rank):
+	"""
+	Rank-r update alpha * beta^T of sampled trial basis rows V_s which minimizes
+	|| (V_s + alpha * beta^T) * codes - data ||_F, with res = data - V_s * codes
+
+	codes is in [latent_dim, window] order, res in [num_samp_rows, window] order
+	Returns alpha in [num_samp_rows, rank] order and beta in [latent_dim, rank] order
+	"""
+
+	# update is restricted to the well-conditioned row space of the codes,
+	# 	as codes in a short window are nearly collinear
+	code_left, code_sing, code_right = np.linalg.svd(codes, full_matrices=False)
+	code_rank = np.sum(code_sing > (code_sing[0] * np.sqrt(np.finfo(codes.dtype).eps)))
+	code_left = code_left[:, :code_rank]
+	code_sing = code_sing[:code_rank]
+	code_right = code_right[:code_rank, :]
+
+	# best rank-r approximation of residual projected onto row space of codes
+	res_left, res_sing, res_right = np.linalg.svd(res @ code_right.T, full_matrices=False)
+	rank = min(rank, res_sing.shape[0])
+
+	alpha = res_left[:, :rank] * res_sing[None, :rank]
+	beta = code_left @ (res_right[:rank, :].T / code_sing[:, None])
+
+	return alpha, beta
@@ -0,0 +1,65 @@
+# Collection of functions for loading linear bases in [num_vars, num_cells, num_modes] order,
+# 	reading only the modes in use and optionally caching the preprocessed basis across runs
+import os
+import hashlib
+
+import numpy as np
+
+
+def basis_fingerprint(basis_file):
+	"""
+	Hash of basis file location, size, and modification time
+
+	Identifies the basis file without reading its contents,
+	and changes whenever the file is overwritten
+	"""
+
+	file_stat = os.stat(basis_file)
+	file_id = "%s:%i:%i" % (os.path.realpath(basis_file), file_stat.st_size, file_stat.st_mtime_ns)
+
+	return hashlib.sha1(file_id.encode("utf-8")).hexdigest()[:16]
+
+
+def load_basis(basis_file, num_modes, cache_dir=""):
+	"""
+	Load leading num_modes modes of basis, flattened to contiguous [num_vars * num_cells, num_modes] array in C order
+
+	The basis file is memory-mapped, so that only the leading modes are copied
+	If cache_dir is given, the flattened basis is read from (or written to) a cache file
+	keyed by the basis file fingerprint and num_modes, which may be shared by many runs, e.g. of a sweep
+
+	Returns the flattened basis, and the shape of the full basis for checks
+	"""
+
+	basis_full = np.load(basis_file, mmap_mode="r")
+	basis_shape = basis_full.shape
+	assert (basis_full.ndim == 3), \
+		"Basis at " + basis_file + " must have three axes"
+	assert (basis_shape[2] >= num_modes), \
+		("Basis at " + basis_file + " must have at least " + str(num_modes) + " modes ("
+		+ str(basis_shape[2]) + " < " + str(num_modes) + ")")
+	flat_shape = (basis_shape[0] * basis_shape[1], num_modes)
+
+	if cache_dir != "":
+		cache_file = os.path.join(cache_dir,
+									"basis_" + basis_fingerprint(basis_file) + "_" + str(num_modes) + ".npy")
+		if os.path.isfile(cache_file):
+			basis = np.load(cache_file)
+			if (basis.shape == flat_shape) and (basis.dtype == basis_full.dtype):
+				return basis, basis_shape
+			print("WARNING: basis cache file " + cache_file + " does not match basis, overwriting")
+
+	# always copy, the trial basis may be modified in place by online adaptation
+	basis = np.array(basis_full[:, :, :num_modes], order="C").reshape(flat_shape, order="C")
+	del basis_full
+
+	if cache_dir != "":
+		# write to temporary file first, as concurrent runs may write the same cache file
+		if not os.path.isdir(cache_dir):
+			os.makedirs(cache_dir, exist_ok=True)
+		temp_file = cache_file + "." + str(os.getpid()) + ".tmp"
+		with open(temp_file, "wb") as f:
+			np.save(f, basis)
+		os.replace(temp_file, cache_file)
+
+	return basis, basis_shape
@@ -0,0 +1,109 @@
+# Collection of functions for generating hyper-reduction
+# 	sample meshes and bases from full-order snapshots
+import numpy as np
+from scipy.linalg import qr
+
+from perform.constants import REAL_TYPE
+
+
+def calc_hyper_reduc_basis(snap_arr, norm_fac_prof=None, max_modes=None):
+	"""
+	Compute hyper-reduction basis from RHS or residual snapshots
+
+	snap_arr is in [num_vars, num_cells, num_snaps] order,
+	and is scaled by norm_fac_prof as in ProjectionROM.calc_rhs_low_dim
+	Returns basis in [num_vars, num_cells, num_modes] order and singular values
+	"""
+
+	num_vars, num_cells, num_snaps = snap_arr.shape
+
+	if norm_fac_prof is not None:
+		assert (norm_fac_prof.shape == (num_vars, num_cells)), \
+			("norm_fac_prof must have shape " + str((num_vars, num_cells))
+			+ ", got " + str(norm_fac_prof.shape))
+		snap_arr = snap_arr / norm_fac_prof[:, :, None]
+
+	snap_mat = np.reshape(snap_arr, (-1, num_snaps), order="C")
+	basis, sing_vals, _ = np.linalg.svd(snap_mat, full_matrices=False)
+
+	if max_modes is not None:
+		basis = basis[:, :max_modes]
+	basis = np.reshape(basis, (num_vars, num_cells, -1), order="C")
+
+	return basis.astype(REAL_TYPE), sing_vals
+
+
+def select_samp_cells_qdeim(basis):
+	"""
+	Select sample cells by QR-pivoted discrete empirical interpolation (Q-DEIM)
+
+	basis is in [num_vars, num_cells, num_modes] order
+	Each pivoted row selects its cell, so at most num_modes cells are returned
+	"""
+
+	num_vars, num_cells, num_modes = basis.shape
+
+	basis_mat = np.reshape(basis, (-1, num_modes), order="C")
+	_, _, pivots = qr(basis_mat.T, mode="economic", pivoting=True)
+
+	# rows are ordered by variable, then by cell
+	samp_idxs = np.unique(pivots[:num_modes] % num_cells)
+
+	return samp_idxs
+
+
+def select_samp_cells_greedy(basis, num_samp_cells, samp_idxs=None):
+	"""
+	Greedily add sample cells to samp_idxs until num_samp_cells are selected,
+	allowing oversampling (more sampled rows than basis modes)
+
+	Each added cell maximizes the projection of its rows onto the eigenvector
+	of the smallest eigenvalue of the sampled basis Gram matrix, i.e.
+	approximately maximizes the smallest singular value of the sampled basis
+	"""
+
+	num_vars, num_cells, num_modes = basis.shape
+	assert (num_samp_cells <= num_cells), \
+		"Cannot select more sample cells than cells in domain"
+
+	# rows of basis associated with each cell, in [num_cells, num_vars, num_modes] order
+	cell_rows = np.transpose(basis, (1, 0, 2))
+
+	if samp_idxs is None:
+		samp_idxs = np.zeros(0, dtype=np.int32)
+	samp_idxs = list(samp_idxs)
+
+	while len(samp_idxs) < num_samp_cells:
+
+		if len(samp_idxs) == 0:
+			score = np.sum(np.square(cell_rows), axis=(1, 2))
+		else:
+			samp_basis = np.reshape(cell_rows[samp_idxs, :, :], (-1, num_modes))
+			_, eig_vecs = np.linalg.eigh(samp_basis.T @ samp_basis)
+			score = np.sum(np.square(cell_rows @ eig_vecs[:, 0]), axis=1)
+
+		score[samp_idxs] = -1.0
+		samp_idxs.append(np.argmax(score))
+
+	return np.sort(np.array(samp_idxs, dtype=np.int32))
+
+
+def add_samp_neighbors(samp_idxs, num_cells, num_neighbors=0, add_bound_cells=True):
+	"""
+	Add num_neighbors cells on either side of each sample cell,
+	and the cells adjacent to the inlet and outlet, if requested
+
+	Flux and gradient stencil cells do not need to be sampled,
+	as they are determined by RomDomain.set_samp_idxs
+	"""
+
+	samp_idxs = np.asarray(samp_idxs, dtype=np.int32)
+
+	offsets = np.arange(-num_neighbors, num_neighbors + 1)
+	samp_idxs = (samp_idxs[:, None] + offsets[None, :]).ravel()
+	if add_bound_cells:
+		samp_idxs = np.concatenate((samp_idxs, [0, num_cells - 1]))
+
+	samp_idxs = samp_idxs[(samp_idxs >= 0) & (samp_idxs < num_cells)]
+
+	return np.unique(samp_idxs).astype(np.int32)
@@ -0,0 +1,44 @@
+# Collection of functions for the least-squares problems of LSPG and SP-LSVT Newton iterations,
+# 	min || test_basis * d_code - res ||, which may reuse a factorization of the test basis
+import numpy as np
+from scipy.linalg import cho_factor, cho_solve, solve_triangular
+
+
+def factorize_lsq(test_basis, lsq_solver, cholesky=False):
+	"""
+	Factorize test basis of least-squares problem
+
+	Returns economy QR factors for lsq_solver = "qr", or the test basis, its Gram matrix,
+	and its Cholesky factorization (if requested) for lsq_solver = "normal"
+	"""
+
+	if lsq_solver == "qr":
+		return np.linalg.qr(test_basis, mode="reduced")
+
+	test_basis_gram = test_basis.T @ test_basis
+	if cholesky:
+		return test_basis, test_basis_gram, cho_factor(test_basis_gram)
+	else:
+		return test_basis, test_basis_gram, None
+
+
+def solve_lsq(lsq_factors, res, lsq_solver):
+	"""
+	Solve least-squares problem from factors returned by factorize_lsq
+
+	Returns solution, and lhs and rhs of the solved linear system
+	"""
+
+	if lsq_solver == "qr":
+		test_basis_q, test_basis_r = lsq_factors
+		rhs = test_basis_q.T @ res
+		return solve_triangular(test_basis_r, rhs), test_basis_r, rhs
+
+	test_basis, test_basis_gram, test_basis_cho = lsq_factors
+	rhs = test_basis.T @ res
+	if test_basis_cho is None:
+		sol = np.linalg.solve(test_basis_gram, rhs)
+	else:
+		sol = cho_solve(test_basis_cho, rhs)
+
+	return sol, test_basis_gram, rhs
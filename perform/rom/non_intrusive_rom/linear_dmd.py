@@ -0,0 +1,18 @@
+from perform.rom.non_intrusive_rom.non_intrusive_rom import NonIntrusiveROM
+
+
+class LinearDMD(NonIntrusiveROM):
+	"""
+	Class for dynamic mode decomposition in the span of a linear trial basis
+	The code is advanced by the fitted affine map, q_{n+1} = c + A * q_n,
+	as codes of snapshots centered about the initial condition start at zero
+	"""
+
+	op_type = "dmd"
+
+	def advance_code(self):
+		"""
+		Compute code at next time step from code history
+		"""
+
+		return self.const_op + self.lin_op @ self.code_hist[0]
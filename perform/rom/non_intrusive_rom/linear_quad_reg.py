@@ -0,0 +1,20 @@
+from perform.rom.non_intrusive_rom.non_intrusive_rom import NonIntrusiveROM
+from perform.rom.reduced_op_funcs import calc_reduced_rhs
+
+
+class LinearQuadReg(NonIntrusiveROM):
+	"""
+	Class for quadratic regression of the code increment in the span of a linear trial basis
+	The code is advanced by q_{n+1} = q_n + c + A * q_n + H * (q_n x q_n)
+	"""
+
+	op_type = "quad_reg"
+
+	def advance_code(self):
+		"""
+		Compute code at next time step from code history
+		"""
+
+		code_inc, _ = calc_reduced_rhs(self.code_hist[0], self.const_op, self.lin_op, self.quad_tens)
+
+		return self.code_hist[0] + code_inc
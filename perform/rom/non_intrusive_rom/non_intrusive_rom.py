@@ -0,0 +1,31 @@
+import numpy as np
+
+from perform.rom.projection_rom.linear_proj_rom.linear_proj_rom import LinearProjROM
+from perform.rom.reduced_op_funcs import load_reduced_ops
+
+
+class NonIntrusiveROM(LinearProjROM):
+	"""
+	Base class for non-intrusive ROMs with a linear trial basis
+
+	The code is advanced directly from the code history by reduced operators
+	fitted to snapshot data, without a time integrator or full-order RHS evaluations
+	The full-dimensional solution is only decoded when required for outputs
+	"""
+
+	def __init__(self, model_idx, rom_domain, solver, sol_domain):
+
+		super().__init__(model_idx, rom_domain, solver, sol_domain)
+
+		self.const_op, self.lin_op, self.quad_tens, op_dt = \
+			load_reduced_ops(rom_domain.reduced_ops_files[self.model_idx], self.op_type, self.latent_dim)
+		assert np.isclose(op_dt, solver.dt, rtol=1e-8, atol=0.0), \
+			("Reduced operators were fit for a time step of " + str(op_dt)
+			+ ", but dt = " + str(solver.dt))
+
+	def advance_code(self):
+		"""
+		Compute code at next time step from code history
+		"""
+
+		raise NotImplementedError("advance_code not implemented for " + type(self).__name__)
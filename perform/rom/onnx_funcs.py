@@ -0,0 +1,51 @@
+# Collection of generic functions that
+# 	any ONNX Runtime model-based method can use
+import numpy as np
+import onnxruntime as ort
+
+# NumPy equivalents of ONNX tensor types
+ONNX_DTYPES = {"tensor(float)": np.float32, "tensor(double)": np.float64,
+				"tensor(float16)": np.float16}
+
+
+def load_model_obj(model_path, num_threads):
+	"""
+	Load ONNX model from file specified by model_path
+	into an inference session on the CPU execution provider
+
+	Small models are evaluated with lowest latency on few threads,
+	so operators are run sequentially with num_threads intra-op threads
+	"""
+
+	sess_options = ort.SessionOptions()
+	sess_options.intra_op_num_threads = num_threads
+	sess_options.inter_op_num_threads = 1
+	sess_options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+	sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+	session = ort.InferenceSession(model_path, sess_options=sess_options,
+									providers=["CPUExecutionProvider"])
+
+	assert (len(session.get_inputs()) == 1) and (len(session.get_outputs()) == 1), \
+		"ONNX models must have a single input and a single output"
+
+	return session
+
+
+def get_io_dtype(node_arg):
+	"""
+	Get NumPy dtype of ONNX model input or output
+	"""
+
+	if node_arg.type not in ONNX_DTYPES:
+		raise ValueError("Invalid ONNX model I/O type: " + str(node_arg.type))
+
+	return ONNX_DTYPES[node_arg.type]
+
+
+def has_dynamic_batch(node_arg):
+	"""
+	Check whether leading (batch) dimension of ONNX model input is not fixed
+	"""
+
+	return not isinstance(node_arg.shape[0], int)
@@ -0,0 +1,440 @@
+# Collection of functions for computing POD bases
+# 	of snapshot matrices too large to decompose in memory
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from perform.constants import REAL_TYPE
+from perform.misc_funcs import blas_thread_env
+
+
+def get_col_chunks(num_cols, chunk_size):
+	"""
+	Start and end indices of column chunks
+	"""
+
+	return [(start, min(start + chunk_size, num_cols)) for start in range(0, num_cols, chunk_size)]
+
+
+def randomized_svd(get_chunk, num_rows, num_cols, num_modes,
+					chunk_size=100, oversamp=10, num_power_iters=2, seed=0):
+	"""
+	Randomized range finder SVD of a matrix supplied in column chunks
+
+	get_chunk(start, end) returns columns start:end in [num_rows, end - start] order
+	Only arrays of size [num_rows or num_cols, num_modes + oversamp] are held in memory,
+	and the matrix is read (2 * num_power_iters + 2) times
+	Returns first num_modes left singular vectors and singular values
+	"""
+
+	rank = min(num_modes + oversamp, num_rows, num_cols)
+	chunks = get_col_chunks(num_cols, chunk_size)
+
+	def mult_right(mat):
+		prod = np.zeros((num_rows, mat.shape[1]), dtype=REAL_TYPE)
+		for start, end in chunks:
+			prod += get_chunk(start, end) @ mat[start:end, :]
+		return prod
+
+	def mult_left_trans(mat):
+		prod = np.zeros((num_cols, mat.shape[1]), dtype=REAL_TYPE)
+		for start, end in chunks:
+			prod[start:end, :] = get_chunk(start, end).T @ mat
+		return prod
+
+	rng = np.random.default_rng(seed)
+	omega = rng.standard_normal((num_cols, rank))
+
+	# orthonormal basis for range, with power iterations to sharpen spectral decay
+	range_basis, _ = np.linalg.qr(mult_right(omega))
+	for _ in range(num_power_iters):
+		corange_basis, _ = np.linalg.qr(mult_left_trans(range_basis))
+		range_basis, _ = np.linalg.qr(mult_right(corange_basis))
+
+	# SVD of small projected matrix
+	proj_mat = mult_left_trans(range_basis).T
+	proj_basis, sing_vals, _ = np.linalg.svd(proj_mat, full_matrices=False)
+	basis = range_basis @ proj_basis[:, :num_modes]
+
+	return basis, sing_vals[:num_modes]
+
+
+class IncrementalSVD:
+	"""
+	Truncated SVD of a matrix which is updated with blocks of columns,
+	following Brand's rank-k updates
+
+	Only the left singular vectors and singular values are retained,
+	so storage is [num_rows, max_modes + block size]
+	"""
+
+	def __init__(self, max_modes):
+
+		self.max_modes = max_modes
+		self.basis = None
+		self.sing_vals = None
+		self.num_cols = 0
+
+	def update(self, cols):
+		"""
+		Append columns in [num_rows, num_new_cols] order and truncate to max_modes
+		"""
+
+		if cols.ndim == 1:
+			cols = cols[:, None]
+
+		if self.basis is None:
+			basis, sing_vals, _ = np.linalg.svd(cols, full_matrices=False)
+
+		else:
+			# component of new columns orthogonal to current basis,
+			# 	with a second Gram-Schmidt pass to maintain orthogonality
+			proj = self.basis.T @ cols
+			resid = cols - self.basis @ proj
+			proj_corr = self.basis.T @ resid
+			resid -= self.basis @ proj_corr
+			proj += proj_corr
+			resid_basis, resid_fac = np.linalg.qr(resid)
+
+			num_modes = self.sing_vals.size
+			num_new = resid_fac.shape[0]
+			core = np.zeros((num_modes + num_new, num_modes + cols.shape[1]), dtype=REAL_TYPE)
+			core[:num_modes, :num_modes] = np.diag(self.sing_vals)
+			core[:num_modes, num_modes:] = proj
+			core[num_modes:, num_modes:] = resid_fac
+
+			core_basis, sing_vals, _ = np.linalg.svd(core, full_matrices=False)
+			basis = np.concatenate((self.basis, resid_basis), axis=1) @ core_basis
+
+		# discard numerically zero modes, which are not reliably orthogonal
+		rank_tol = sing_vals[0] * max(basis.shape) * np.finfo(REAL_TYPE).eps
+		num_modes = min(np.count_nonzero(sing_vals > rank_tol), self.max_modes)
+
+		self.basis = basis[:, :num_modes]
+		self.sing_vals = sing_vals[:num_modes]
+		self.num_cols += cols.shape[1]
+
+
+def calc_dev_stats(dev):
+	"""
+	Per-cell sum, sum of squares, minimum, and maximum of snapshot deviations
+	from a reference profile, in [num_vars, num_cells, num_snaps] order
+
+	Returned as (dev_sum, dev_sq_sum, dev_min, dev_max, num_snaps)
+	"""
+
+	return (np.sum(dev, axis=2), np.sum(np.square(dev), axis=2),
+			np.amin(dev, axis=2), np.amax(dev, axis=2), dev.shape[-1])
+
+
+def combine_dev_stats(stats_a, stats_b):
+	"""
+	Combine statistics from calc_dev_stats of two sets of snapshots
+	"""
+
+	if stats_a is None:
+		return stats_b
+
+	return (stats_a[0] + stats_b[0], stats_a[1] + stats_b[1],
+			np.minimum(stats_a[2], stats_b[2]), np.maximum(stats_a[3], stats_b[3]),
+			stats_a[4] + stats_b[4])
+
+
+def calc_standardization_profiles(ref_prof, dev_stats, cent_type, norm_type):
+	"""
+	Centering, normalization subtraction, and normalization factor profiles
+	as computed by utils/genPODBasis.py, from statistics of deviations from ref_prof
+
+	"initCond" centering assumes ref_prof is the initial condition
+	"""
+
+	dev_sum, dev_sq_sum, dev_min, dev_max, num_snaps = dev_stats
+	num_cells = ref_prof.shape[1]
+	ones_prof = np.ones(ref_prof.shape, dtype=REAL_TYPE)
+
+	# deviation of centering profile from reference
+	if cent_type == "initCond":
+		cent_dev = np.zeros(ref_prof.shape, dtype=REAL_TYPE)
+	elif cent_type == "mean":
+		cent_dev = dev_sum / num_snaps
+	else:
+		raise ValueError("Invalid cent_type input: " + str(cent_type))
+	cent_prof = ref_prof + cent_dev
+
+	if norm_type == "minmax":
+		min_vals = np.amin(dev_min - cent_dev, axis=1)
+		max_vals = np.amax(dev_max - cent_dev, axis=1)
+		norm_sub_prof = min_vals[:, None] * ones_prof
+		norm_fac_prof = (max_vals - min_vals)[:, None] * ones_prof
+
+	elif norm_type == "l2":
+		sq_sum = dev_sq_sum - 2.0 * cent_dev * dev_sum + num_snaps * np.square(cent_dev)
+		norm_fac_prof = (np.sum(sq_sum, axis=1) / (num_cells * num_snaps))[:, None] * ones_prof
+		norm_sub_prof = 0.0 * ones_prof
+
+	else:
+		raise ValueError("Invalid norm_type input: " + str(norm_type))
+
+	return cent_prof, norm_sub_prof, norm_fac_prof
+
+
+class IncrementalPOD:
+	"""
+	Streaming POD of snapshots in [num_vars, num_cells] order,
+	with the centering and normalization options of utils/genPODBasis.py
+
+	Snapshots are stored relative to the first snapshot and scaled by the current
+	normalization factors, and are decomposed by IncrementalSVD every block_size snapshots.
+	Centering and normalization profiles only depend on per-cell sums and extrema,
+	and are applied to the truncated decomposition in calc_pod
+	"""
+
+	def __init__(self, num_vars, num_cells, max_modes,
+				cent_type="initCond", norm_type="l2", block_size=10):
+
+		if cent_type not in ["initCond", "mean"]:
+			raise ValueError("Invalid cent_type input: " + str(cent_type))
+		if norm_type not in ["minmax", "l2"]:
+			raise ValueError("Invalid norm_type input: " + str(norm_type))
+		assert (block_size > 0), "block_size must be a positive integer"
+
+		self.num_vars = num_vars
+		self.num_cells = num_cells
+		self.max_modes = max_modes
+		self.cent_type = cent_type
+		self.norm_type = norm_type
+		self.block_size = block_size
+
+		self.inc_svd = IncrementalSVD(max_modes)
+		self.num_snaps = 0
+		self.dev_stats = None
+		self.block = []
+
+		# per-variable scaling of decomposed snapshots
+		self.scale = np.ones(num_vars, dtype=REAL_TYPE)
+
+	def add_snapshots(self, snaps):
+		"""
+		Add snapshots in [num_vars, num_cells] or [num_vars, num_cells, num_snaps] order
+		"""
+
+		if snaps.ndim == 2:
+			snaps = snaps[:, :, None]
+
+		# statistics of deviation from first snapshot
+		if self.num_snaps == 0:
+			self.ref_prof = snaps[:, :, 0].astype(REAL_TYPE)
+
+		dev = snaps - self.ref_prof[:, :, None]
+		self.dev_stats = combine_dev_stats(self.dev_stats, calc_dev_stats(dev))
+		self.num_snaps += snaps.shape[-1]
+
+		self.block.append(dev)
+		if sum([dev.shape[-1] for dev in self.block]) >= self.block_size:
+			self.update_svd()
+
+	def update_svd(self):
+		"""
+		Rescale decomposition to current normalization and add buffered snapshots
+		"""
+
+		if len(self.block) == 0:
+			return
+
+		_, _, norm_fac_prof = self.calc_profiles()
+		scale = norm_fac_prof[:, 0].copy()
+		scale[scale <= 0.0] = 1.0
+
+		if (self.inc_svd.basis is not None) and np.any(scale != self.scale):
+			scaled_basis = np.reshape(self.inc_svd.basis * self.inc_svd.sing_vals[None, :],
+										(self.num_vars, self.num_cells, -1))
+			scaled_basis *= (self.scale / scale)[:, None, None]
+			basis, sing_vals, _ = np.linalg.svd(np.reshape(scaled_basis, (-1, scaled_basis.shape[-1])),
+												full_matrices=False)
+			self.inc_svd.basis = basis
+			self.inc_svd.sing_vals = sing_vals
+		self.scale = scale
+
+		block = np.concatenate(self.block, axis=2) / scale[:, None, None]
+		self.inc_svd.update(np.reshape(block, (-1, block.shape[-1])))
+		self.block = []
+
+	def calc_profiles(self):
+		"""
+		Centering, normalization subtraction, and normalization factor profiles
+		of all snapshots added so far
+		"""
+
+		return calc_standardization_profiles(self.ref_prof, self.dev_stats,
+											self.cent_type, self.norm_type)
+
+	def calc_pod(self):
+		"""
+		Compute POD basis in [num_vars, num_cells, num_modes] order, singular values,
+		and centering, normalization subtraction, and normalization factor profiles
+		"""
+
+		assert (self.num_snaps > 0), "No snapshots have been added"
+		self.update_svd()
+
+		cent_prof, norm_sub_prof, norm_fac_prof = self.calc_profiles()
+		basis = self.inc_svd.basis
+		sing_vals = self.inc_svd.sing_vals
+
+		# decomposed snapshots X = U S V^T are scaled by the final normalization factors,
+		# 	standardized snapshots are X - shift * 1^T, so X * X^T is corrected
+		# 	by the shift and the exact column sum of X
+		shift = (cent_prof - self.ref_prof + norm_sub_prof) / self.scale[:, None]
+		shift = shift.ravel()
+		col_sum = (self.dev_stats[0] / self.scale[:, None]).ravel()
+
+		shift_coef = basis.T @ shift
+		shift_resid = shift - basis @ shift_coef
+		shift_resid -= basis @ (basis.T @ shift_resid)
+		shift_resid_norm = np.linalg.norm(shift_resid)
+
+		num_modes = sing_vals.size
+		sum_coef = np.zeros(num_modes + 1, dtype=REAL_TYPE)
+		sum_coef[:num_modes] = basis.T @ col_sum
+		shift_coef = np.append(shift_coef, shift_resid_norm)
+
+		gram = np.zeros((num_modes + 1, num_modes + 1), dtype=REAL_TYPE)
+		gram[:num_modes, :num_modes] = np.diag(np.square(sing_vals))
+		gram -= np.outer(sum_coef, shift_coef) + np.outer(shift_coef, sum_coef)
+		gram += self.num_snaps * np.outer(shift_coef, shift_coef)
+
+		if shift_resid_norm > 0.0:
+			basis = np.concatenate((basis, shift_resid[:, None] / shift_resid_norm), axis=1)
+		else:
+			gram = gram[:num_modes, :num_modes]
+
+		eig_vals, eig_vecs = np.linalg.eigh(gram)
+		order = np.argsort(eig_vals)[::-1][:self.max_modes]
+		sing_vals = np.sqrt(np.maximum(eig_vals[order], 0.0))
+		basis = basis @ eig_vecs[:, order]
+
+		basis = np.reshape(basis, (self.num_vars, self.num_cells, -1))
+
+		return basis, sing_vals, cent_prof, norm_sub_prof, norm_fac_prof
+
+
+def load_run_group(data_file, var_idxs, snap_slice):
+	"""
+	Load snapshots of one variable group from one run,
+	in [num_vars, num_cells, num_snaps] order
+	"""
+
+	snap_arr = np.load(data_file, mmap_mode="r")
+	return np.array(snap_arr[var_idxs, :, snap_slice], dtype=REAL_TYPE)
+
+
+def calc_run_dev_stats(data_file, var_idxs, snap_slice, ref_prof):
+	"""
+	Worker task, statistics of one run's deviations from ref_prof
+	"""
+
+	snaps = load_run_group(data_file, var_idxs, snap_slice)
+	return calc_dev_stats(snaps - ref_prof[:, :, None])
+
+
+def calc_run_r_factor(data_file, var_idxs, snap_slice, cent_prof, norm_sub_prof, norm_fac_prof):
+	"""
+	Worker task, R factor of the transposed standardized snapshot matrix of one run
+
+	For snapshot matrix X = [X_1, ..., X_r] of r runs, X^T = Q R and X * X^T = R^T * R,
+	so the R factor of all runs is the R factor of the stacked R factors of each run
+	"""
+
+	snaps = load_run_group(data_file, var_idxs, snap_slice)
+	snaps = (snaps - cent_prof[:, :, None] - norm_sub_prof[:, :, None]) / norm_fac_prof[:, :, None]
+	snap_mat = np.reshape(snaps, (-1, snaps.shape[-1]), order="C")
+
+	return np.linalg.qr(snap_mat.T, mode="r")
+
+
+def combine_r_factors(r_factor_a, r_factor_b):
+	"""
+	R factor of two stacked R factors
+	"""
+
+	if r_factor_a is None:
+		return r_factor_b
+
+	return np.linalg.qr(np.concatenate((r_factor_a, r_factor_b), axis=0), mode="r")
+
+
+def calc_pod_multi_run(data_files, var_idxs_list, max_modes, cent_type="initCond", norm_type="l2",
+						snap_slice=slice(None), num_procs=1, blas_threads=1):
+	"""
+	POD of snapshots from several runs by tall-skinny QR (TSQR)
+
+	Each (run, variable group) pair is a separate task, loading one run's group at a time.
+	Tasks are run on num_procs worker processes, and their results are reduced as they complete:
+	the first pass computes standardization profiles over all runs,
+	the second pass reduces each run to the R factor of its standardized snapshots.
+	The final SVD is of the combined R factor, at most [min(num_snaps, num_rows), num_rows],
+	rather than of the snapshot matrix
+
+	"initCond" centering uses the initial condition of the first run
+	Returns a list of (basis, sing_vals, cent_prof, norm_sub_prof, norm_fac_prof) for each group,
+	with basis in [num_vars, num_cells, num_modes] order
+	"""
+
+	tasks = [(run_idx, group_idx) for group_idx in range(len(var_idxs_list))
+			for run_idx in range(len(data_files))]
+
+	if num_procs > 1:
+		mp_context = multiprocessing.get_context("spawn")
+		executor = ProcessPoolExecutor(max_workers=num_procs, mp_context=mp_context)
+
+	def run_tasks(func, task_args):
+		"""
+		Yield (group index, result) of func for all tasks as they complete
+		"""
+
+		if num_procs == 1:
+			for (_, group_idx), args in zip(tasks, task_args):
+				yield group_idx, func(*args)
+		else:
+			futures = {executor.submit(func, *args): group_idx
+						for (_, group_idx), args in zip(tasks, task_args)}
+			for future in as_completed(futures):
+				yield futures[future], future.result()
+
+	# workers are spawned as tasks are submitted, in both passes
+	with blas_thread_env(blas_threads):
+		try:
+			# standardization profiles of each group over all runs
+			ref_profs = [load_run_group(data_files[0], var_idxs, snap_slice)[:, :, 0]
+						for var_idxs in var_idxs_list]
+			task_args = [(data_files[run_idx], var_idxs_list[group_idx], snap_slice, ref_profs[group_idx])
+						for run_idx, group_idx in tasks]
+			dev_stats = [None] * len(var_idxs_list)
+			for group_idx, stats in run_tasks(calc_run_dev_stats, task_args):
+				dev_stats[group_idx] = combine_dev_stats(dev_stats[group_idx], stats)
+
+			profs = [calc_standardization_profiles(ref_profs[group_idx], dev_stats[group_idx],
+													cent_type, norm_type)
+					for group_idx in range(len(var_idxs_list))]
+
+			# R factor of each group over all runs
+			task_args = [(data_files[run_idx], var_idxs_list[group_idx], snap_slice) + profs[group_idx]
+						for run_idx, group_idx in tasks]
+			r_factors = [None] * len(var_idxs_list)
+			for group_idx, r_factor in run_tasks(calc_run_r_factor, task_args):
+				r_factors[group_idx] = combine_r_factors(r_factors[group_idx], r_factor)
+
+		finally:
+			if num_procs > 1:
+				executor.shutdown()
+
+	# left singular vectors of snapshot matrix are right singular vectors of R
+	results = []
+	for group_idx, var_idxs in enumerate(var_idxs_list):
+		_, sing_vals, basis_trans = np.linalg.svd(r_factors[group_idx], full_matrices=False)
+		basis = basis_trans[:max_modes, :].T
+		basis = np.reshape(basis, (len(var_idxs), -1, basis.shape[-1]), order="C")
+		results.append((basis, sing_vals) + profs[group_idx])
+
+	return results
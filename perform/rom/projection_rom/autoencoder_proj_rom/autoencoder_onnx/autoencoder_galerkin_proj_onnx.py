@@ -0,0 +1,8 @@
+from perform.rom.projection_rom.autoencoder_proj_rom.autoencoder_galerkin_proj import AutoencoderGalerkinProj
+from perform.rom.projection_rom.autoencoder_proj_rom.autoencoder_onnx.autoencoder_onnx import AutoencoderONNX
+
+
+class AutoencoderGalerkinProjONNX(AutoencoderGalerkinProj, AutoencoderONNX):
+	"""
+	Class for computing non-linear Galerkin ROMs via an ONNX Runtime autoencoder
+	"""
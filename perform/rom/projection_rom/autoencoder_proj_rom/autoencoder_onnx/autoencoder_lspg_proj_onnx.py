@@ -0,0 +1,8 @@
+from perform.rom.projection_rom.autoencoder_proj_rom.autoencoder_lspg_proj import AutoencoderLSPGProj
+from perform.rom.projection_rom.autoencoder_proj_rom.autoencoder_onnx.autoencoder_onnx import AutoencoderONNX
+
+
+class AutoencoderLSPGProjONNX(AutoencoderLSPGProj, AutoencoderONNX):
+	"""
+	Class for computing non-linear least-squares Petrov-Galerkin ROMs via an ONNX Runtime autoencoder
+	"""
@@ -0,0 +1,127 @@
+from time import time
+
+import numpy as np
+
+from perform.input_funcs import catch_input
+from perform.rom.projection_rom.autoencoder_proj_rom.autoencoder_proj_rom import AutoencoderProjROM
+from perform.rom.onnx_funcs import load_model_obj, get_io_dtype, has_dynamic_batch
+
+
+class AutoencoderONNX(AutoencoderProjROM):
+	"""
+	Base class for autoencoder projection-based ROMs using ONNX Runtime
+	Models are evaluated on the CPU, and are not differentiable,
+	so the decoder Jacobian is always computed by finite differences
+	"""
+
+	def __init__(self, model_idx, rom_domain, solver, sol_domain):
+
+		rom_dict = rom_domain.rom_dict
+
+		self.num_threads = catch_input(rom_dict, "num_threads", 1)
+		assert (self.num_threads > 0), "num_threads must be a positive integer"
+
+		# "nchw" (channels first) or "nhwc" (channels last)
+		self.io_format = catch_input(rom_dict, "io_format", "nchw")
+		if self.io_format not in ["nchw", "nhwc"]:
+			raise ValueError("io_format must be either \"nchw\" or \"nhwc\";"
+							+ "you entered " + str(self.io_format))
+
+		super().__init__(model_idx, rom_domain, solver, sol_domain)
+
+		if self.encoder_jacob:
+			raise ValueError("ONNX models are not differentiable,"
+							+ " please set encoder_jacob = False")
+		self.numerical_jacob = True
+
+		self.decoder_io_names = [self.decoder.get_inputs()[0].name, self.decoder.get_outputs()[0].name]
+		self.decoder_batch = has_dynamic_batch(self.decoder.get_inputs()[0])
+		if self.encoder is not None:
+			self.encoder_io_names = [self.encoder.get_inputs()[0].name, self.encoder.get_outputs()[0].name]
+
+	def load_model_obj(self, model_path):
+		"""
+		Load ONNX Runtime inference session
+		"""
+
+		return load_model_obj(model_path, self.num_threads)
+
+	def check_model(self, decoder=True):
+		"""
+		Check decoder/encoder input/output dimensions and returns I/O dtypes
+		"""
+
+		if decoder:
+			model_input = self.decoder.get_inputs()[0]
+			model_output = self.decoder.get_outputs()[0]
+
+			assert (model_input.shape[-1] == self.latent_dim), \
+				("Mismatched decoder input shape: "
+				+ str(model_input.shape[-1]) + ", " + str(self.latent_dim))
+
+			assert (list(model_output.shape[-2:]) == self.get_sol_io_shape()), \
+				("Mismatched decoder output shape: "
+				+ str(model_output.shape[-2:]) + ", " + str(self.get_sol_io_shape()))
+
+		else:
+			model_input = self.encoder.get_inputs()[0]
+			model_output = self.encoder.get_outputs()[0]
+
+			assert (model_output.shape[-1] == self.latent_dim), \
+				("Mismatched encoder output shape: "
+				+ str(model_output.shape[-1]) + ", " + str(self.latent_dim))
+
+			assert (list(model_input.shape[-2:]) == self.get_sol_io_shape()), \
+				("Mismatched encoder input shape: "
+				+ str(model_input.shape[-2:]) + ", " + str(self.get_sol_io_shape()))
+
+		return [get_io_dtype(model_input), get_io_dtype(model_output)]
+
+	def apply_decoder_batch(self, codes):
+		"""
+		Compute raw decoding of codes in [batch, latent_dim] order,
+		returned in [batch, decoder output shape] order
+		"""
+
+		codes_in = np.asarray(codes, dtype=self.decoder_io_dtypes[0])
+		input_name, output_name = self.decoder_io_names
+
+		# models exported with a fixed batch size of one are evaluated for each code
+		if self.decoder_batch:
+			return self.decoder.run([output_name], {input_name: codes_in})[0]
+		else:
+			return np.concatenate([self.decoder.run([output_name], {input_name: codes_in[[idx], :]})[0]
+									for idx in range(codes_in.shape[0])], axis=0)
+
+	def apply_encoder(self, sol):
+		"""
+		Compute raw encoding of solution,
+		assuming it has been centered and normalized
+		"""
+
+		if self.io_format == "nhwc":
+			sol_in = sol.T
+		else:
+			sol_in = sol
+		sol_in = np.asarray(sol_in[None, :, :], dtype=self.encoder_io_dtypes[0])
+
+		input_name, output_name = self.encoder_io_names
+		code = np.squeeze(self.encoder.run([output_name], {input_name: sol_in})[0], axis=0)
+
+		return code
+
+	def calc_model_jacobian(self, sol_domain):
+		"""
+		Helper function for calculating finite difference decoder Jacobian
+		"""
+
+		time_start = time()
+
+		jacob = self.calc_numerical_decoder_jacobian(self.code)
+		if self.io_format == "nhwc":
+			jacob = np.transpose(jacob, axes=(1, 0, 2))
+		jacob = np.reshape(jacob, (-1, self.latent_dim), order='C')
+
+		self.decoder_time += time() - time_start
+
+		return jacob
@@ -0,0 +1,8 @@
+from perform.rom.projection_rom.autoencoder_proj_rom.autoencoder_splsvt_proj import AutoencoderSPLSVTProj
+from perform.rom.projection_rom.autoencoder_proj_rom.autoencoder_onnx.autoencoder_onnx import AutoencoderONNX
+
+
+class AutoencoderSPLSVTProjONNX(AutoencoderSPLSVTProj, AutoencoderONNX):
+	"""
+	Class for computing non-linear SP-LSVT ROMs via an ONNX Runtime autoencoder
+	"""
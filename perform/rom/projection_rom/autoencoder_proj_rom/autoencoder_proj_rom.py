@@ -1,4 +1,7 @@
 import os
+from time import time
+
+import numpy as np
 
 from perform.constants import FD_STEP_DEFAULT
 from perform.rom.projection_rom.projection_rom import ProjectionROM
@@ -10,7 +13,8 @@ class AutoencoderProjROM(ProjectionROM):
 	Base class for any non-linear manifold ROM using autoencoders
 
 	Child classes simply supply library-dependent functions
-	(e.g. for TensorFlow, PyTorch)
+	(e.g. for TensorFlow, PyTorch), including apply_decoder_batch, apply_encoder,
+	and calc_model_jacobian, and must set io_format before calling __init__
 	"""
 
 	def __init__(self, model_idx, rom_domain, solver, sol_domain):
@@ -49,33 +53,54 @@ class AutoencoderProjROM(ProjectionROM):
 		self.numerical_jacob = catch_input(rom_dict, "numerical_jacob", False)
 		self.fd_step = catch_input(rom_dict, "fd_step", FD_STEP_DEFAULT)
 
+	def get_sol_io_shape(self):
+		"""
+		Shape of full-dimensional model input/output, without batch dimension
+		"nchw" (channels first) is [num_vars, num_cells], "nhwc" (channels last) is [num_cells, num_vars]
+		"""
+
+		if self.io_format == "nhwc":
+			return list(self.sol_shape[::-1])
+		else:
+			return list(self.sol_shape)
+
+	def apply_decoder(self, code):
+		"""
+		Compute raw decoding of code, without de-normalizing or de-centering
+		"""
+
+		time_start = time()
+
+		sol = self.apply_decoder_batch(code[None, :])[0, :, :]
+		if self.io_format == "nhwc":
+			sol = sol.T
+
+		self.decoder_time += time() - time_start
+
+		return sol
+
+	def calc_numerical_decoder_jacobian(self, code):
+		"""
+		Compute decoder Jacobian by finite difference approximation,
+		evaluating the base and all perturbed codes in one batch with apply_decoder_batch
+		Returned Jacobian is in [decoder output shape, latent_dim] order
+		"""
+
+		codes = np.tile(code[None, :], (self.latent_dim + 1, 1))
+		codes[1:, :] += self.fd_step * np.eye(self.latent_dim)
+
+		outputs = self.apply_decoder_batch(codes)
+		jacob = (outputs[1:, ...] - outputs[[0], ...]) / self.fd_step
+
+		return np.moveaxis(jacob, 0, -1)
+
 	def encode_sol(self, solIn):
 		"""
 		Compute encoding of full-dimensional state,
 		including centering and normalization
 		"""
 
-		if self.target_cons:
-			sol = \
-				self.standardize_data(
-					solIn,
-					normalize=True,
-					norm_fac_prof=self.norm_fac_prof_cons,
-					norm_sub_prof=self.norm_sub_prof_cons,
-					center=True, cent_prof=self.cent_prof_cons,
-					inverse=False
-				)
-
-		else:
-			sol = \
-				self.standardize_data(
-					solIn,
-					normalize=True,
-					norm_fac_prof=self.norm_fac_prof_prim,
-					norm_sub_prof=self.norm_sub_prof_prim,
-					center=True, cent_prof=self.cent_prof_prim,
-					inverse=False
-				)
+		sol = np.reshape(self.standardize_vec(np.ravel(solIn, order="C")), self.sol_shape, order="C")
 
 		code = self.apply_encoder(sol)
 
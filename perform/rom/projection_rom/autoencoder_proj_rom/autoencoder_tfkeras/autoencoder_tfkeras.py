@@ -1,10 +1,12 @@
+from time import time
+
 import numpy as np
-import tensorflow as tf
 
-from perform.constants import REAL_TYPE
+from perform.constants import FORWARD_JACOB_MAX_DIM_DEFAULT
 from perform.input_funcs import catch_input
 from perform.rom.projection_rom.autoencoder_proj_rom.autoencoder_proj_rom import AutoencoderProjROM
-from perform.rom.tf_keras_funcs import init_device, load_model_obj, get_io_shape
+from perform.rom.tf_keras_funcs import init_device, load_model_obj, get_io_shape, \
+	compile_model, compile_forward_jacobian, compile_reverse_jacobian
 
 
 class AutoencoderTFKeras(AutoencoderProjROM):
@@ -33,25 +35,26 @@ class AutoencoderTFKeras(AutoencoderProjROM):
 
 		super().__init__(model_idx, rom_domain, solver, sol_domain)
 
-		# initialize tf.Variable for Jacobian calculations
-		# otherwise, recreating this will cause retracing of the computational graph
+		# forward-mode decoder Jacobian, preferable for small latent dimensions
+		self.forward_jacob = catch_input(rom_domain.rom_dict, "forward_jacob",
+										self.latent_dim <= FORWARD_JACOB_MAX_DIM_DEFAULT)
+
+		# compile model evaluations and Jacobians with fixed input signatures,
+		# 	so that the computational graphs are only traced once
+		self.decoder_func = compile_model(self.decoder, [self.latent_dim], self.decoder_io_dtypes[0])
 		if not self.numerical_jacob:
 			if self.encoder_jacob:
-				if self.io_format == "nhwc":
-					if self.target_cons:
-						sol_init = (sol_domain.sol_int.sol_cons.T)[None, :, self.var_idxs]
-					else:
-						sol_init = (sol_domain.sol_int.sol_prim.T)[None, :, self.var_idxs]
-				else:
-					if self.target_cons:
-						sol_init = (sol_domain.sol_int.sol_cons)[None, :, self.var_idxs]
-					else:
-						sol_init = (sol_domain.sol_int.sol_prim)[None, :, self.var_idxs]
-				self.jacob_input = tf.Variable(sol_init, dtype=self.encoder_io_dtypes[0])
-
+				self.jacob_func = compile_reverse_jacobian(self.encoder, self.get_sol_io_shape(),
+															self.encoder_io_dtypes[0])
+			elif self.forward_jacob:
+				self.jacob_func = compile_forward_jacobian(self.decoder, self.latent_dim,
+															self.decoder_io_dtypes[0])
 			else:
-				self.jacob_input = tf.Variable(self.code[None, :],
-												dtype=self.decoder_io_dtypes[0])
+				self.jacob_func = compile_reverse_jacobian(self.decoder, [self.latent_dim],
+															self.decoder_io_dtypes[0])
+		if self.encoder is not None:
+			self.encoder_func = compile_model(self.encoder, self.get_sol_io_shape(),
+												self.encoder_io_dtypes[0])
 
 	def check_model(self, decoder=True):
 		"""
@@ -101,16 +104,15 @@ class AutoencoderTFKeras(AutoencoderProjROM):
 
 		return [input_dtype, output_dtype]
 
-	def apply_decoder(self, code):
+	def apply_decoder_batch(self, codes):
 		"""
-		Compute raw decoding of code, without de-normalizing or de-centering
+		Compute raw decoding of codes in [batch, latent_dim] order,
+		returned in [batch, decoder output shape] order
 		"""
 
-		sol = np.squeeze(self.decoder(code[None, :]).numpy(), axis=0)
-		if self.io_format == "nhwc":
-			sol = sol.T
+		codes_in = np.asarray(codes, dtype=self.decoder_io_dtypes[0])
 
-		return sol
+		return self.decoder_func(codes_in).numpy()
 
 	def apply_encoder(self, sol):
 		"""
@@ -119,76 +121,19 @@ class AutoencoderTFKeras(AutoencoderProjROM):
 		"""
 
 		if self.io_format == "nhwc":
-			sol_in = (sol.copy()).T
+			sol_in = sol.T
 		else:
-			sol_in = sol.copy()
-		code = np.squeeze(self.encoder(sol_in[None, :, :]).numpy(), axis=0)
+			sol_in = sol
+		sol_in = np.asarray(sol_in[None, :, :], dtype=self.encoder_io_dtypes[0])
+		code = np.squeeze(self.encoder_func(sol_in).numpy(), axis=0)
 
 		return code
 
-	@tf.function
-	def calc_analytical_model_jacobian(self, model, inputs):
-		"""
-		Compute analytical Jacobian of TensorFlow-Keras model using GradientTape
-		NOTE: inputs is a tf.Variable
-		"""
-
-		with tf.GradientTape() as g:
-			outputs = model(inputs)
-		jacob = g.jacobian(outputs, inputs)
-
-		return jacob
-
-	def calc_numerical_model_jacobian(self, model, inputs):
-		"""
-		Compute numerical Jacobian of TensorFlow-Keras models
-		by finite difference approximation
-
-		NOTE: inputs is a np.ndarray
-		"""
-
-		if self.encoder_jacob:
-			raise ValueError("Numerical encoder Jacobian not implemented yet")
-			if self.io_format == "nhwc":
-				jacob = np.zeros((inputs.shape[0], self.num_cells, self.numVars),
-								dtype=REAL_TYPE)
-			else:
-				jacob = np.zeros((inputs.shape[0], self.numVars, self.num_cells),
-								dtype=REAL_TYPE)
-
-		else:
-			if self.io_format == "nhwc":
-				jacob = np.zeros((self.num_cells, self.numVars, inputs.shape[0]),
-								dtype=REAL_TYPE)
-			else:
-				jacob = np.zeros((self.numVars, self.num_cells, inputs.shape[0]),
-								dtype=REAL_TYPE)
-
-		# get initial prediction
-		outputsBase = np.squeeze(model(inputs[None, :]).numpy(), axis=0)
-
-		# TODO: this does not generalize to encoder Jacobian
-		for elemIdx in range(0, inputs.shape[0]):
-
-			# perturb
-			inputsPert = inputs.copy()
-			inputsPert[elemIdx] = inputsPert[elemIdx] + self.fd_step
-
-			# make prediction at perturbed state
-			outputs = np.squeeze(model(inputsPert[None, :]).numpy(), axis=0)
-
-			# compute finite difference approximation
-			jacob[:, :, elemIdx] = (outputs - outputsBase) / self.fd_step
-
-		return jacob
-
 	def calc_model_jacobian(self, sol_domain):
 		"""
 		Helper function for calculating TensorFlow-Keras model Jacobian
 		"""
 
-		# TODO: generalize this for generic model, input
-
 		if self.encoder_jacob:
 			# TODO: only calculate the standardized solution once, hang onto it
 			# 	don't have to pass sol_domain, too
@@ -197,8 +142,8 @@ class AutoencoderTFKeras(AutoencoderProjROM):
 					sol_domain.sol_int.sol_cons[self.var_idxs, :],
 					normalize=True,
 					norm_fac_prof=self.norm_fac_prof_cons,
-					norm_sub_prof=self.normSubProfCons,
-					center=True, centProf=self.centProfCons,
+					norm_sub_prof=self.norm_sub_prof_cons,
+					center=True, cent_prof=self.cent_prof_cons,
 					inverse=False
 				)
 
@@ -206,13 +151,11 @@ class AutoencoderTFKeras(AutoencoderProjROM):
 				sol = np.transpose(sol, axes=(1, 0))
 
 			if self.numerical_jacob:
-				jacob = self.calc_numerical_model_jacobian(self.encoder, sol)
+				raise ValueError("Numerical encoder Jacobian not implemented yet")
 
 			else:
-				self.jacob_input.assign(sol[None, :, :])
-				jacob_tf = \
-					self.calc_analytical_model_jacobian(self.encoder, self.jacob_input)
-				jacob = tf.squeeze(jacob_tf, axis=[0, 2]).numpy()
+				sol_in = np.asarray(sol[None, :, :], dtype=self.encoder_io_dtypes[0])
+				jacob = np.squeeze(self.jacob_func(sol_in).numpy(), axis=(0, 2))
 
 			if self.io_format == "nhwc":
 				jacob = np.transpose(jacob, axes=(0, 2, 1))
@@ -221,17 +164,24 @@ class AutoencoderTFKeras(AutoencoderProjROM):
 
 		else:
 
+			time_start = time()
+
 			if self.numerical_jacob:
-				jacob = self.calc_numerical_model_jacobian(self.decoder, self.code)
+				jacob = self.calc_numerical_decoder_jacobian(self.code)
+
 			else:
-				self.jacob_input.assign(self.code[None, :])
-				jacob_tf = \
-					self.calc_analytical_model_jacobian(self.decoder, self.jacob_input)
-				jacob = tf.squeeze(jacob_tf, axis=[0, 3]).numpy()
+				if self.forward_jacob:
+					code_in = np.asarray(self.code, dtype=self.decoder_io_dtypes[0])
+					jacob = np.transpose(self.jacob_func(code_in).numpy(), axes=(1, 2, 0))
+				else:
+					code_in = np.asarray(self.code[None, :], dtype=self.decoder_io_dtypes[0])
+					jacob = np.squeeze(self.jacob_func(code_in).numpy(), axis=(0, 3))
 
 			if self.io_format == "nhwc":
 				jacob = np.transpose(jacob, axes=(1, 0, 2))
 
 			jacob = np.reshape(jacob, (-1, self.latent_dim), order='C')
 
+			self.decoder_time += time() - time_start
+
 		return jacob
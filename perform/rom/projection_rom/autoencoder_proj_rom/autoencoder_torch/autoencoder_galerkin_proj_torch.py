@@ -0,0 +1,8 @@
+from perform.rom.projection_rom.autoencoder_proj_rom.autoencoder_galerkin_proj import AutoencoderGalerkinProj
+from perform.rom.projection_rom.autoencoder_proj_rom.autoencoder_torch.autoencoder_torch import AutoencoderTorch
+
+
+class AutoencoderGalerkinProjTorch(AutoencoderGalerkinProj, AutoencoderTorch):
+	"""
+	Class for computing non-linear Galerkin ROMs via a PyTorch autoencoder
+	"""
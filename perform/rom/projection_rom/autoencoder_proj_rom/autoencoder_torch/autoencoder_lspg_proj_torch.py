@@ -0,0 +1,8 @@
+from perform.rom.projection_rom.autoencoder_proj_rom.autoencoder_lspg_proj import AutoencoderLSPGProj
+from perform.rom.projection_rom.autoencoder_proj_rom.autoencoder_torch.autoencoder_torch import AutoencoderTorch
+
+
+class AutoencoderLSPGProjTorch(AutoencoderLSPGProj, AutoencoderTorch):
+	"""
+	Class for computing non-linear least-squares Petrov-Galerkin ROMs via a PyTorch autoencoder
+	"""
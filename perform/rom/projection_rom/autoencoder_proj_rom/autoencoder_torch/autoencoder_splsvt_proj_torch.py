@@ -0,0 +1,8 @@
+from perform.rom.projection_rom.autoencoder_proj_rom.autoencoder_splsvt_proj import AutoencoderSPLSVTProj
+from perform.rom.projection_rom.autoencoder_proj_rom.autoencoder_torch.autoencoder_torch import AutoencoderTorch
+
+
+class AutoencoderSPLSVTProjTorch(AutoencoderSPLSVTProj, AutoencoderTorch):
+	"""
+	Class for computing non-linear SP-LSVT ROMs via a PyTorch autoencoder
+	"""
@@ -0,0 +1,159 @@
+from time import time
+import warnings
+
+import numpy as np
+import torch
+
+from perform.input_funcs import catch_input
+from perform.rom.projection_rom.autoencoder_proj_rom.autoencoder_proj_rom import AutoencoderProjROM
+from perform.rom.torch_funcs import init_device, load_model_obj
+
+
+class AutoencoderTorch(AutoencoderProjROM):
+	"""
+	Base class for autoencoder projection-based ROMs using PyTorch
+	Analytical decoder Jacobians are computed in forward mode with torch.func.jacfwd,
+	and encoder Jacobians in reverse mode with torch.func.jacrev
+	"""
+
+	def __init__(self, model_idx, rom_domain, solver, sol_domain):
+
+		rom_dict = rom_domain.rom_dict
+
+		self.run_gpu = catch_input(rom_dict, "run_gpu", False)
+		self.num_threads = catch_input(rom_dict, "num_threads", 1)
+		assert (self.num_threads > 0), "num_threads must be a positive integer"
+		self.device = init_device(self.run_gpu, self.num_threads)
+
+		# "nchw" (channels first) or "nhwc" (channels last)
+		self.io_format = catch_input(rom_dict, "io_format", "nchw")
+		if self.io_format not in ["nchw", "nhwc"]:
+			raise ValueError("io_format must be either \"nchw\" or \"nhwc\";"
+							+ "you entered " + str(self.io_format))
+
+		super().__init__(model_idx, rom_domain, solver, sol_domain)
+
+		# single-sample model evaluations, for differentiation
+		self.decoder_single = lambda code: self.decoder(code[None, :])[0, ...]
+		if self.encoder is not None:
+			self.encoder_single = lambda sol: self.encoder(sol[None, ...])[0, ...]
+
+		# torch.func lazily loads its decompositions on first use, which emits library warnings
+		# 	that would otherwise be raised as errors during the solve
+		if not self.numerical_jacob:
+			with warnings.catch_warnings():
+				warnings.simplefilter("ignore")
+				self.calc_model_jacobian(sol_domain)
+			self.decoder_time = 0.0
+
+	def load_model_obj(self, model_path):
+		"""
+		Load PyTorch model onto device
+		"""
+
+		return load_model_obj(model_path, self.device)
+
+	def check_model(self, decoder=True):
+		"""
+		Check decoder/encoder input/output dimensions and returns I/O dtypes
+		PyTorch models do not store I/O shapes, so they are checked by evaluating the model
+		"""
+
+		if decoder:
+			dtype = next(self.decoder.parameters()).dtype
+			with torch.inference_mode():
+				output = self.decoder(torch.zeros((1, self.latent_dim), dtype=dtype, device=self.device))
+
+			assert (list(output.shape[-2:]) == self.get_sol_io_shape()), \
+				("Mismatched decoder output shape: "
+				+ str(list(output.shape[-2:])) + ", " + str(self.get_sol_io_shape()))
+
+		else:
+			dtype = next(self.encoder.parameters()).dtype
+			with torch.inference_mode():
+				output = self.encoder(torch.zeros([1] + self.get_sol_io_shape(), dtype=dtype, device=self.device))
+
+			assert (output.shape[-1] == self.latent_dim), \
+				("Mismatched encoder output shape: "
+				+ str(output.shape[-1]) + ", " + str(self.latent_dim))
+
+		return [dtype, output.dtype]
+
+	def apply_decoder_batch(self, codes):
+		"""
+		Compute raw decoding of codes in [batch, latent_dim] order,
+		returned in [batch, decoder output shape] order
+		"""
+
+		codes_in = torch.as_tensor(codes, dtype=self.decoder_io_dtypes[0], device=self.device)
+		with torch.inference_mode():
+			sols = self.decoder(codes_in)
+
+		return sols.cpu().numpy()
+
+	def apply_encoder(self, sol):
+		"""
+		Compute raw encoding of solution,
+		assuming it has been centered and normalized
+		"""
+
+		if self.io_format == "nhwc":
+			sol_in = sol.T
+		else:
+			sol_in = sol
+		sol_in = torch.as_tensor(np.ascontiguousarray(sol_in[None, :, :]),
+									dtype=self.encoder_io_dtypes[0], device=self.device)
+		with torch.inference_mode():
+			code = self.encoder(sol_in)
+
+		return code[0, :].cpu().numpy()
+
+	def calc_model_jacobian(self, sol_domain):
+		"""
+		Helper function for calculating PyTorch model Jacobian
+		"""
+
+		if self.encoder_jacob:
+			sol = \
+				self.standardize_data(
+					sol_domain.sol_int.sol_cons[self.var_idxs, :],
+					normalize=True,
+					norm_fac_prof=self.norm_fac_prof_cons,
+					norm_sub_prof=self.norm_sub_prof_cons,
+					center=True, cent_prof=self.cent_prof_cons,
+					inverse=False
+				)
+
+			if self.io_format == "nhwc":
+				sol = np.transpose(sol, axes=(1, 0))
+
+			if self.numerical_jacob:
+				raise ValueError("Numerical encoder Jacobian not implemented yet")
+
+			sol_in = torch.as_tensor(np.ascontiguousarray(sol), dtype=self.encoder_io_dtypes[0],
+										device=self.device)
+			jacob = torch.func.jacrev(self.encoder_single)(sol_in).detach().cpu().numpy()
+
+			if self.io_format == "nhwc":
+				jacob = np.transpose(jacob, axes=(0, 2, 1))
+
+			jacob = np.reshape(jacob, (self.latent_dim, -1), order='C')
+
+		else:
+
+			time_start = time()
+
+			if self.numerical_jacob:
+				jacob = self.calc_numerical_decoder_jacobian(self.code)
+			else:
+				code_in = torch.as_tensor(self.code, dtype=self.decoder_io_dtypes[0], device=self.device)
+				jacob = torch.func.jacfwd(self.decoder_single)(code_in).detach().cpu().numpy()
+
+			if self.io_format == "nhwc":
+				jacob = np.transpose(jacob, axes=(1, 0, 2))
+
+			jacob = np.reshape(jacob, (-1, self.latent_dim), order='C')
+
+			self.decoder_time += time() - time_start
+
+		return jacob
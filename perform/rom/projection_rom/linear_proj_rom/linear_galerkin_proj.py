@@ -1,6 +1,7 @@
 import numpy as np
 
 from perform.rom.projection_rom.linear_proj_rom.linear_proj_rom import LinearProjROM
+from perform.rom.reduced_op_funcs import load_reduced_ops, calc_reduced_rhs
 
 
 class LinearGalerkinProj(LinearProjROM):
@@ -18,6 +19,41 @@ class LinearGalerkinProj(LinearProjROM):
 
 		super().__init__(model_idx, rom_domain, solver, sol_domain)
 
+		# reduced operators replace the full-order RHS evaluation
+		self.reduced_ops = rom_domain.reduced_ops
+		if self.reduced_ops:
+			self.load_reduced_ops(rom_domain.reduced_ops_files[self.model_idx])
+
+	def load_reduced_ops(self, reduced_ops_file):
+		"""
+		Load constant, linear, and expanded quadratic operators of continuous-time reduced model
+		"""
+
+		self.const_op, self.lin_op, self.quad_tens, _ = \
+			load_reduced_ops(reduced_ops_file, "continuous", self.latent_dim)
+
+	def calc_rhs_low_dim(self, rom_domain, sol_domain):
+		"""
+		Project RHS onto low-dimensional space for explicit time integrators,
+		or evaluate reduced operators without computing the full-order RHS
+		"""
+
+		if self.reduced_ops:
+			self.rhs_low_dim, _ = calc_reduced_rhs(self.code, self.const_op, self.lin_op, self.quad_tens)
+		else:
+			super().calc_rhs_low_dim(rom_domain, sol_domain)
+
+	def calc_d_code_exp(self, time_integrator):
+		"""
+		Compute change in low-dimensional state for exponential integrators
+		from reduced operators and their Jacobian
+		"""
+
+		rhs_low_dim, rhs_jacob = \
+			calc_reduced_rhs(self.code, self.const_op, self.lin_op, self.quad_tens, jacob=True)
+
+		return time_integrator.solve_sol_change(rhs_low_dim, rhs_jacob)
+
 	def calc_projector(self, sol_domain):
 		"""
 		Compute rhs projection operator
@@ -25,37 +61,69 @@ class LinearGalerkinProj(LinearProjROM):
 
 		if self.hyper_reduc:
 			# V^T * U * [S^T * U]^+
-			self.projector = (
-				self.trial_basis.T @ self.hyper_reduc_basis
-				@ np.linalg.pinv(self.hyper_reduc_basis[self.direct_hyper_reduc_samp_idxs, :])
-			)
+			self.projector = self.trial_basis.T @ self.hyper_reduc_basis @ self.hyper_reduc_pinv
 
 		else:
 			# V^T
 			self.projector = self.trial_basis.T
 
+		# adapted trial bases are not orthonormal, [V^T * V]^-1 is applied to the projector
+		if self.adaptive_rom:
+			self.projector_base = self.projector.copy()
+			self.basis_gram = self.trial_basis.T @ self.trial_basis
+			self.projector = np.linalg.solve(self.basis_gram, self.projector_base)
+
+	def update_projector(self, basis_rows, d_basis):
+		"""
+		Update Gram matrix and projector incrementally before low-rank trial basis update
+		"""
+
+		cross = self.trial_basis[basis_rows, :].T @ d_basis
+		self.basis_gram += cross + cross.T + d_basis.T @ d_basis
+
+		if self.hyper_reduc:
+			self.projector_base += \
+				d_basis.T @ (self.hyper_reduc_basis[basis_rows, :] @ self.hyper_reduc_pinv)
+		else:
+			self.projector_base[:, basis_rows] += d_basis.T
+
+		self.projector = np.linalg.solve(self.basis_gram, self.projector_base)
+
 	def calc_d_code(self, res_jacob, res, sol_domain):
 		"""
 		Compute change in low-dimensional state for implicit scheme Newton iteration
 		"""
 
-		# TODO: should be calculated once
-		scaled_trial_basis = \
-			self.trial_basis * self.norm_fac_prof_cons.ravel(order="C")[:, None]
+		# projector is gappy if using hyper-reduction
+		lhs = self.projector @ self.calc_scaled_jacob_basis(res_jacob)
+		rhs = self.projector @ self.calc_scaled_res(res, sol_domain)
+
+		d_code = np.linalg.solve(lhs, rhs)
+
+		return d_code, lhs, rhs
+
+	def reduce_res_rows(self, res_rows):
+		"""
+		Project scaled residual (or scaled residual Jacobian columns) of model variables at sampled cells
+		for coupled multi-model Newton iterations
+		"""
+
+		return self.projector @ res_rows
+
+	def calc_d_code_reduced(self, time_integrator, solver):
+		"""
+		Compute change in low-dimensional state for implicit scheme Newton iteration
+		from reduced operators, without computing the full-order residual
+		"""
 
-		# TODO: using res_jacob.toarray(), otherwise this
-		# 	operation returns type np.matrix, which is undesirable
-		# 	Need to figure out a more efficient method, if possible
-		lhs = (
-			self.trial_basis.T @ (res_jacob.toarray()
-			/ self.norm_fac_prof_cons.ravel(order="C")[:, None])
-			@ scaled_trial_basis
-		)
+		rhs_low_dim, rhs_jacob = \
+			calc_reduced_rhs(self.code, self.const_op, self.lin_op, self.quad_tens, jacob=True)
+		rhs = time_integrator.calc_residual(self.code_hist, rhs_low_dim, solver)
 
-		rhs = (
-			self.trial_basis.T
-			@ (res / self.norm_fac_prof_cons).ravel(order="C")
-		)
+		# account for cold start
+		time_order = min(solver.iter, time_integrator.time_order)
+		lhs = -rhs_jacob
+		lhs[np.diag_indices_from(lhs)] += time_integrator.coeffs[time_order - 1][0] / time_integrator.dt
 
 		d_code = np.linalg.solve(lhs, rhs)
 
@@ -1,6 +1,11 @@
+from collections import deque
+
 import numpy as np
 
 from perform.rom.projection_rom.projection_rom import ProjectionROM
+from perform.rom.adaptive_basis_funcs import calc_samp_rows, select_samp_cells, calc_basis_update
+from perform.rom.least_squares_funcs import factorize_lsq, solve_lsq
+from perform.rom.basis_funcs import load_basis
 
 
 class LinearProjROM(ProjectionROM):
@@ -13,10 +18,11 @@ class LinearProjROM(ProjectionROM):
 
 		super().__init__(model_idx, rom_domain, solver, sol_domain)
 
-		# load and check trial basis
-		self.trial_basis = np.load(rom_domain.model_files[self.model_idx])
-		num_vars_basis_in, num_cells_basis_in, num_modes_basis_in = \
-			self.trial_basis.shape
+		# load and check trial basis, reading only the modes in use
+		self.trial_basis, basis_shape = \
+			load_basis(rom_domain.model_files[self.model_idx], self.latent_dim,
+						cache_dir=rom_domain.basis_cache_dir)
+		num_vars_basis_in, num_cells_basis_in, _ = basis_shape
 
 		assert (num_vars_basis_in == self.num_vars), \
 			("Basis at " + rom_domain.model_files[self.model_idx]
@@ -27,38 +33,131 @@ class LinearProjROM(ProjectionROM):
 			("Basis at " + rom_domain.model_files[self.model_idx]
 			+ " has a different number of cells than the physical domain ("
 			+ str(num_cells_basis_in) + " != " + str(solver.mesh.num_cells) + ")")
-		assert (num_modes_basis_in >= self.latent_dim), \
-			("Basis at " + rom_domain.model_files[self.model_idx]
-			+ " must have at least " + str(self.latent_dim) + " modes ("
-			+ str(num_modes_basis_in) + " < " + str(self.latent_dim) + ")")
-
-		# flatten first two dimensions for easier matmul
-		self.trial_basis = self.trial_basis[:, :, :self.latent_dim]
-		self.trial_basis = \
-			np.reshape(self.trial_basis, (-1, self.latent_dim), order='C')
 
 		# load and check gappy POD basis
 		if rom_domain.hyper_reduc:
-			hyper_reduc_basis = np.load(rom_domain.hyper_reduc_files[self.model_idx])
-			assert (hyper_reduc_basis.ndim == 3), \
-				"Hyper-reduction basis must have three axes"
-			assert (hyper_reduc_basis.shape[:2]
-					== (sol_domain.gas_model.num_eqs, solver.mesh.num_cells)), \
-				"Hyper reduction basis must have shape [num_eqs, num_cells, numHRModes]"
-
 			self.hyper_reduc_dim = rom_domain.hyper_reduc_dims[self.model_idx]
-			hyper_reduc_basis = hyper_reduc_basis[:, :, :self.hyper_reduc_dim]
-			self.hyper_reduc_basis = \
-				np.reshape(hyper_reduc_basis, (-1, self.hyper_reduc_dim), order="C")
+			self.hyper_reduc_basis, hyper_reduc_shape = \
+				load_basis(rom_domain.hyper_reduc_files[self.model_idx], self.hyper_reduc_dim,
+							cache_dir=rom_domain.basis_cache_dir)
+			assert (hyper_reduc_shape[:2] == self.sol_shape), \
+				"Hyper reduction basis must have shape [num_vars, num_cells, numHRModes]"
+
+		# window of codes and full-order samples for online basis adaptation
+		self.adaptive_rom = rom_domain.adaptive_rom
+		if self.adaptive_rom:
+			self.adapt_codes = deque(maxlen=rom_domain.adapt_window)
+			self.adapt_samps = deque(maxlen=rom_domain.adapt_window)
+
+		# least-squares solver of LSPG and SP-LSVT Newton iterations
+		self.lsq_solver = rom_domain.lsq_solver
+		self.freeze_jacob = rom_domain.freeze_jacob
+
+		self.time_varying_projector = False
+		self.calc_cached_operators(sol_domain)
+
+	def calc_cached_operators(self, sol_domain):
+		"""
+		Precompute time-invariant operators of linear basis,
+		i.e. scaled trial basis, inverse normalization profiles, and projector
+
+		Must be called again if the trial basis,
+		hyper-reduction basis, sampling indices, or decoded cells change
+		"""
 
+		self.calc_norm_fac_inv(sol_domain)
+
+		if self.target_cons:
+			norm_fac_prof = self.norm_fac_prof_cons
+		else:
+			norm_fac_prof = self.norm_fac_prof_prim
+		self.scaled_trial_basis = self.trial_basis * norm_fac_prof.ravel(order="C")[:, None]
+
+		if self.hyper_reduc:
 			# indices for sampling flattened hyper_reduc_basis
 			self.direct_hyper_reduc_samp_idxs = \
-				np.zeros(rom_domain.num_samp_cells * self.num_vars, dtype=np.int32)
-			for var_num in range(self.num_vars):
-				idx1 = var_num * rom_domain.num_samp_cells
-				idx2 = (var_num + 1) * rom_domain.num_samp_cells
-				self.direct_hyper_reduc_samp_idxs[idx1:idx2] = \
-					rom_domain.direct_samp_idxs + var_num * solver.mesh.num_cells
+				(sol_domain.direct_samp_idxs[None, :]
+				+ self.num_cells * np.arange(self.num_vars)[:, None]).ravel(order="C")
+
+			# [S^T * U]^+, maps sampled residual/RHS to hyper-reduction coefficients
+			self.hyper_reduc_pinv = \
+				np.linalg.pinv(self.hyper_reduc_basis[self.direct_hyper_reduc_samp_idxs, :])
+
+		# trial basis rows of sampled cells
+		self.samp_row_idxs = calc_samp_rows(sol_domain.direct_samp_idxs, self.num_vars, self.num_cells)
+
+		self.calc_projector(sol_domain)
+
+		if self.decode_cell_idxs is not None:
+			self.set_decode_cells(self.decode_cell_idxs)
+
+	def calc_projector(self, sol_domain):
+		"""
+		Compute RHS projection operator, V^T by default
+		"""
+
+		self.projector = self.trial_basis.T
+
+	def calc_scaled_jacob_basis(self, res_jacob):
+		"""
+		Compute product of scaled residual Jacobian and scaled trial basis
+
+		res_jacob is sparse, and is applied directly to the basis columns
+		so that the dense full-dimensional Jacobian is never formed
+		Only contains rows of sampled cells if using hyper-reduction
+		"""
+
+		jacob_basis = res_jacob @ self.scaled_trial_basis
+		jacob_basis *= self.norm_fac_inv_cons_samp.ravel(order="C")[:, None]
+
+		return jacob_basis
+
+	def calc_scaled_res(self, res, sol_domain):
+		"""
+		Scale residual at sampled cells and flatten
+		"""
+
+		res_scaled = res[:, sol_domain.direct_samp_idxs] * self.norm_fac_inv_cons_samp
+
+		return res_scaled.ravel(order="C")
+
+	def calc_d_code_least_squares(self, res_jacob, res, sol_domain):
+		"""
+		Compute change in low-dimensional state minimizing the scaled residual,
+		for LSPG and SP-LSVT Newton iterations
+
+		Solves the normal equations, or the triangular system of the economy QR of the test basis
+		If res_jacob is None, the test basis and its factorization from the previous subiteration are reused
+		"""
+
+		res_scaled = self.calc_scaled_res(res, sol_domain)
+
+		# minimize residual reconstructed from sampled cells
+		if self.hyper_reduc:
+			res_scaled = self.hyper_reduc_pinv @ res_scaled
+
+		# compute test basis and factorize
+		if res_jacob is not None:
+			test_basis = self.calc_scaled_jacob_basis(res_jacob)
+			if self.hyper_reduc:
+				test_basis = self.hyper_reduc_pinv @ test_basis
+			self.lsq_factors = factorize_lsq(test_basis, self.lsq_solver, cholesky=self.freeze_jacob)
+
+		# lhs and rhs of Newton iteration, and linear solve
+		return solve_lsq(self.lsq_factors, res_scaled, self.lsq_solver)
+
+	def reduce_res_rows(self, res_rows):
+		"""
+		Map scaled residual (or scaled residual Jacobian columns) of model variables at sampled cells
+		to rows of the low-dimensional system of coupled multi-model Newton iterations
+
+		Reconstructs the residual from sampled cells if using hyper-reduction
+		"""
+
+		if self.hyper_reduc:
+			return self.hyper_reduc_pinv @ res_rows
+		else:
+			return res_rows
 
 	def init_from_sol(self, sol_domain):
 		"""
@@ -66,31 +165,15 @@ class LinearProjROM(ProjectionROM):
 		loaded full-order initial conditions
 		"""
 
+		# fancy indexing returns a flattened copy, which is standardized in place
 		if self.target_cons:
-			sol = \
-				self.standardize_data(
-					sol_domain.sol_int.sol_cons[self.var_idxs, :],
-					normalize=True,
-					norm_fac_prof=self.norm_fac_prof_cons,
-					norm_sub_prof=self.norm_sub_prof_cons,
-					center=True, cent_prof=self.cent_prof_cons,
-					inverse=False
-				)
-			self.code = self.project_to_low_dim(self.trial_basis, sol, transpose=True)
-			sol_domain.sol_int.sol_cons[self.var_idxs, :] = self.decode_sol(self.code)
-
+			sol = sol_domain.sol_int.sol_cons[self.var_idxs, :].ravel(order="C")
 		else:
-			sol = \
-				self.standardize_data(
-					sol_domain.sol_int.sol_prim[self.var_idxs, :],
-					normalize=True,
-					norm_fac_prof=self.norm_fac_prof_prim,
-					norm_sub_prof=self.norm_sub_prof_prim,
-					center=True, cent_prof=self.cent_prof_prim,
-					inverse=False
-				)
-			self.code = self.project_to_low_dim(self.trial_basis, sol, transpose=True)
-			sol_domain.sol_int.sol_prim[self.var_idxs, :] = self.decode_sol(self.code)
+			sol = sol_domain.sol_int.sol_prim[self.var_idxs, :].ravel(order="C")
+		self.standardize_vec(sol, out=sol)
+		self.code = self.project_to_low_dim(self.trial_basis, sol, transpose=True)
+
+		self.update_sol(sol_domain)
 
 	def apply_decoder(self, code):
 		"""
@@ -100,3 +183,88 @@ class LinearProjROM(ProjectionROM):
 		sol = self.trial_basis @ code
 		sol = np.reshape(sol, (self.num_vars, -1), order="C")
 		return sol
+
+	def decode_sol(self, code_in):
+		"""
+		Compute full decoding of solution, i.e. a single matrix-vector product with the trial basis,
+		followed by in-place denormalization and decentering
+		"""
+
+		sol = self.trial_basis @ code_in
+		self.destandardize_vec(sol, out=sol)
+
+		return np.reshape(sol, self.sol_shape, order="C")
+
+	def set_decode_cells(self, cell_idxs):
+		"""
+		Set cells which are decoded every time step when decoding lazily,
+		and extract trial basis rows of these cells
+		"""
+
+		super().set_decode_cells(cell_idxs)
+
+		self.trial_basis_cells = \
+			np.reshape(self.trial_basis, (self.num_vars, self.num_cells, -1), order="C")[:, cell_idxs, :]
+		self.trial_basis_cells = np.reshape(self.trial_basis_cells, (-1, self.latent_dim), order="C")
+
+	def apply_decoder_cells(self, code):
+		"""
+		Compute raw decoding of code at cells set by set_decode_cells,
+		from trial basis rows of these cells only
+		"""
+
+		return np.reshape(self.trial_basis_cells @ code, (self.num_vars, -1), order="C")
+
+	def update_adapt_window(self, state_change):
+		"""
+		Append current code and full-order sample at sampled cells to adaptation window
+
+		state_change is the difference between the full-order and ROM states at sampled cells,
+		in [num_vars, num_samp_cells] order
+		"""
+
+		state_change_scaled = (state_change * self.norm_fac_inv_cons_samp).ravel(order="C")
+		self.adapt_codes.append(self.code.copy())
+		self.adapt_samps.append(self.trial_basis[self.samp_row_idxs, :] @ self.code + state_change_scaled)
+
+	def adapt_basis(self, rank, samp_budget):
+		"""
+		Update trial basis rows of sampled cells by low-rank update fit to adaptation window,
+		and update cached operators incrementally
+
+		The code is unchanged, so that the decoded state moves towards the full-order samples
+		"""
+
+		codes = np.stack(self.adapt_codes, axis=1)
+		samps = np.stack(self.adapt_samps, axis=1)
+		res = samps - self.trial_basis[self.samp_row_idxs, :] @ codes
+
+		res_rows = select_samp_cells(res, self.num_vars, samp_budget)
+		alpha, beta = calc_basis_update(codes, res[res_rows, :], rank)
+		self.update_trial_basis(self.samp_row_idxs[res_rows], alpha @ beta.T)
+
+	def update_trial_basis(self, basis_rows, d_basis):
+		"""
+		Add low-rank update to given trial basis rows, and update cached operators
+		"""
+
+		self.update_projector(basis_rows, d_basis)
+
+		self.trial_basis[basis_rows, :] += d_basis
+		if self.target_cons:
+			norm_fac_prof = self.norm_fac_prof_cons
+		else:
+			norm_fac_prof = self.norm_fac_prof_prim
+		self.scaled_trial_basis[basis_rows, :] += d_basis * norm_fac_prof.ravel(order="C")[basis_rows, None]
+
+		if self.decode_cell_idxs is not None:
+			self.set_decode_cells(self.decode_cell_idxs)
+
+	def update_projector(self, basis_rows, d_basis):
+		"""
+		Update RHS projection operator before low-rank trial basis update
+
+		V^T is a view of the trial basis, and is updated with it
+		"""
+
+		pass
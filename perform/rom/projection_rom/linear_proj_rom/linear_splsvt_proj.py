@@ -1,5 +1,3 @@
-import numpy as np
-
 from perform.rom.projection_rom.linear_proj_rom.linear_proj_rom import LinearProjROM
 
 
@@ -28,27 +26,4 @@ class LinearSPLSVTProj(LinearProjROM):
 		Newton iteration
 		"""
 
-		# TODO: add hyper-reduction
-
-		# TODO: scaled_trial_basis should be calculated once
-		scaled_trial_basis = \
-			self.trial_basis * self.norm_fac_prof_prim.ravel(order="C")[:, None]
-
-		# compute test basis
-		test_basis = (
-			(res_jacob.toarray()
-			/ self.norm_fac_prof_cons.ravel(order="C")[:, None])
-			@ scaled_trial_basis
-		)
-
-		# lhs and rhs of Newton iteration
-		lhs = test_basis.T @ test_basis
-		rhs = (
-			test_basis.T
-			@ (res / self.norm_fac_prof_cons).ravel(order="C")
-		)
-
-		# linear solve
-		dCode = np.linalg.solve(lhs, rhs)
-
-		return dCode, lhs, rhs
+		return self.calc_d_code_least_squares(res_jacob, res, sol_domain)
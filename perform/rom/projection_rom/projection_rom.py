@@ -1,7 +1,4 @@
-import numpy as np
-
 from perform.rom.rom_model import RomModel
-from perform.constants import REAL_TYPE
 
 
 class ProjectionROM(RomModel):
@@ -16,6 +13,21 @@ class ProjectionROM(RomModel):
 
 		super().__init__(modelIdx, rom_domain, solver, sol_domain)
 
+		# projectors of linear models are time-invariant, and computed once
+		self.time_varying_projector = True
+		self.calc_norm_fac_inv(sol_domain)
+
+	def calc_norm_fac_inv(self, sol_domain):
+		"""
+		Precompute inverse of conservative normalization profile
+		for scaling RHS and residual, full and at sampled cells
+
+		Must be recomputed if sampling indices change
+		"""
+
+		self.norm_fac_inv_cons = 1.0 / self.norm_fac_prof_cons
+		self.norm_fac_inv_cons_samp = self.norm_fac_inv_cons[:, sol_domain.direct_samp_idxs]
+
 	def project_to_low_dim(self, projector, full_dim_arr, transpose=False):
 		"""
 		Project given full-dimensional vector onto low-dimensional
@@ -29,9 +41,9 @@ class ProjectionROM(RomModel):
 		"""
 
 		if (full_dim_arr.ndim == 2):
-			full_dim_vec = full_dim_arr.flatten(order="C")
+			full_dim_vec = full_dim_arr.ravel(order="C")
 		elif (full_dim_arr.ndim == 1):
-			full_dim_vec = full_dim_arr.copy()
+			full_dim_vec = full_dim_arr
 		else:
 			raise ValueError("full_dim_arr must be one- or two-dimensional")
 
@@ -51,18 +63,14 @@ class ProjectionROM(RomModel):
 		"""
 
 		# scale RHS
-		norm_sub_prof = np.zeros(self.norm_fac_prof_cons.shape, dtype=REAL_TYPE)
-		rhs_scaled = \
-			self.standardize_data(
-				sol_domain.sol_int.rhs[self.var_idxs[:, None],
-				sol_domain.direct_samp_idxs[None, :]],
-				normalize=True,
-				norm_fac_prof=self.norm_fac_prof_cons[:, sol_domain.direct_samp_idxs],
-				norm_sub_prof=norm_sub_prof[:, sol_domain.direct_samp_idxs],
-				center=False, inverse=False
-			)
-
-		# calc projection operator and project
-		self.calc_projector(sol_domain)
+		rhs_scaled = (
+			sol_domain.sol_int.rhs[self.var_idxs[:, None],
+			sol_domain.direct_samp_idxs[None, :]]
+			* self.norm_fac_inv_cons_samp
+		)
+
+		# calc projection operator, if necessary, and project
+		if self.time_varying_projector:
+			self.calc_projector(sol_domain)
 		self.rhs_low_dim = self.project_to_low_dim(self.projector, rhs_scaled,
 													transpose=False)
@@ -0,0 +1,114 @@
+# Collection of functions for fitting and evaluating reduced operators
+# 	of a quadratic low-dimensional RHS model, dq/dt = c + A * q + H * (q x q)
+import numpy as np
+
+from perform.constants import REAL_TYPE
+
+
+def calc_quad_terms(codes):
+	"""
+	Unique quadratic terms q_i * q_j (i <= j) of codes in [latent_dim, ...] order
+	Returns array in [latent_dim * (latent_dim + 1) / 2, ...] order
+	"""
+
+	row_idxs, col_idxs = np.triu_indices(codes.shape[0])
+
+	return codes[row_idxs, ...] * codes[col_idxs, ...]
+
+
+def fit_reduced_ops(codes, targets, reg_lin=0.0, reg_quad=0.0, const=True, quad=True):
+	"""
+	Operator inference of constant, linear, and compact quadratic operators
+	by Tikhonov-regularized least squares
+
+	codes and targets (e.g. time derivatives or next codes) are in [latent_dim, num_snaps] order
+	reg_lin and reg_quad are the regularization weights of the linear and quadratic operators
+	Omitted constant or quadratic operators are returned as zeros
+	"""
+
+	latent_dim, num_snaps = codes.shape
+	num_quad = latent_dim * (latent_dim + 1) // 2
+
+	data_list = [codes]
+	reg_list = [np.full(latent_dim, reg_lin, dtype=REAL_TYPE)]
+	if const:
+		data_list.insert(0, np.ones((1, num_snaps), dtype=REAL_TYPE))
+		reg_list.insert(0, np.zeros(1, dtype=REAL_TYPE))
+	if quad:
+		data_list.append(calc_quad_terms(codes))
+		reg_list.append(np.full(num_quad, reg_quad, dtype=REAL_TYPE))
+	data_mat = np.concatenate(data_list, axis=0).T
+	reg_vals = np.concatenate(reg_list)
+
+	num_ops = data_mat.shape[1]
+	assert (num_snaps >= num_ops) or np.all(reg_vals[int(const):] > 0.0), \
+		("Operator inference requires at least " + str(num_ops)
+		+ " snapshots without regularization, got " + str(num_snaps))
+
+	# regularization is appended as additional rows of the least squares system
+	lhs = np.concatenate((data_mat, np.diag(np.sqrt(reg_vals))), axis=0)
+	rhs = np.concatenate((targets.T, np.zeros((num_ops, latent_dim), dtype=REAL_TYPE)), axis=0)
+
+	ops = np.linalg.lstsq(lhs, rhs, rcond=None)[0].T
+
+	const_op = np.zeros(latent_dim, dtype=REAL_TYPE)
+	quad_op = np.zeros((latent_dim, num_quad), dtype=REAL_TYPE)
+	if const:
+		const_op = ops[:, 0]
+	lin_op = ops[:, int(const):int(const) + latent_dim]
+	if quad:
+		quad_op = ops[:, int(const) + latent_dim:]
+
+	return const_op, lin_op, quad_op
+
+
+def load_reduced_ops(reduced_ops_file, op_type, latent_dim):
+	"""
+	Load and check reduced operators of given type (see utils/genReducedOperators.py)
+	Returns constant, linear, and expanded quadratic operators, and time step of discrete operators
+	"""
+
+	ops = np.load(reduced_ops_file)
+
+	assert (str(ops["op_type"]) == op_type), \
+		("Reduced operators at " + reduced_ops_file + " are of type " + str(ops["op_type"])
+		+ ", but this ROM method requires " + op_type)
+	assert (ops["lin_op"].shape == (latent_dim, latent_dim)), \
+		("Reduced operators at " + reduced_ops_file + " do not match latent_dim ("
+		+ str(ops["lin_op"].shape[0]) + " != " + str(latent_dim) + ")")
+
+	return ops["const_op"], ops["lin_op"], expand_quad_op(ops["quad_op"]), float(ops["dt"])
+
+
+def expand_quad_op(quad_op):
+	"""
+	Expand compact quadratic operator to symmetric tensor T in
+	[latent_dim, latent_dim, latent_dim] order, such that
+	quad_op @ calc_quad_terms(q) = (T @ q) @ q
+	"""
+
+	latent_dim = quad_op.shape[0]
+	row_idxs, col_idxs = np.triu_indices(latent_dim)
+	assert (quad_op.shape[1] == len(row_idxs)), \
+		"Quadratic operator must have latent_dim * (latent_dim + 1) / 2 columns"
+
+	quad_tens = np.zeros((latent_dim, latent_dim, latent_dim), dtype=REAL_TYPE)
+	quad_tens[:, row_idxs, col_idxs] += 0.5 * quad_op
+	quad_tens[:, col_idxs, row_idxs] += 0.5 * quad_op
+
+	return quad_tens
+
+
+def calc_reduced_rhs(code, const_op, lin_op, quad_tens, jacob=False):
+	"""
+	Evaluate quadratic low-dimensional RHS, and its Jacobian if requested,
+	at O(latent_dim^3) cost
+	"""
+
+	quad_code = quad_tens @ code
+	rhs = const_op + (lin_op + quad_code) @ code
+
+	if jacob:
+		return rhs, lin_op + 2.0 * quad_code
+	else:
+		return rhs, None
@@ -1,15 +1,26 @@
 import os
 from time import sleep
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
+import perform.constants as const
 from perform.constants import REAL_TYPE
 from perform.input_funcs import read_input_file, catch_list, catch_input
 from perform.time_integrator import get_time_integrator
 from perform.solution.solution_phys import SolutionPhys
 from perform.space_schemes import calc_rhs
-from perform.jacobians import calc_d_res_d_sol_prim
+from perform.jacobians import calc_d_res_d_sol_prim, calc_jacob_idxs
 from perform.rom import get_rom_model
+from perform.rom.least_squares_funcs import factorize_lsq, solve_lsq
+
+# state and mixture properties updated at decoded cells when decoding lazily
+DECODE_STATE_ATTRS = ["sol_prim", "sol_cons", "mass_fracs_full", "mw_mix",
+						"r_mix", "cp_mix", "gamma_mix", "enth_ref_mix"]
+
+# time integrator parameters which may be set in rom_params.inp, overriding those of the full-order solver
+ROM_TIME_PARAMS = ["time_scheme", "time_order", "dt", "subiter_max", "res_tol",
+					"dual_time", "dtau", "adapt_dtau", "cfl", "vnn"]
 
 # TODO: when moving to multi-domain, it may be useful to just
 # 	hold a sol_domain inside RomDomain for the associated full-dim solution
@@ -78,6 +89,9 @@ class RomDomain:
 			"All entries in model_var_idxs must be unique"
 		self.model_var_idxs = model_var_idxs
 
+		# offsets of each model in the concatenated low-dimensional state of all models
+		self.code_offsets = np.cumsum([0] + list(self.latent_dims))
+
 		# load and check model input locations
 		self.model_dir = str(rom_dict["model_dir"])
 		model_files = rom_dict["model_files"]
@@ -90,6 +104,9 @@ class RomDomain:
 				"Could not find model file at " + in_file
 			self.model_files[model_idx] = in_file
 
+		# directory of truncated and flattened linear bases, shared by runs with the same basis files
+		self.basis_cache_dir = os.path.expanduser(str(catch_input(rom_dict, "basis_cache_dir", "")))
+
 		# load standardization profiles, if they are required
 		self.cent_ic = catch_input(rom_dict, "cent_ic", False)
 		self.norm_sub_cons_in = catch_list(rom_dict, "norm_sub_cons_in", [""])
@@ -104,20 +121,141 @@ class RomDomain:
 
 		self.set_model_flags()
 
-		self.adaptive_rom = catch_input(rom_dict, "adaptive_rom", False)
+		# get time integrator, if necessary
+		# 	the ROM may select its own time integrator and time step, independent of the full-order solver
+		# 	ROM time steps span an integer number of full-order time steps,
+		# 	and outputs between ROM time steps are linearly interpolated
+		self.dt_ratio = 1
+		if self.has_time_integrator:
+			time_params = dict(solver.param_dict)
+			for key in ROM_TIME_PARAMS:
+				if key in rom_dict:
+					time_params[key] = rom_dict[key]
+			self.time_integrator = \
+				get_time_integrator(str(time_params["time_scheme"]), time_params)
+
+			self.dt_ratio = int(round(self.time_integrator.dt / solver.dt))
+			assert (self.dt_ratio >= 1) and np.isclose(self.dt_ratio * solver.dt, self.time_integrator.dt,
+														rtol=1e-8, atol=0.0), \
+				"ROM dt must be an integer multiple of the full-order dt"
+			if self.dt_ratio > 1:
+				assert (not solver.run_steady), "ROM dt must equal the full-order dt for steady solves"
+
+			# residual storage and Jacobian indices, if not allocated for the full-order time integrator
+			if self.time_integrator.time_type == "implicit":
+				sol_domain.sol_int.init_implicit(solver, self.time_integrator)
+		else:
+			self.time_integrator = None
 
 		# set up hyper-reduction, if necessary
 		self.hyper_reduc = catch_input(rom_dict, "hyper_reduc", False)
+		if self.hyper_reduc:
+			assert (self.rom_method[:6] == "linear"), \
+				"Hyper-reduction is only implemented for linear projection ROMs"
 		if self.is_intrusive and self.hyper_reduc:
 			self.load_hyper_reduc(sol_domain, solver)
 
-		# get time integrator, if necessary
-		# TODO: time_scheme should be specific to the RomDomain, not the solver
+		# decode only cells required by the RHS and probes, and full solution only for outputs
+		# 	always used by non-intrusive models, which do not require the RHS
+		self.lazy_decode = catch_input(rom_dict, "lazy_decode", False) or (not self.is_intrusive)
+		if self.lazy_decode and self.is_intrusive:
+			assert self.hyper_reduc, \
+				"Lazy decoding of intrusive ROMs requires hyper-reduction, please set hyper_reduc = True"
+
+		# set up reduced operators, if requested or required by non-intrusive models
+		self.reduced_ops = catch_input(rom_dict, "reduced_ops", False)
+		if self.reduced_ops or (not self.is_intrusive):
+			self.load_reduced_ops()
+		if self.has_time_integrator and (self.time_integrator.time_type == "exponential"):
+			assert ((self.rom_method == "linear_galerkin_proj") and self.reduced_ops), \
+				"Exponential integrators are only implemented for linear_galerkin_proj with reduced operators"
+
+		# least-squares solver of linear LSPG and SP-LSVT Newton iterations, "normal" equations or "qr"
+		# 	freeze_jacob evaluates the residual Jacobian once per time step,
+		# 	reusing its factorization in later subiterations (i.e. a chord/Gauss-Newton iteration)
+		self.lsq_solver = catch_input(rom_dict, "lsq_solver", "normal")
+		self.freeze_jacob = catch_input(rom_dict, "freeze_jacob", False)
+		assert (self.lsq_solver in ["normal", "qr"]), "Invalid lsq_solver input: " + str(self.lsq_solver)
+		if (self.lsq_solver != "normal") or self.freeze_jacob:
+			assert (self.rom_method in ["linear_lspg_proj", "linear_splsvt_proj"]) and (not self.reduced_ops), \
+				"lsq_solver and freeze_jacob are only implemented for linear_lspg_proj and linear_splsvt_proj"
+
+		# Newton iterations of linear LSPG and SP-LSVT may converge on the change in low-dimensional state,
+		# 	as the residual of the least-squares linear solve only measures roundoff, which depends on lsq_solver
+		# 	defaults to True for QR or frozen Jacobian solves, otherwise the least-squares residual is used
+		self.d_code_convergence = \
+			catch_input(rom_dict, "d_code_convergence", (self.lsq_solver == "qr") or self.freeze_jacob)
+		if self.d_code_convergence:
+			assert (self.rom_method in ["linear_lspg_proj", "linear_splsvt_proj"]) and (not self.reduced_ops), \
+				"d_code_convergence is only implemented for linear_lspg_proj and linear_splsvt_proj"
+
+		# multi-model implicit ROMs solve for the states of all models jointly,
+		# 	as variable groups are coupled through the residual Jacobian
+		self.coupled_solve = ((self.num_models > 1) and self.has_time_integrator and (not self.reduced_ops)
+							and (self.time_integrator.time_type == "implicit"))
+		if self.coupled_solve:
+			assert (self.rom_method in ["linear_galerkin_proj", "linear_lspg_proj", "linear_splsvt_proj"]), \
+				"Implicit multi-model ROMs are only implemented for linear projection ROMs"
+			# the residual Jacobian neglects the higher-order reconstruction, and block bases excite
+			# 	independent variations of variable groups for which this approximation is worst
+			if solver.space_order > 1:
+				print("WARNING: Newton iterations of implicit multi-model ROMs may stall for space_order > 1, "
+					+ "and run to subiter_max")
+
+		# per-model work (RHS projection, decoding) is run concurrently by model_threads threads,
+		# 	as models write to disjoint variables and NumPy releases the GIL
+		self.model_threads = catch_input(rom_dict, "model_threads", 1)
+		assert (self.model_threads > 0), "model_threads must be a positive integer"
+		if (self.model_threads > 1) and (self.num_models > 1):
+			self.model_pool = ThreadPoolExecutor(max_workers=min(self.model_threads, self.num_models))
+		else:
+			self.model_pool = None
+
+		# online trial basis adaptation from full-order samples at sampled cells
+		# 	adapt_samp_budget limits the number of cells used per update, zero uses all sampled cells
+		self.adaptive_rom = catch_input(rom_dict, "adaptive_rom", False)
+		if self.adaptive_rom:
+			assert (self.rom_method == "linear_galerkin_proj") and (self.time_integrator.time_type == "explicit"), \
+				"Basis adaptation is only implemented for linear_galerkin_proj with explicit time integrators"
+			assert (not self.reduced_ops), "Basis adaptation is not compatible with reduced operators"
+			self.adapt_interval = catch_input(rom_dict, "adapt_interval", 1)
+			self.adapt_window = catch_input(rom_dict, "adapt_window", max(self.latent_dims))
+			self.adapt_rank = catch_input(rom_dict, "adapt_rank", 1)
+			self.adapt_samp_budget = catch_input(rom_dict, "adapt_samp_budget", 0)
+			assert (self.adapt_interval > 0), "adapt_interval must be a positive integer"
+			assert (self.adapt_window > 0), "adapt_window must be a positive integer"
+			assert (self.adapt_rank > 0), "adapt_rank must be a positive integer"
+			assert (self.adapt_samp_budget >= 0), "adapt_samp_budget must be a non-negative integer"
+
+		# residual-based error estimate every err_est_interval iterations,
+		# 	and fallback to the FOM while the estimate exceeds err_est_tol
+		# 	fom_fallback_steps FOM iterations are run before re-projecting, zero never returns to the ROM
+		self.err_est_interval = catch_input(rom_dict, "err_est_interval", 0)
+		self.fom_fallback = catch_input(rom_dict, "fom_fallback", False)
+		self.fom_active = False
+		if self.fom_fallback:
+			assert (self.err_est_interval > 0), "FOM fallback requires err_est_interval > 0"
+			assert (self.dt_ratio == 1), "FOM fallback requires the ROM dt to equal the full-order dt"
+		if self.err_est_interval > 0:
+			assert (self.is_intrusive and (not self.reduced_ops)), \
+				"Error estimation requires the full-order RHS, and is only available for intrusive ROMs"
+			self.err_est_tol = catch_input(rom_dict, "err_est_tol", 0.05)
+			self.fom_fallback_steps = catch_input(rom_dict, "fom_fallback_steps", 0)
+			assert (self.err_est_tol > 0.0), "err_est_tol must be positive"
+			assert (self.fom_fallback_steps >= 0), "fom_fallback_steps must be a non-negative integer"
+
+			# iteration, physical time, error estimate, and FOM flag
+			self.err_est_hist = []
+
+		# non-intrusive models only require the current code
 		if self.has_time_integrator:
-			self.time_integrator = \
-				get_time_integrator(solver.time_scheme, solver.param_dict)
+			hist_len = self.time_integrator.time_order + 1
+			# full-order iterations after FOM fallback advance the same solution history
+			if self.fom_fallback:
+				hist_len = max(hist_len, sol_domain.time_integrator.time_order + 1)
 		else:
-			self.time_integrator = None 	# TODO: this might be pointless
+			assert (not solver.run_steady), "Non-intrusive ROMs cannot be run steady"
+			hist_len = 2
 
 		# initialize models for domain
 		self.model_list = [None] * self.num_models
@@ -134,17 +272,19 @@ class RomDomain:
 				model.init_from_sol(sol_domain)
 
 			# initialize code history
-			# TODO: this is necessary for non-time-integrated methods, e.g. TCN
-			model.code_hist = \
-				[model.code.copy()] * (self.time_integrator.time_order + 1)
+			model.code_hist = [model.code.copy()] * hist_len
 
 		sol_domain.sol_int.update_state(from_cons=self.target_cons)
 
+		if self.coupled_solve:
+			self.init_coupled_solve(sol_domain, solver)
+
 		# overwrite history with initialized solution
-		sol_domain.sol_int.sol_hist_cons = \
-			[sol_domain.sol_int.sol_cons.copy()] * (self.time_integrator.time_order + 1)
-		sol_domain.sol_int.sol_hist_prim = \
-			[sol_domain.sol_int.sol_prim.copy()] * (self.time_integrator.time_order + 1)
+		sol_domain.sol_int.sol_hist_cons = [sol_domain.sol_int.sol_cons.copy()] * hist_len
+		sol_domain.sol_int.sol_hist_prim = [sol_domain.sol_int.sol_prim.copy()] * hist_len
+
+		if self.lazy_decode:
+			self.init_lazy_decode(sol_domain, solver)
 
 	def set_model_flags(self):
 		"""
@@ -182,19 +322,26 @@ class RomDomain:
 			self.has_cons_norm = True
 			self.has_prim_norm = True
 			self.has_prim_cent = True
-		elif self.rom_method == "autoencoder_galerkin_proj_tfkeras":
+		elif self.rom_method in ["linear_dmd", "linear_quad_reg"]:
+			self.target_cons = True
+			self.has_cons_norm = True
+			self.has_cons_cent = True
+		elif self.rom_method in ["autoencoder_galerkin_proj_tfkeras", "autoencoder_galerkin_proj_onnx",
+								"autoencoder_galerkin_proj_torch"]:
 			self.has_time_integrator = True
 			self.is_intrusive = True
 			self.target_cons = True
 			self.has_cons_norm = True
 			self.has_cons_cent = True
-		elif self.rom_method == "autoencoder_lspg_proj_tfkeras":
+		elif self.rom_method in ["autoencoder_lspg_proj_tfkeras", "autoencoder_lspg_proj_onnx",
+								"autoencoder_lspg_proj_torch"]:
 			self.has_time_integrator = True
 			self.is_intrusive = True
 			self.target_cons = True
 			self.has_cons_norm = True
 			self.has_cons_cent = True
-		elif self.rom_method == "autoencoder_splsvt_proj_tfkeras":
+		elif self.rom_method in ["autoencoder_splsvt_proj_tfkeras", "autoencoder_splsvt_proj_onnx",
+								"autoencoder_splsvt_proj_torch"]:
 			self.has_time_integrator = True
 			self.is_intrusive = True
 			self.target_prim = True
@@ -249,10 +396,6 @@ class RomDomain:
 		determines cell indices for calculating fluxes and gradients
 		"""
 
-		raise ValueError("Hyper-reduction temporarily out of commission for development")
-
-		# TODO: add some explanations for what each index array accomplishes
-
 		# load and check sample points
 		samp_file = catch_input(self.rom_dict, "samp_file", "")
 		assert (samp_file != ""), \
@@ -262,90 +405,142 @@ class RomDomain:
 			("Could not find samp_file at " + samp_file)
 
 		# NOTE: assumed that sample indices are zero-indexed
-		sol_domain.direct_samp_idxs = np.load(samp_file).flatten()
-		sol_domain.direct_samp_idxs = \
-			(np.sort(sol_domain.direct_samp_idxs)).astype(np.int32)
-		sol_domain.num_samp_cells = len(sol_domain.direct_samp_idxs)
-		assert (sol_domain.num_samp_cells
-				<= solver.mesh.num_cells), \
+		direct_samp_idxs = np.load(samp_file).flatten()
+		self.rom_samp_idxs = direct_samp_idxs
+		self.set_samp_idxs(sol_domain, solver, direct_samp_idxs)
+
+		# paths to hyper-reduction files (unpacked later)
+		hyper_reduc_files = self.rom_dict["hyper_reduc_files"]
+		self.hyper_reduc_files = [None] * self.num_models
+		assert (len(hyper_reduc_files) == self.num_models), \
+			"Must provide hyper_reduc_files for each model"
+		for model_idx in range(self.num_models):
+			in_file = os.path.join(self.model_dir, hyper_reduc_files[model_idx])
+			assert (os.path.isfile(in_file)), \
+				"Could not find hyper-reduction file at " + in_file
+			self.hyper_reduc_files[model_idx] = in_file
+
+		# load hyper reduction dimensions and check validity
+		self.hyper_reduc_dims = \
+			catch_list(self.rom_dict, "hyper_reduc_dims",
+						[0], len_highest=self.num_models)
+		for i in self.hyper_reduc_dims:
+			assert (i > 0), "hyper_reduc_dims must contain positive integers"
+		if self.num_models == 1:
+			assert (len(self.hyper_reduc_dims) == 1), \
+				"Must provide only one value of hyper_reduc_dims when num_models = 1"
+			assert (self.hyper_reduc_dims[0] > 0), \
+				"hyper_reduc_dims must contain positive integers"
+		else:
+			if (len(self.hyper_reduc_dims) == self.num_models):
+				pass
+			elif (len(self.hyper_reduc_dims) == 1):
+				print("Only one value provided in hyper_reduc_dims,"
+						+ " applying to all models")
+				sleep(1.0)
+				self.hyper_reduc_dims = [self.hyper_reduc_dims[0]] * self.num_models
+			else:
+				raise ValueError("Must provide either num_models"
+								+ " or 1 entry in hyper_reduc_dims")
+
+	def load_reduced_ops(self):
+		"""
+		Check reduced operator files, which replace full-order RHS evaluations
+		of linear Galerkin ROMs with a quadratic low-dimensional model
+		"""
+
+		assert ((self.rom_method == "linear_galerkin_proj") or (not self.is_intrusive)), \
+			"Reduced operators are only implemented for linear Galerkin and non-intrusive ROMs"
+		assert (self.num_models == 1), \
+			"Reduced operators do not model coupling between models, please set num_models = 1"
+		assert (not self.hyper_reduc), \
+			"Reduced operators do not require hyper-reduction, please set hyper_reduc = False"
+
+		reduced_ops_files = catch_list(self.rom_dict, "reduced_ops_files", [""])
+		self.reduced_ops_files = [None] * self.num_models
+		assert (len(reduced_ops_files) == self.num_models), \
+			"Must provide reduced_ops_files for each model"
+		for model_idx in range(self.num_models):
+			in_file = os.path.join(self.model_dir, reduced_ops_files[model_idx])
+			assert (os.path.isfile(in_file)), \
+				"Could not find reduced operator file at " + in_file
+			self.reduced_ops_files[model_idx] = in_file
+
+	def set_samp_idxs(self, sol_domain, solver, direct_samp_idxs):
+		"""
+		Set sampled cells and compute index arrays restricting
+		RHS and Jacobian calculations to sampled cells
+
+		Models must recompute their cached operators if called after initialization,
+		and init_lazy_decode must be called again if decoding lazily
+		"""
+
+		num_cells = solver.mesh.num_cells
+
+		direct_samp_idxs = np.sort(direct_samp_idxs).astype(np.int32)
+		num_samp_cells = len(direct_samp_idxs)
+		assert (num_samp_cells <= num_cells), \
 			"Cannot supply more sampling points than cells in domain."
-		assert (np.amin(sol_domain.direct_samp_idxs)
-				>= 0), \
+		assert (np.amin(direct_samp_idxs) >= 0), \
 			"Sampling indices must be non-negative integers"
-		assert (np.amax(sol_domain.direct_samp_idxs)
-				< solver.mesh.num_cells), \
+		assert (np.amax(direct_samp_idxs) < num_cells), \
 			"Sampling indices must be less than the number of cells in the domain"
-		assert (len(np.unique(sol_domain.direct_samp_idxs))
-				== sol_domain.num_samp_cells), \
+		assert (len(np.unique(direct_samp_idxs)) == num_samp_cells), \
 			"Sampling indices must be unique"
 
-		# TODO: should probably shunt these over to a function
-		# 	for when indices get updated in adaptive method
+		sol_domain.direct_samp_idxs = direct_samp_idxs
+		sol_domain.num_samp_cells = num_samp_cells
 
 		# compute indices for inviscid flux calculations
-		# NOTE: have to account for fact that boundary cells are prepended/appended
+		# faces are indexed by their left cell in sol_prim_full,
+		# 	accounting for prepended/appended boundary cells
+		# 	i.e. the faces of sampled cell i are i and i + 1
 		sol_domain.flux_samp_left_idxs = \
-			np.zeros(2 * sol_domain.num_samp_cells, dtype=np.int32)
-		sol_domain.flux_samp_left_idxs[0::2] = sol_domain.direct_samp_idxs
-		sol_domain.flux_samp_left_idxs[1::2] = sol_domain.direct_samp_idxs + 1
-
-		sol_domain.flux_samp_right_idxs = \
-			np.zeros(2 * sol_domain.num_samp_cells, dtype=np.int32)
-		sol_domain.flux_samp_right_idxs[0::2] = sol_domain.direct_samp_idxs + 1
-		sol_domain.flux_samp_right_idxs[1::2] = sol_domain.direct_samp_idxs + 2
-
-		# eliminate repeated indices
-		sol_domain.flux_samp_left_idxs = np.unique(sol_domain.flux_samp_left_idxs)
-		sol_domain.flux_samp_right_idxs = np.unique(sol_domain.flux_samp_right_idxs)
+			np.unique(np.concatenate((direct_samp_idxs, direct_samp_idxs + 1)))
+		sol_domain.flux_samp_right_idxs = sol_domain.flux_samp_left_idxs + 1
 		sol_domain.num_flux_faces = len(sol_domain.flux_samp_left_idxs)
 
-		# Roe average
-		if solver.spaceScheme == "roe":
-			ones_prof = \
-				np.ones((sol_domain.gas_model.num_eqs, sol_domain.num_flux_faces),
-						dtype=const.REAL_TYPE)
-			sol_domain.sol_ave = solutionPhys(sol_domain.gas_model,
+		# to slice flux when calculating RHS, left face of each sampled cell
+		sol_domain.flux_rhs_idxs = \
+			np.searchsorted(sol_domain.flux_samp_left_idxs, direct_samp_idxs)
+
+		# face states and Roe average at sampled faces only
+		ones_prof = np.ones((sol_domain.gas_model.num_eqs, sol_domain.num_flux_faces),
+							dtype=REAL_TYPE)
+		if solver.space_scheme == "roe":
+			sol_domain.sol_ave = SolutionPhys(sol_domain.gas_model,
 												sol_domain.num_flux_faces,
-												solPrimIn=ones_prof)
-
-		# to slice flux when calculating RHS
-		sol_domain.flux_rhs_idxs = np.zeros(sol_domain.num_samp_cells, np.int32)
-		for i in range(1, sol_domain.num_samp_cells):
-			if (sol_domain.direct_samp_idxs[i]
-					== (sol_domain.direct_samp_idxs[i - 1] + 1)):
-				sol_domain.flux_rhs_idxs[i] = sol_domain.flux_rhs_idxs[i - 1] + 1
-			else:
-				sol_domain.flux_rhs_idxs[i] = sol_domain.flux_rhs_idxs[i - 1] + 2
+												sol_prim_in=ones_prof)
+		sol_domain.sol_left = SolutionPhys(sol_domain.gas_model,
+											sol_domain.num_flux_faces,
+											sol_prim_in=ones_prof)
+		sol_domain.sol_right = SolutionPhys(sol_domain.gas_model,
+											sol_domain.num_flux_faces,
+											sol_prim_in=ones_prof)
 
 		# compute indices for gradient calculations
 		# NOTE: also need to account for prepended/appended boundary cells
 		# TODO: generalize for higher-order schemes
 		if solver.space_order > 1:
 			if solver.space_order == 2:
+				# cells on either side of sampled faces
+				# exclude inlet and outlet ghost cells, which have no gradient
+				sol_domain.grad_idxs = \
+					np.unique(np.concatenate((direct_samp_idxs,
+												direct_samp_idxs + 1,
+												direct_samp_idxs + 2)))
 				sol_domain.grad_idxs = \
-					np.concatenate((sol_domain.direct_samp_idxs + 1,
-									sol_domain.direct_samp_idxs,
-									sol_domain.direct_samp_idxs + 2))
-				sol_domain.grad_idxs = np.unique(sol_domain.grad_idxs)
-				# exclude left neighbor of inlet, right neighbor of outlet
-				if sol_domain.grad_idxs[0] == 0:
-					sol_domain.grad_idxs = sol_domain.grad_idxs[1:]
-				if sol_domain.grad_idxs[-1] == (solver.mesh.num_cells + 1):
-					sol_domain.grad_idxs = sol_domain.grad_idxs[:-1]
+					sol_domain.grad_idxs[(sol_domain.grad_idxs > 0)
+										& (sol_domain.grad_idxs < (num_cells + 1))]
 				sol_domain.num_grad_cells = len(sol_domain.grad_idxs)
 
-				# neighbors of gradient cells
+				# neighbors of gradient cells, for gradient limiters
 				sol_domain.grad_neigh_idxs = \
-					np.concatenate((sol_domain.grad_idxs - 1, sol_domain.grad_idxs + 1))
-				sol_domain.grad_neigh_idxs = np.unique(sol_domain.grad_neigh_idxs)
-				# exclude left neighbor of inlet, right neighbor of outlet
-				if sol_domain.grad_neigh_idxs[0] == -1:
-					sol_domain.grad_neigh_idxs = sol_domain.grad_neigh_idxs[1:]
-				if (sol_domain.grad_neigh_idxs[-1] == (solver.mesh.num_cells + 2)):
-					sol_domain.grad_neigh_idxs = sol_domain.grad_neigh_idxs[:-1]
+					np.unique(np.concatenate((sol_domain.grad_idxs - 1,
+												sol_domain.grad_idxs + 1)))
 
 				# indices of grad_idxs in grad_neigh_idxs
-				_, _, sol_domain.grad_neighextract = \
+				_, _, sol_domain.grad_neigh_extract = \
 					np.intersect1d(sol_domain.grad_idxs,
 									sol_domain.grad_neigh_idxs,
 									return_indices=True)
@@ -364,71 +559,117 @@ class RomDomain:
 			else:
 				raise ValueError("Sampling for higher-order schemes not implemented yet")
 
+		# sampled cells with interior left and right neighbors, for Jacobian blocks
+		sol_domain.jacob_left_samp = np.nonzero(direct_samp_idxs > 0)[0]
+		sol_domain.jacob_right_samp = np.nonzero(direct_samp_idxs < (num_cells - 1))[0]
+		# indices are required by implicit ROMs, and by implicit full-order solvers after FOM fallback
+		rom_implicit = (self.time_integrator is not None) and (self.time_integrator.time_type == "implicit")
+		if rom_implicit or (sol_domain.time_integrator.time_type == "implicit"):
+			sol_int = sol_domain.sol_int
+			sol_int.jacob_row_idxs, sol_int.jacob_col_idxs = \
+				calc_jacob_idxs(sol_domain.gas_model.num_eqs, num_cells, direct_samp_idxs,
+								sol_domain.jacob_left_samp, sol_domain.jacob_right_samp)
+
 		# copy indices for ease of use
 		self.num_samp_cells = sol_domain.num_samp_cells
 		self.direct_samp_idxs = sol_domain.direct_samp_idxs
 
-		# paths to hyper-reduction files (unpacked later)
-		hyper_reduc_files = self.rom_dict["hyper_reduc_files"]
-		self.hyper_reduc_files = [None] * self.num_models
-		assert (len(hyper_reduc_files) == self.num_models), \
-			"Must provide hyper_reduc_files for each model"
-		for model_idx in range(self.num_models):
-			in_file = os.path.join(self.model_dir, hyper_reduc_files[model_idx])
-			assert (os.path.isfile(in_file)), \
-				"Could not find hyper-reduction file at " + in_file
-			self.hyper_reduc_files[model_idx] = in_file
-
-		# load hyper reduction dimensions and check validity
-		self.hyper_reduc_dims = \
-			catch_list(self.rom_dict, "hyper_reduc_dims",
-						[0], len_highest=self.num_models)
-		for i in self.hyper_reduc_dims:
-			assert (i > 0), "hyper_reduc_dims must contain positive integers"
-		if self.num_models == 1:
-			assert (len(self.hyper_reduc_dims) == 1), \
-				"Must provide only one value of hyper_reduc_dims when num_models = 1"
-			assert (self.hyper_reduc_dims[0] > 0), \
-				"hyper_reduc_dims must contain positive integers"
-		else:
-			if (len(self.hyper_reduc_dims) == self.num_models):
-				pass
-			elif (len(self.hyper_reduc_dims) == 1):
-				print("Only one value provided in hyper_reduc_dims,"
-						+ " applying to all models")
-				sleep(1.0)
-				self.hyper_reduc_dims = [self.hyper_reduc_dims[0]] * self.num_models
-			else:
-				raise ValueError("Must provide either num_models"
-								+ " or 1 entry in hyper_reduc_dims")
-
 	def advance_iter(self, sol_domain, solver):
 		"""
 		Advance low-dimensional state forward one time iteration
 		"""
 
-		print("Iteration " + str(solver.iter))
+		# full-order iteration after fallback
+		if self.fom_active:
+			self.advance_fom_iter(sol_domain, solver)
+			return
+
+		if solver.verbose:
+			print("Iteration " + str(solver.iter))
 
 		# update model which does NOT require numerical time integration
+		# full-order solution history is not used, and is not updated
 		if not self.has_time_integrator:
-			raise ValueError("Iteration advance for models without"
-							+ " numerical time integration not yet implemented")
+
+			for model in self.model_list:
+				model.code = model.advance_code()
+			self.update_code_hist()
+			self.decode_outputs(sol_domain, solver)
+
+			return
 
 		# if method requires numerical time integration
-		else:
+		# 	ROM time steps are taken every dt_ratio iterations, and interpolated in between
+		if self.dt_ratio == 1:
+			self.advance_rom_iter(sol_domain, solver)
+			return
+
+		step_idx = (solver.iter - 1) % self.dt_ratio
+		if step_idx == 0:
+			# RHS, Jacobian, and time integrator see the iteration count and time step of the ROM
+			fom_iter, fom_dt = solver.iter, solver.dt
+			solver.iter, solver.dt = (fom_iter - 1) // self.dt_ratio + 1, self.time_integrator.dt
+			try:
+				self.advance_rom_iter(sol_domain, solver)
+			finally:
+				solver.iter, solver.dt = fom_iter, fom_dt
+
+		self.decode_interp(sol_domain, solver, (step_idx + 1) / self.dt_ratio)
+
+	def advance_rom_iter(self, sol_domain, solver):
+		"""
+		Advance low-dimensional state forward one ROM time step
+		"""
 
-			for self.time_integrator.subiter in range(self.time_integrator.subiter_max):
+		for self.time_integrator.subiter in range(self.time_integrator.subiter_max):
 
-				self.advance_subiter(sol_domain, solver)
+			self.advance_subiter(sol_domain, solver)
 
-				if self.time_integrator.time_type == "implicit":
-					self.calc_code_res_norms(sol_domain, solver, self.time_integrator.subiter)
-					if sol_domain.sol_int.res_norm_l2 < self.time_integrator.res_tol:
-						break
+			if self.time_integrator.time_type == "implicit":
+				self.calc_code_res_norms(sol_domain, solver, self.time_integrator.subiter)
+				if sol_domain.sol_int.res_norm_l2 < self.time_integrator.res_tol:
+					break
+
+		err_est_iter = (self.err_est_interval > 0) and ((solver.iter % self.err_est_interval) == 0)
+		if self.adaptive_rom or err_est_iter:
+			samp_defect, samp_change = self.calc_samp_defect(sol_domain, solver)
+		if err_est_iter:
+			self.calc_err_est(solver, samp_defect, samp_change)
 
 		sol_domain.sol_int.update_sol_hist()
 		self.update_code_hist()
 
+		if self.adaptive_rom:
+			self.adapt_basis(sol_domain, solver, samp_defect)
+
+		# outputs between ROM time steps are decoded by decode_interp
+		if self.lazy_decode and (self.dt_ratio == 1):
+			self.decode_outputs(sol_domain, solver)
+
+		if self.fom_active:
+			self.switch_to_fom(sol_domain, solver)
+
+	def decode_interp(self, sol_domain, solver, weight):
+		"""
+		Decode linear interpolation of low-dimensional states between the last two ROM time steps,
+		for iterations of the full-order time step between ROM time steps
+
+		The low-dimensional state itself is not changed
+		"""
+
+		codes = [model.code for model in self.model_list]
+		if weight < 1.0:
+			for model in self.model_list:
+				model.code = model.code_hist[1] + weight * (model.code_hist[0] - model.code_hist[1])
+
+		self.decode_models(sol_domain)
+		self.update_state(sol_domain, from_cons=self.target_cons)
+		if self.lazy_decode:
+			self.decode_outputs(sol_domain, solver)
+
+		for model, code in zip(self.model_list, codes):
+			model.code = code
+
 	def advance_subiter(self, sol_domain, solver):
 		"""
 		Advance physical solution forward one subiteration of time integrator
@@ -437,42 +678,420 @@ class RomDomain:
 		sol_int = sol_domain.sol_int
 		res, res_jacob = None, None
 
-		if self.is_intrusive:
-			calc_rhs(sol_domain, solver)
+		# reduced operators do not require the full-order RHS
+		if self.is_intrusive and not self.reduced_ops:
+			calc_rhs(sol_domain, solver, self.time_integrator)
 
 		if self.time_integrator.time_type == "implicit":
 
 			# compute residual and residual Jacobian
-			if self.is_intrusive:
+			if self.is_intrusive and not self.reduced_ops:
 				res = self.time_integrator.calc_residual(sol_int.sol_hist_cons,
 														sol_int.rhs,
 														solver)
-				res_jacob = calc_d_res_d_sol_prim(sol_domain, solver)
+				if (not self.freeze_jacob) or (self.time_integrator.subiter == 0):
+					res_jacob = calc_d_res_d_sol_prim(sol_domain, solver, self.time_integrator)
+
+			# compute change in low-dimensional state, of all models jointly if coupled
+			if self.coupled_solve:
+				d_code, code_lhs, code_rhs = self.calc_d_code_coupled(res_jacob, res, sol_domain)
+				d_codes = np.split(d_code, self.code_offsets[1:-1])
+				code_reses = np.split(code_lhs @ d_code - code_rhs, self.code_offsets[1:-1])
 
-			# compute change in low-dimensional state
 			for model_idx, model in enumerate(self.model_list):
-				d_code, code_lhs, code_rhs = model.calc_d_code(res_jacob, res, sol_domain)
-				model.code += d_code
+				if self.coupled_solve:
+					model.code += d_codes[model_idx]
+					if self.d_code_convergence:
+						model.res = d_codes[model_idx]
+					else:
+						model.res = code_reses[model_idx]
+				else:
+					if self.reduced_ops:
+						d_code, code_lhs, code_rhs = model.calc_d_code_reduced(self.time_integrator, solver)
+					else:
+						d_code, code_lhs, code_rhs = model.calc_d_code(res_jacob, res, sol_domain)
+					model.code += d_code
+
+					# compute ROM residual for convergence measurement
+					if self.d_code_convergence:
+						model.res = d_code
+					else:
+						model.res = code_lhs @ d_code - code_rhs
+
 				model.code_hist[0] = model.code.copy()
-				model.update_sol(sol_domain)
 
-				# compute ROM residual for convergence measurement
-				model.res = code_lhs @ d_code - code_rhs
+			self.decode_models(sol_domain)
 
-			sol_int.update_state(from_cons=(not sol_domain.time_integrator.dual_time))
+			self.update_state(sol_domain, from_cons=(not self.time_integrator.dual_time))
 			sol_int.sol_hist_cons[0] = sol_int.sol_cons.copy()
 			sol_int.sol_hist_prim[0] = sol_int.sol_prim.copy()
 
+		elif self.time_integrator.time_type == "exponential":
+
+			for model in self.model_list:
+				model.code = model.code_hist[0] + model.calc_d_code_exp(self.time_integrator)
+
+			self.decode_models(sol_domain)
+			self.update_state(sol_domain, from_cons=True)
+
 		else:
 
+			# full-order RHS of every stage, for full-order sample
+			if self.adaptive_rom or (self.err_est_interval > 0):
+				if self.time_integrator.subiter == 0:
+					self.samp_rhs_stages = []
+				self.samp_rhs_stages.append(sol_int.rhs[:, sol_domain.direct_samp_idxs].copy())
+
+			# models are advanced jointly, as the time integrator holds a single stage history
+			self.map_models(lambda model: model.calc_rhs_low_dim(self, sol_domain))
+			d_code = self.time_integrator.solve_sol_change(
+				np.concatenate([model.rhs_low_dim for model in self.model_list]))
 			for model_idx, model in enumerate(self.model_list):
+				model.code = model.code_hist[0] + d_code[self.code_offsets[model_idx]:self.code_offsets[model_idx + 1]]
+
+			self.decode_models(sol_domain)
+
+			self.update_state(sol_domain, from_cons=True)
+
+	def map_models(self, func):
+		"""
+		Apply func to every model, concurrently if model_threads > 1
+		"""
+
+		if self.model_pool is None:
+			return [func(model) for model in self.model_list]
+		else:
+			return list(self.model_pool.map(func, self.model_list))
+
+	def decode_models(self, sol_domain):
+		"""
+		Decode states of all models, only at cells set by init_lazy_decode if decoding lazily
+		"""
+
+		if self.lazy_decode:
+			self.map_models(lambda model: model.update_sol_cells(sol_domain))
+		else:
+			self.map_models(lambda model: model.update_sol(sol_domain))
+
+	def init_coupled_solve(self, sol_domain, solver):
+		"""
+		Precompute operators of joint Newton iterations of all models
+
+		Models own the residual rows and Jacobian columns of their variables,
+		and the scaled trial bases of all models are scattered into a single block matrix
+		Must be called again if the trial bases or sampling indices change
+		"""
+
+		num_eqs = sol_domain.gas_model.num_eqs
+		num_cells = solver.mesh.num_cells
+		num_samp_cells = sol_domain.direct_samp_idxs.size
+
+		self.coupled_trial_basis = np.zeros((num_eqs * num_cells, self.code_offsets[-1]), dtype=REAL_TYPE)
+		self.coupled_res_scale = np.zeros(num_eqs * num_samp_cells, dtype=REAL_TYPE)
+		self.coupled_res_rows = [None] * self.num_models
+		for model_idx, model in enumerate(self.model_list):
+			basis_rows = (model.var_idxs[:, None] * num_cells + np.arange(num_cells)[None, :]).ravel(order="C")
+			res_rows = (model.var_idxs[:, None] * num_samp_cells + np.arange(num_samp_cells)[None, :]).ravel(order="C")
+
+			self.coupled_trial_basis[basis_rows, self.code_offsets[model_idx]:self.code_offsets[model_idx + 1]] = \
+				model.scaled_trial_basis
+			self.coupled_res_scale[res_rows] = model.norm_fac_inv_cons_samp.ravel(order="C")
+			self.coupled_res_rows[model_idx] = res_rows
+
+	def calc_d_code_coupled(self, res_jacob, res, sol_domain):
+		"""
+		Compute change in low-dimensional states of all models jointly for implicit scheme Newton iteration,
+		including the off-diagonal blocks which couple variable groups through the residual Jacobian
+
+		Galerkin solves the square projected system, LSPG and SP-LSVT the joint least-squares problem
+		If res_jacob is None, the factorization from the previous subiteration is reused
+		"""
+
+		res_scaled = res[:, sol_domain.direct_samp_idxs].ravel(order="C") * self.coupled_res_scale
+		res_low_dim = np.concatenate([model.reduce_res_rows(res_scaled[res_rows])
+									for model, res_rows in zip(self.model_list, self.coupled_res_rows)])
+
+		if res_jacob is not None:
+			jacob_basis = res_jacob @ self.coupled_trial_basis
+			jacob_basis *= self.coupled_res_scale[:, None]
+			test_basis = np.concatenate([model.reduce_res_rows(jacob_basis[res_rows, :])
+										for model, res_rows in zip(self.model_list, self.coupled_res_rows)], axis=0)
+
+			if self.rom_method == "linear_galerkin_proj":
+				self.coupled_lhs = test_basis
+			else:
+				self.coupled_lsq_factors = factorize_lsq(test_basis, self.lsq_solver, cholesky=self.freeze_jacob)
+
+		if self.rom_method == "linear_galerkin_proj":
+			d_code = np.linalg.solve(self.coupled_lhs, res_low_dim)
+			return d_code, self.coupled_lhs, res_low_dim
+		else:
+			return solve_lsq(self.coupled_lsq_factors, res_low_dim, self.lsq_solver)
+
+	def calc_samp_defect(self, sol_domain, solver):
+		"""
+		Compute difference between a full-order sample and the ROM solution at sampled cells,
+		and change of the ROM solution over the time step
+		Must be called before updating the solution history
+
+		Full-order samples are the Runge-Kutta step from the previous ROM solution
+		with the full-order RHS of the ROM stages for explicit schemes, and a Newton step
+		with the Jacobian approximated by its time derivative term for implicit schemes,
+		which requires an additional RHS evaluation
+		"""
+
+		sol_int = sol_domain.sol_int
+		samp_idxs = sol_domain.direct_samp_idxs
+		time_integrator = self.time_integrator
+
+		# implicit schemes overwrite the current entry of the solution history
+		sol_samp = sol_int.sol_cons[:, samp_idxs]
+		if time_integrator.time_type == "implicit":
+			samp_change = sol_samp - sol_int.sol_hist_cons[1][:, samp_idxs]
+			calc_rhs(sol_domain, solver, time_integrator)
+			res = time_integrator.calc_residual(sol_int.sol_hist_cons, sol_int.rhs, solver)
+			time_order = min(solver.iter, time_integrator.time_order)
+			samp_defect = (time_integrator.dt / time_integrator.coeffs[time_order - 1][0]) * res[:, samp_idxs]
+		else:
+			samp_change = sol_samp - sol_int.sol_hist_cons[0][:, samp_idxs]
+			rhs_step = sum([rk_b * rhs for rk_b, rhs in zip(time_integrator.rk_b_vals, self.samp_rhs_stages)])
+			samp_defect = time_integrator.dt * rhs_step - samp_change
+
+		return samp_defect, samp_change
+
+	def adapt_basis(self, sol_domain, solver, samp_defect):
+		"""
+		Collect full-order samples at sampled cells, and update trial bases every adapt_interval iterations
+		once the adaptation window is filled
+		"""
+
+		sol_int = sol_domain.sol_int
+
+		# one-step differences accumulate in the ROM solution between updates
+		if ((solver.iter - 1) % self.adapt_interval) == 0:
+			self.adapt_state_change = samp_defect
+		else:
+			self.adapt_state_change = self.adapt_state_change + samp_defect
+		for model in self.model_list:
+			model.update_adapt_window(self.adapt_state_change[model.var_idxs, :])
+
+		# wait for full window
+		if ((solver.iter % self.adapt_interval) != 0) or (solver.iter < self.adapt_window):
+			return
+
+		for model in self.model_list:
+			model.adapt_basis(self.adapt_rank, self.adapt_samp_budget)
+			if self.lazy_decode:
+				model.update_sol_cells(sol_domain)
+			else:
+				model.update_sol(sol_domain)
 
-				model.calc_rhs_low_dim(self, sol_domain)
-				d_code = self.time_integrator.solve_sol_change(model.rhs_low_dim)
-				model.code = model.code_hist[0] + d_code
+		self.update_state(sol_domain, from_cons=True)
+		sol_int.sol_hist_cons[0] = sol_int.sol_cons.copy()
+		sol_int.sol_hist_prim[0] = sol_int.sol_prim.copy()
+
+	def calc_err_est(self, solver, samp_defect, samp_change):
+		"""
+		Estimate ROM error as the norm of the difference between the full-order sample
+		and the ROM solution at sampled cells, relative to the change of the ROM solution
+		over the time step, both normalized by the conservative normalization profiles
+
+		Requests FOM fallback if the estimate exceeds err_est_tol
+		"""
+
+		defect_norm = 0.0
+		change_norm = 0.0
+		for model in self.model_list:
+			defect_norm += np.sum(np.square(samp_defect[model.var_idxs, :] * model.norm_fac_inv_cons_samp))
+			change_norm += np.sum(np.square(samp_change[model.var_idxs, :] * model.norm_fac_inv_cons_samp))
+		err_est = np.sqrt(defect_norm / max(change_norm, const.TINY_NUM))
+
+		self.err_est_hist.append([solver.iter, solver.sol_time + solver.dt, err_est, 0.0])
+		if solver.verbose:
+			print("ROM error estimate: %.8e" % err_est)
+
+		if self.fom_fallback and (err_est > self.err_est_tol):
+			self.fom_active = True
+
+	def switch_to_fom(self, sol_domain, solver):
+		"""
+		Switch to full-order iterations after the error estimate exceeds err_est_tol
+
+		The full-order solution history is decoded from the code history,
+		as unsampled cells are outdated when decoding lazily
+		"""
+
+		print("ROM error estimate exceeds err_est_tol at iteration " + str(solver.iter) + ", switching to FOM")
+
+		sol_int = sol_domain.sol_int
+
+		# FOM requires RHS and Jacobian at all cells
+		if self.hyper_reduc:
+			self.set_samp_idxs(sol_domain, solver, np.arange(solver.mesh.num_cells))
+
+		for hist_idx in reversed(range(len(sol_int.sol_hist_cons))):
+			for model in self.model_list:
+				model.code = model.code_hist[hist_idx].copy()
 				model.update_sol(sol_domain)
+			sol_int.update_state(from_cons=self.target_cons)
+			sol_int.sol_hist_cons[hist_idx] = sol_int.sol_cons.copy()
+			sol_int.sol_hist_prim[hist_idx] = sol_int.sol_prim.copy()
+
+		self.fom_iters = 0
+
+	def advance_fom_iter(self, sol_domain, solver):
+		"""
+		Advance full-order solution after FOM fallback,
+		and switch back to the ROM after fom_fallback_steps iterations
+		"""
+
+		sol_domain.advance_iter(solver)
+
+		self.fom_iters += 1
+		if (solver.iter % self.err_est_interval) == 0:
+			self.err_est_hist.append([solver.iter, solver.sol_time + solver.dt, np.nan, 1.0])
+
+		if self.fom_iters == self.fom_fallback_steps:
+			self.switch_to_rom(sol_domain, solver)
+
+	def switch_to_rom(self, sol_domain, solver):
+		"""
+		Switch back to ROM iterations by re-projecting the full-order solution history
+		"""
+
+		print("Switching back to ROM at iteration " + str(solver.iter))
+
+		sol_int = sol_domain.sol_int
 
-			sol_int.update_state(from_cons=True)
+		if self.hyper_reduc:
+			self.set_samp_idxs(sol_domain, solver, self.rom_samp_idxs)
+			for model in self.model_list:
+				model.calc_cached_operators(sol_domain)
+			if self.coupled_solve:
+				self.init_coupled_solve(sol_domain, solver)
+		if self.lazy_decode:
+			self.init_lazy_decode(sol_domain, solver)
+
+		for hist_idx in reversed(range(len(sol_int.sol_hist_cons))):
+			sol_int.sol_cons = sol_int.sol_hist_cons[hist_idx].copy()
+			sol_int.sol_prim = sol_int.sol_hist_prim[hist_idx].copy()
+			for model in self.model_list:
+				model.init_from_sol(sol_domain)
+				model.code_hist[hist_idx] = model.code.copy()
+			sol_int.update_state(from_cons=self.target_cons)
+			sol_int.sol_hist_cons[hist_idx] = sol_int.sol_cons.copy()
+			sol_int.sol_hist_prim[hist_idx] = sol_int.sol_prim.copy()
+
+		self.fom_active = False
+
+	def write_final_outputs(self, solver):
+		"""
+		Write error estimate history to disk, in [iteration, time, estimate, FOM flag] order
+		"""
+
+		if self.err_est_interval > 0:
+			err_est_file = os.path.join(solver.unsteady_output_dir, "errEst_" + solver.sim_type + ".npy")
+			np.save(err_est_file, np.array(self.err_est_hist, dtype=REAL_TYPE))
+
+	def init_lazy_decode(self, sol_domain, solver):
+		"""
+		Determine which cells are decoded every time step,
+		and which outputs require decoding the full solution
+
+		Intrusive models decode the cells in the stencils of sampled cells,
+		non-intrusive models only decode the cells measured by probes
+		"""
+
+		num_cells = solver.mesh.num_cells
+
+		# interior probe cells, and boundary-adjacent cells for boundary probes of non-intrusive models
+		# 	the boundary state of intrusive models is computed with the RHS
+		cell_idxs = []
+		self.decode_bounds = False
+		if sol_domain.num_probes > 0:
+			if not self.is_intrusive:
+				assert ("source" not in sol_domain.probe_vars), \
+					"Cannot probe source with non-intrusive ROMs, the source term is not computed"
+			probe_monitor = sol_domain.probe_monitor
+			for probe_sec, probe_idx in zip(probe_monitor.probe_secs, probe_monitor.probe_idxs):
+				if probe_sec == "interior":
+					cell_idxs.append(probe_idx)
+				elif not self.is_intrusive:
+					self.decode_bounds = True
+
+		# sampled cells and cells in flux and gradient stencils, given as indices into sol_prim_full
+		if self.is_intrusive:
+			full_idxs = [sol_domain.flux_samp_left_idxs, sol_domain.flux_samp_right_idxs]
+			if solver.space_order > 1:
+				full_idxs.append(sol_domain.grad_neigh_idxs)
+			stencil_idxs = np.concatenate(full_idxs) - 1
+			stencil_idxs = stencil_idxs[(stencil_idxs >= 0) & (stencil_idxs < num_cells)]
+			cell_idxs += list(stencil_idxs) + list(sol_domain.direct_samp_idxs)
+
+		if self.is_intrusive or self.decode_bounds:
+			cell_idxs += list(sol_domain.inlet_adj_idxs.ravel()) + list(sol_domain.outlet_adj_idxs.ravel())
+
+		self.decode_cell_idxs = np.unique(np.array(cell_idxs, dtype=np.int32))
+		self.num_decode_cells = len(self.decode_cell_idxs)
+		for model in self.model_list:
+			model.set_decode_cells(self.decode_cell_idxs)
+		self.sol_decode = SolutionPhys(sol_domain.gas_model, self.num_decode_cells,
+										sol_prim_in=sol_domain.sol_int.sol_prim[:, self.decode_cell_idxs])
+
+		# intervals of outputs requiring the full solution
+		self.full_decode_intervals = []
+		if solver.prim_out or solver.cons_out or solver.pod_out:
+			self.full_decode_intervals.append(solver.out_interval)
+		if solver.save_restarts:
+			self.full_decode_intervals.append(solver.restart_interval)
+		param_dict = solver.param_dict
+		if catch_input(param_dict, "vis_show", True) or catch_input(param_dict, "vis_save", False):
+			vis_idx = 1
+			while ("vis_type_" + str(vis_idx)) in param_dict:
+				if str(param_dict["vis_type_" + str(vis_idx)]) == "field":
+					self.full_decode_intervals.append(catch_input(param_dict, "vis_interval", 1))
+					break
+				vis_idx += 1
+
+	def update_state(self, sol_domain, from_cons=True):
+		"""
+		Update full-dimensional state after decoding,
+		only at decoded cells if decoding lazily
+		"""
+
+		sol_int = sol_domain.sol_int
+
+		if not self.lazy_decode:
+			sol_int.update_state(from_cons=from_cons)
+			return
+
+		sol_decode = self.sol_decode
+		if from_cons:
+			sol_decode.sol_cons[:, :] = sol_int.sol_cons[:, self.decode_cell_idxs]
+		else:
+			sol_decode.sol_prim[:, :] = sol_int.sol_prim[:, self.decode_cell_idxs]
+		sol_decode.update_state(from_cons=from_cons)
+
+		for attr in DECODE_STATE_ATTRS:
+			getattr(sol_int, attr)[..., self.decode_cell_idxs] = getattr(sol_decode, attr)
+
+	def decode_outputs(self, sol_domain, solver):
+		"""
+		Decode full solution if required by outputs at this time step
+		Otherwise, non-intrusive models decode the cells set by init_lazy_decode,
+		which intrusive models have already decoded during the time step
+		"""
+
+		if any([(solver.iter % interval) == 0 for interval in self.full_decode_intervals]):
+			self.map_models(lambda model: model.update_sol(sol_domain))
+			sol_domain.sol_int.update_state(from_cons=self.target_cons)
+
+		elif not self.is_intrusive:
+			self.map_models(lambda model: model.update_sol_cells(sol_domain))
+			self.update_state(sol_domain, from_cons=self.target_cons)
+
+		if self.decode_bounds:
+			sol_domain.calc_boundary_cells(solver)
 
 	def update_code_hist(self):
 		"""
@@ -517,7 +1136,16 @@ class RomDomain:
 		out_string = ((str(subiter + 1)
 						+ ":\tL2: %18.14f, \tL1: %18.14f")
 						% (norm_out_l2, norm_out_l1))
-		print(out_string)
+
+		# decoder time of this subiteration, only measured by non-linear models
+		decoder_time = sum([model.decoder_time for model in self.model_list])
+		if decoder_time > 0.0:
+			out_string += ", \tdecoder: %.6f s" % decoder_time
+		for model in self.model_list:
+			model.decoder_time = 0.0
+
+		if solver.verbose:
+			print(out_string)
 
 		sol_domain.sol_int.res_norm_l2 = norm_l2
 		sol_domain.sol_int.resNormL1 = norm_l1
@@ -35,6 +35,13 @@ class RomModel:
 		self.code = np.zeros(self.latent_dim, dtype=REAL_TYPE)
 		self.res = np.zeros(self.latent_dim, dtype=REAL_TYPE)
 
+		# cells decoded every time step when decoding lazily, see RomDomain.init_lazy_decode
+		self.decode_cell_idxs = None
+
+		# wall time of decoder and decoder Jacobian evaluations,
+		# 	reported and reset every implicit subiteration
+		self.decoder_time = 0.0
+
 		# Get normalization profiles, if necessary
 		self.norm_sub_prof_cons = None
 		self.norm_sub_prof_prim = None
@@ -86,6 +93,28 @@ class RomModel:
 						default="zeros"
 					)
 
+		self.calc_affine_standardization()
+
+	def calc_affine_standardization(self):
+		"""
+		Precompute standardization of target variables as flattened affine transforms in basis layout,
+		i.e. standardized = full * stand_scale + stand_offset and full = standardized * destand_scale + destand_offset
+		"""
+
+		if self.target_cons:
+			norm_fac_prof = self.norm_fac_prof_cons
+			norm_sub_prof = self.norm_sub_prof_cons
+			cent_prof = self.cent_prof_cons
+		else:
+			norm_fac_prof = self.norm_fac_prof_prim
+			norm_sub_prof = self.norm_sub_prof_prim
+			cent_prof = self.cent_prof_prim
+
+		self.destand_scale = np.ascontiguousarray(norm_fac_prof, dtype=REAL_TYPE).ravel(order="C")
+		self.destand_offset = (norm_sub_prof + cent_prof).astype(REAL_TYPE).ravel(order="C")
+		self.stand_scale = 1.0 / self.destand_scale
+		self.stand_offset = -self.destand_offset * self.stand_scale
+
 	def load_standardization(self, stand_input, default="zeros"):
 
 		try:
@@ -108,7 +137,7 @@ class RomModel:
 		elif default == "ones":
 			print("WARNING: standardization load failed or not specified,"
 					+ " defaulting to ones")
-			stand_prof = np.zeros(self.sol_shape, dtype=REAL_TYPE)
+			stand_prof = np.ones(self.sol_shape, dtype=REAL_TYPE)
 
 		return stand_prof
 
@@ -150,9 +179,9 @@ class RomModel:
 		"""
 
 		if decenter:
-			arr += cent_prof
+			arr = arr + cent_prof
 		else:
-			arr -= cent_prof
+			arr = arr - cent_prof
 		return arr
 
 	def normalize(self, arr, norm_fac_prof, norm_sub_prof, denormalize=False):
@@ -167,29 +196,42 @@ class RomModel:
 			arr = (arr - norm_sub_prof) / norm_fac_prof
 		return arr
 
-	def decode_sol(self, code_in):
+	def standardize_vec(self, vec, out=None):
 		"""
-		Compute full decoding of solution, including decentering and denormalization
+		Center and normalize flattened target variables in basis layout by precomputed affine transform
+
+		out may be vec itself for in-place standardization
 		"""
 
-		sol = self.apply_decoder(code_in)
+		out = np.multiply(vec, self.stand_scale, out=out)
+		out += self.stand_offset
+		return out
 
-		if self.target_cons:
-			sol = self.standardize_data(sol,
-										normalize=True,
-										norm_fac_prof=self.norm_fac_prof_cons,
-										norm_sub_prof=self.norm_sub_prof_cons,
-										center=True, cent_prof=self.cent_prof_cons,
-										inverse=True)
+	def destandardize_vec(self, vec, out=None, cells=False):
+		"""
+		Denormalize and decenter flattened target variables in basis layout by precomputed affine transform,
+		at all cells or at cells set by set_decode_cells
+
+		out may be vec itself for in-place destandardization
+		"""
+
+		if cells:
+			out = np.multiply(vec, self.destand_scale_cells, out=out)
+			out += self.destand_offset_cells
 		else:
-			sol = self.standardize_data(sol,
-										normalize=True,
-										norm_fac_prof=self.norm_fac_prof_prim,
-										norm_sub_prof=self.norm_sub_prof_prim,
-										center=True, cent_prof=self.cent_prof_prim,
-										inverse=True)
+			out = np.multiply(vec, self.destand_scale, out=out)
+			out += self.destand_offset
+		return out
+
+	def decode_sol(self, code_in):
+		"""
+		Compute full decoding of solution, including decentering and denormalization
+		"""
+
+		sol = np.ravel(self.apply_decoder(code_in), order="C")
+		sol = self.destandardize_vec(sol)
 
-		return sol
+		return np.reshape(sol, self.sol_shape, order="C")
 
 	def init_from_code(self, code0, sol_domain):
 		"""
@@ -215,6 +257,41 @@ class RomModel:
 		else:
 			sol_domain.sol_int.sol_prim[self.var_idxs, :] = self.decode_sol(self.code)
 
+	def set_decode_cells(self, cell_idxs):
+		"""
+		Set cells which are decoded every time step when decoding lazily,
+		and slice standardization profiles at these cells
+		"""
+
+		self.decode_cell_idxs = cell_idxs
+		self.destand_scale_cells = \
+			np.reshape(self.destand_scale, self.sol_shape, order="C")[:, cell_idxs].ravel(order="C")
+		self.destand_offset_cells = \
+			np.reshape(self.destand_offset, self.sol_shape, order="C")[:, cell_idxs].ravel(order="C")
+
+	def apply_decoder_cells(self, code):
+		"""
+		Compute raw decoding of code at cells set by set_decode_cells
+		Nonlinear decoders must still be evaluated in full
+		"""
+
+		return self.apply_decoder(code)[:, self.decode_cell_idxs]
+
+	def update_sol_cells(self, sol_domain):
+		"""
+		Update solution at cells set by set_decode_cells only, after code has been updated
+		"""
+
+		# raw decoding at cells is always a new array, and is destandardized in place
+		sol = self.apply_decoder_cells(self.code)
+		sol_vec = np.ravel(sol, order="C")
+		sol = np.reshape(self.destandardize_vec(sol_vec, out=sol_vec, cells=True), sol.shape, order="C")
+
+		if self.target_cons:
+			sol_domain.sol_int.sol_cons[self.var_idxs[:, None], self.decode_cell_idxs[None, :]] = sol
+		else:
+			sol_domain.sol_int.sol_prim[self.var_idxs[:, None], self.decode_cell_idxs[None, :]] = sol
+
 	def calc_code_norms(self):
 		"""
 		Compute L1 and L2 norms of low-dimensional state linear solve residuals
@@ -52,3 +52,51 @@ def get_io_shape(shape):
 			shape = shape[0]
 
 	return shape
+
+
+def compile_model(model, input_shape, dtype):
+	"""
+	Compile model evaluation for batches of inputs of shape input_shape
+	The explicit input signature ensures the graph is only traced once
+	"""
+
+	@tf.function(input_signature=[tf.TensorSpec(shape=[None] + list(input_shape), dtype=dtype)])
+	def model_func(inputs):
+		return model(inputs)
+
+	return model_func
+
+
+def compile_forward_jacobian(model, input_dim, dtype):
+	"""
+	Compile forward-mode Jacobian of model with respect to a vector input of size input_dim
+	All input_dim Jacobian-vector products are computed in one batched forward pass,
+	which is cheaper than reverse mode when input_dim is small relative to the output size
+	Returned Jacobian is in [input_dim, output shape] order
+	"""
+
+	@tf.function(input_signature=[tf.TensorSpec(shape=[input_dim], dtype=dtype)])
+	def jacob_func(inputs):
+		primals = tf.tile(inputs[None, :], [input_dim, 1])
+		tangents = tf.eye(input_dim, dtype=dtype)
+		with tf.autodiff.ForwardAccumulator(primals, tangents) as acc:
+			outputs = model(primals)
+		return acc.jvp(outputs)
+
+	return jacob_func
+
+
+def compile_reverse_jacobian(model, input_shape, dtype):
+	"""
+	Compile reverse-mode Jacobian of model with respect to a single input of shape input_shape
+	Returned Jacobian is in [1, output shape, 1, input shape] order
+	"""
+
+	@tf.function(input_signature=[tf.TensorSpec(shape=[1] + list(input_shape), dtype=dtype)])
+	def jacob_func(inputs):
+		with tf.GradientTape() as g:
+			g.watch(inputs)
+			outputs = model(inputs)
+		return g.jacobian(outputs, inputs)
+
+	return jacob_func
@@ -0,0 +1,29 @@
+# Collection of generic functions that
+# 	any PyTorch model-based method can use
+import torch
+
+
+def init_device(run_gpu, num_threads):
+	"""
+	Get device for PyTorch models, and set number of CPU threads
+	"""
+
+	torch.set_num_threads(num_threads)
+
+	if run_gpu:
+		assert (torch.cuda.is_available()), "run_gpu = True, but no CUDA device is available"
+		return torch.device("cuda")
+	else:
+		return torch.device("cpu")
+
+
+def load_model_obj(model_path, device):
+	"""
+	Load PyTorch model from file specified by model_path,
+	saved as a complete torch.nn.Module with torch.save(model, model_path)
+	"""
+
+	model_obj = torch.load(model_path, map_location=device, weights_only=False)
+	model_obj.eval()
+
+	return model_obj
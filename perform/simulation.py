@@ -0,0 +1,149 @@
+import warnings
+
+import numpy as np
+
+from perform.constants import REAL_TYPE
+from perform.input_funcs import format_input_dict
+from perform.system_solver import SystemSolver
+from perform.solution.solution_domain import SolutionDomain
+from perform.solution.solution_phys import SolutionPhys
+
+
+class Simulation:
+	"""
+	In-memory full-order simulation, constructed from Python dictionaries and arrays
+
+	Setup (mesh, gas model, solution storage, Jacobian index arrays) is performed once,
+	and the solution may be reset to new initial conditions without repeating it,
+	for optimization or uncertainty quantification loops calling the solver many times
+
+	No output files, plots, probes, or restart files are written,
+	and iteration output is not printed unless verbose = True in param_dict
+	num_steps in param_dict sets the maximum number of time steps between resets
+	"""
+
+	def __init__(self, param_dict, gas_dict, mesh_dict, sol_prim_init):
+
+		param_dict = format_input_dict(param_dict)
+		gas_dict = format_input_dict(gas_dict)
+		mesh_dict = format_input_dict(mesh_dict)
+
+		# outputs are retrieved with get_state() rather than written to disk
+		for key in ["prim_out", "cons_out", "source_out", "rhs_out", "pod_out",
+					"save_restarts", "init_from_restart", "calc_rom"]:
+			param_dict[key] = False
+		param_dict.pop("probe_locs", None)
+		if "verbose" not in param_dict:
+			param_dict["verbose"] = False
+
+		self.solver = SystemSolver(None, param_dict=param_dict, mesh_dict=mesh_dict)
+		self.sol_domain = SolutionDomain(self.solver, gas_dict=gas_dict,
+										sol_prim_init=np.asarray(sol_prim_init, dtype=REAL_TYPE))
+		self.sol_time_init = self.solver.sol_time
+		self.num_steps_taken = 0
+
+		# initial state of all solution arrays, restored by reset()
+		# includes ghost cell and face states, as these seed some iterative calculations
+		self.sol_list = [sol for sol in vars(self.sol_domain).values()
+						if isinstance(sol, SolutionPhys)]
+		self.sol_states = [get_array_state(sol) for sol in self.sol_list]
+
+	def reset(self, sol_prim_init=None, sol_time=None):
+		"""
+		Reset solution to initial condition given at construction, or to sol_prim_init
+		"""
+
+		solver = self.solver
+		sol_int = self.sol_domain.sol_int
+
+		for sol, sol_state in zip(self.sol_list, self.sol_states):
+			for key, val in sol_state.items():
+				setattr(sol, key, val.copy())
+
+		if sol_prim_init is not None:
+			sol_prim_init = np.asarray(sol_prim_init, dtype=REAL_TYPE)
+			if (solver.num_members > 1) and (sol_prim_init.shape[1] == solver.mesh.num_cells):
+				sol_prim_init = np.tile(sol_prim_init, (1, solver.num_members))
+			assert (sol_prim_init.shape == sol_int.sol_prim.shape), \
+				("Incorrect sol_prim_init shape: " + str(sol_prim_init.shape)
+				+ " != " + str(sol_int.sol_prim.shape))
+
+			sol_int.sol_prim = sol_prim_init.copy()
+			if solver.vel_add != 0.0:
+				sol_int.sol_prim[1, :] += solver.vel_add
+			sol_int.update_state(from_cons=False)
+
+		sol_int.reset_sol_hist(self.sol_domain.time_integrator)
+
+		if sol_time is None:
+			solver.sol_time = self.sol_time_init
+		else:
+			solver.sol_time = sol_time
+		solver.iter = 1
+		solver.time_iter = 1
+		solver.solve_failed = False
+		self.num_steps_taken = 0
+
+	def step(self):
+		"""
+		Advance solution one physical time step
+		"""
+
+		self.run(1)
+
+	def run(self, num_steps):
+		"""
+		Advance solution num_steps physical time steps
+
+		Numerical warnings are raised as errors, as in the command line solver,
+		and mark the simulation as failed. Steady runs stop early once converged
+		"""
+
+		solver = self.solver
+		sol_domain = self.sol_domain
+
+		if (self.num_steps_taken + num_steps) > solver.num_steps:
+			raise ValueError("Cannot advance " + str(num_steps) + " steps after "
+							+ str(self.num_steps_taken) + " steps, num_steps = "
+							+ str(solver.num_steps) + ". Call reset() or increase num_steps")
+
+		with warnings.catch_warnings():
+			warnings.filterwarnings("error")
+			try:
+				for step_idx in range(num_steps):
+					solver.iter = self.num_steps_taken + 1
+					sol_domain.advance_iter(solver)
+					solver.time_iter += 1
+					solver.sol_time += solver.dt
+					self.num_steps_taken += 1
+
+					if solver.run_steady and (sol_domain.sol_int.d_sol_norm_l2 < solver.steady_tol):
+						break
+
+			except RuntimeWarning:
+				solver.solve_failed = True
+				raise
+
+	def get_state(self):
+		"""
+		Return copy of current interior solution and physical time
+		"""
+
+		sol_int = self.sol_domain.sol_int
+		state = {
+			"sol_prim": sol_int.sol_prim.copy(),
+			"sol_cons": sol_int.sol_cons.copy(),
+			"sol_time": self.solver.sol_time,
+			"num_steps": self.num_steps_taken,
+			"failed": self.solver.solve_failed,
+		}
+
+		return state
+
+
+def get_array_state(sol):
+	"""
+	Copy all NumPy array attributes of solution object
+	"""
+
+	return {key: val.copy() for key, val in vars(sol).items() if isinstance(val, np.ndarray)}
@@ -0,0 +1,252 @@
+import os
+
+import numpy as np
+from numpy.lib.format import write_array_header_1_0, dtype_to_descr
+
+from perform.constants import REAL_TYPE, PROBE_BLOCK_SIZE_DEFAULT
+from perform.input_funcs import catch_input
+
+
+class ProbeMonitor:
+	"""
+	Container class for probe measurements
+
+	Probe variables are compiled once into index arrays into the
+	primitive, conservative, and source arrays of each solution section,
+	so that each update is a single vectorized gather per source array
+
+	Measurements are held in a fixed-size block which is appended
+	to disk when full, so memory does not scale with the number of time steps
+
+	For ensemble runs, each probe is measured separately for every member
+	"""
+
+	def __init__(self, sol_domain, solver, probe_locs, probe_vars):
+
+		self.probe_locs = probe_locs
+		self.probe_vars = probe_vars
+		self.num_probes = len(probe_locs)
+		self.num_probe_vars = len(probe_vars)
+		self.num_members = solver.num_members
+		self.num_probes_total = self.num_probes * self.num_members
+
+		gas = sol_domain.gas_model
+		mesh = solver.mesh
+
+		# get probe locations
+		self.probe_idxs = [None] * self.num_probes
+		self.probe_secs = [None] * self.num_probes
+		for idx, probe_loc in enumerate(self.probe_locs):
+			if probe_loc > mesh.x_right:
+				self.probe_secs[idx] = "outlet"
+				self.probe_idxs[idx] = 0
+			elif probe_loc < mesh.x_left:
+				self.probe_secs[idx] = "inlet"
+				self.probe_idxs[idx] = 0
+			else:
+				self.probe_secs[idx] = "interior"
+				self.probe_idxs[idx] = np.abs(mesh.x_cell - probe_loc).argmin()
+
+		assert (not ((("outlet" in self.probe_secs) or ("inlet" in self.probe_secs))
+					and (("source" in self.probe_vars) or ("rhs" in self.probe_vars)))), \
+					"Cannot probe source or rhs in inlet/outlet"
+
+		# compile probe variables into (field, row) pairs
+		var_fields = [None] * self.num_probe_vars
+		var_rows = np.zeros(self.num_probe_vars, dtype=np.int32)
+		for var_idx, var_str in enumerate(self.probe_vars):
+			var_fields[var_idx], var_rows[var_idx] = self.parse_probe_var(var_str, gas)
+
+		# group gather indices by (section, field) source array
+		# each entry holds flat indices into the source array
+		# 	and flat destination indices into [num_members * num_probes, num_probe_vars]
+		gather_dict = {}
+		for member_idx in range(self.num_members):
+			for probe_idx in range(self.num_probes):
+				probe_sec = self.probe_secs[probe_idx]
+				if probe_sec == "inlet":
+					sol = sol_domain.sol_inlet
+					cell_idx = member_idx
+				elif probe_sec == "outlet":
+					sol = sol_domain.sol_outlet
+					cell_idx = member_idx
+				else:
+					sol = sol_domain.sol_int
+					cell_idx = member_idx * mesh.num_cells + self.probe_idxs[probe_idx]
+
+				probe_num = member_idx * self.num_probes + probe_idx
+				for var_idx in range(self.num_probe_vars):
+					field = var_fields[var_idx]
+					key = (probe_sec, field)
+					if key not in gather_dict:
+						gather_dict[key] = (sol, [], [])
+					src_idxs = gather_dict[key][1]
+					dest_idxs = gather_dict[key][2]
+
+					src_idxs.append(var_rows[var_idx] * sol.num_cells + cell_idx)
+					dest_idxs.append(probe_num * self.num_probe_vars + var_idx)
+
+		# NOTE: attribute names are stored rather than array references,
+		# 	as some solution arrays are reassigned during time integration
+		self.gather_list = []
+		for (probe_sec, field), (sol, src_idxs, dest_idxs) in gather_dict.items():
+			self.gather_list.append((sol, field,
+									np.array(src_idxs, dtype=np.int64),
+									np.array(dest_idxs, dtype=np.int64)))
+
+		self.probe_iter = np.zeros((self.num_probes_total, self.num_probe_vars), dtype=REAL_TYPE)
+
+		# block storage, time in first column
+		self.block_size = catch_input(solver.param_dict, "probe_block_size",
+										PROBE_BLOCK_SIZE_DEFAULT)
+		assert (self.block_size > 0), "probe_block_size must be a positive integer"
+		self.block_size = min(self.block_size, max(solver.num_steps, 1))
+		self.probe_block = np.zeros((self.num_probes_total, self.block_size,
+									self.num_probe_vars + 1), dtype=REAL_TYPE)
+		self.block_idx = 0
+		self.num_written = 0
+
+		# open probe files, which are valid .npy files after every flush
+		# stored in Fortran order so that each time step is appended contiguously
+		probe_file_base_name = "probe"
+		for vis_var in self.probe_vars:
+			probe_file_base_name += "_" + vis_var
+		self.probe_file_base_name = os.path.join(solver.probe_output_dir, probe_file_base_name)
+		self.sim_type = solver.sim_type
+
+		self.probe_files = [None] * self.num_probes_total
+		self.probe_fids = [None] * self.num_probes_total
+		self.data_offset = None
+		for probe_num in range(self.num_probes_total):
+			self.probe_files[probe_num] = self.get_probe_file_name(probe_num, self.sim_type)
+			fid = open(self.probe_files[probe_num], "w+b")
+			self.write_header(fid)
+			self.probe_fids[probe_num] = fid
+
+	@staticmethod
+	def parse_probe_var(var_str, gas):
+		"""
+		Map probe variable string to solution field and row index
+		"""
+
+		if var_str == "pressure":
+			return "sol_prim", 0
+		elif var_str == "velocity":
+			return "sol_prim", 1
+		elif var_str == "temperature":
+			return "sol_prim", 2
+		elif var_str == "source":
+			return "source", 0
+		elif var_str == "density":
+			return "sol_cons", 0
+		elif var_str == "momentum":
+			return "sol_cons", 1
+		elif var_str == "energy":
+			return "sol_cons", 2
+		elif var_str == "species":
+			return "sol_prim", 3
+
+		try:
+			if var_str[:15] == "density-species":
+				field, spec_idx = "sol_cons", int(var_str[15:])
+			elif var_str[:7] == "species":
+				field, spec_idx = "sol_prim", int(var_str[7:])
+			else:
+				raise ValueError
+			assert ((spec_idx > 0) and (spec_idx <= gas.num_species))
+		except (ValueError, AssertionError):
+			raise ValueError("Invalid probe variable " + str(var_str))
+
+		return field, 3 + spec_idx - 1
+
+	def get_probe_file_name(self, probe_num, sim_type):
+
+		member_idx, probe_idx = divmod(probe_num, self.num_probes)
+		probe_file_name = self.probe_file_base_name + "_" + str(probe_idx + 1) + "_" + sim_type
+		if self.num_members > 1:
+			probe_file_name += "_member" + str(member_idx + 1)
+
+		return probe_file_name + ".npy"
+
+	def write_header(self, fid):
+		"""
+		(Re)write .npy header for current number of written time steps
+		"""
+
+		fid.seek(0)
+		header = {
+			"descr": dtype_to_descr(np.dtype(REAL_TYPE)),
+			"fortran_order": True,
+			"shape": (self.num_probe_vars + 1, self.num_written),
+		}
+		write_array_header_1_0(fid, header)
+
+		if self.data_offset is None:
+			self.data_offset = fid.tell()
+		elif fid.tell() != self.data_offset:
+			raise ValueError("Probe file header length changed, cannot append probe data")
+
+	def update_probes(self, solver):
+		"""
+		Gather probe measurements and store in block, flushing if full
+		"""
+
+		probe_iter_flat = self.probe_iter.ravel()
+		for sol, field, src_idxs, dest_idxs in self.gather_list:
+			probe_iter_flat[dest_idxs] = np.take(getattr(sol, field), src_idxs)
+
+		self.probe_block[:, self.block_idx, 0] = solver.sol_time
+		self.probe_block[:, self.block_idx, 1:] = self.probe_iter
+		self.block_idx += 1
+
+		if self.block_idx == self.block_size:
+			self.flush()
+
+	def flush(self):
+		"""
+		Append stored block to probe files
+		"""
+
+		if self.block_idx == 0:
+			return
+
+		self.num_written += self.block_idx
+		for probe_num, fid in enumerate(self.probe_fids):
+			fid.seek(0, os.SEEK_END)
+			self.probe_block[probe_num, :self.block_idx, :].tofile(fid)
+			self.write_header(fid)
+			fid.flush()
+
+		self.block_idx = 0
+
+	def get_probe_history(self, probe_num, member_idx=0):
+		"""
+		Retrieve full time history of single probe, including unflushed data
+		Returns array in [num_probe_vars + 1, num_steps] order, time in first row
+		"""
+
+		probe_num += member_idx * self.num_probes
+
+		if self.num_written > 0:
+			probe_written = np.load(self.probe_files[probe_num], mmap_mode="r")
+		else:
+			probe_written = np.zeros((self.num_probe_vars + 1, 0), dtype=REAL_TYPE)
+
+		return np.concatenate((probe_written,
+								self.probe_block[probe_num, :self.block_idx, :].T), axis=1)
+
+	def write_probes(self, solver):
+		"""
+		Flush remaining probe data and close probe files
+		"""
+
+		self.flush()
+
+		for probe_num, fid in enumerate(self.probe_fids):
+			fid.close()
+
+			# account for failed simulations
+			if solver.sim_type != self.sim_type:
+				probe_file = self.get_probe_file_name(probe_num, solver.sim_type)
+				os.replace(self.probe_files[probe_num], probe_file)
+				self.probe_files[probe_num] = probe_file
@@ -1,4 +1,4 @@
-from math import sin, pi
+from math import pi
 
 import numpy as np
 
@@ -15,12 +15,23 @@ class SolutionBoundary(SolutionPhys):
 	def __init__(self, gas, solver, bound_type):
 
 		param_dict = solver.param_dict
+		self.bound_type = bound_type
 
 		# this generally stores fixed/stagnation properties
 		self.press, self.vel, self.temp, \
 			self.mass_fracs, self.rho, self.pert_type, \
 			self.pert_perc, self.pert_freq = parse_bc(bound_type, param_dict)
 
+		# per-member values for ensemble runs, one ghost cell per member
+		for var_name in ["press", "vel", "temp", "rho", "pert_perc", "pert_freq"]:
+			ensemble_var = var_name + "_" + bound_type
+			if ensemble_var in solver.ensemble_vals:
+				vals = solver.ensemble_vals[ensemble_var]
+				if var_name == "pert_freq":
+					# [num_freqs, num_members], so each frequency applies to all members
+					vals = vals.reshape((solver.num_members, -1)).T
+				setattr(self, var_name, vals)
+
 		assert (len(self.mass_fracs) == gas.num_species_full), \
 			"Must provide mass fraction state for all species at boundary"
 		assert (np.sum(self.mass_fracs) == 1.0), \
@@ -35,28 +46,43 @@ class SolutionBoundary(SolutionPhys):
 
 		# this will be updated at each iteration, just initializing now
 		# TODO: number of ghost cells should not always be one
-		sol_dummy = np.zeros((gas.num_eqs, 1), dtype=REAL_TYPE)
-		sol_dummy[0, 0] = 1e6
-		sol_dummy[1, 0] = 1.0
-		sol_dummy[2, 0] = 300.0
-		sol_dummy[3, 0] = 1.0
-		super().__init__(gas, 1, sol_prim_in=sol_dummy)
-		self.sol_prim[3:, 0] = self.mass_fracs[gas.mass_frac_slice]
+		sol_dummy = np.zeros((gas.num_eqs, solver.num_members), dtype=REAL_TYPE)
+		sol_dummy[0, :] = 1e6
+		sol_dummy[1, :] = 1.0
+		sol_dummy[2, :] = 300.0
+		sol_dummy[3, :] = 1.0
+		super().__init__(gas, solver.num_members, sol_prim_in=sol_dummy)
+		self.sol_prim[3:, :] = self.mass_fracs[gas.mass_frac_slice, None]
 
 	def calc_pert(self, t):
 		"""
 		Compute sinusoidal perturbation factor
+		Returns array of per-member factors for ensemble runs
 		"""
 
 		# TODO: add phase offset
 
 		pert = 0.0
 		for f in self.pert_freq:
-			pert += sin(2.0 * pi * self.pert_freq * t)
+			pert += np.sin(2.0 * pi * f * t)
 		pert *= self.pert_perc
 
 		return pert
 
+	def calc_interface_bc(self, solver, sol_prim=None, sol_cons=None):
+		"""
+		Zeroth-order extrapolation of adjacent interior state
+		Used at subdomain interfaces, where ghost cells only influence
+		halo cells which are overwritten by the neighboring subdomain
+		"""
+
+		assert (sol_prim is not None), "Must provide primitive interior state"
+
+		if self.bound_type == "inlet":
+			self.sol_prim[:, :] = sol_prim[:, 0, :]
+		else:
+			self.sol_prim[:, :] = sol_prim[:, -1, :]
+
 	def calc_boundary_state(self, solver, sol_prim=None, sol_cons=None):
 		"""
 		Run boundary calculation and update ghost cell state
@@ -1,4 +1,4 @@
-from math import pow, sqrt
+import numpy as np
 
 from perform.solution.solution_boundary.solution_boundary import SolutionBoundary
 
@@ -34,15 +34,15 @@ class SolutionInlet(SolutionBoundary):
 		assert (sol_prim is not None), "Must provide primitive interior state"
 
 		# chemical composition assumed constant near boundary
-		r_mix = self.r_mix[0]
-		gamma_mix = self.gamma_mix[0]
+		r_mix = self.r_mix
+		gamma_mix = self.gamma_mix
 		gamma_mix_m1 = gamma_mix - 1.0
 
 		# interior state
 		vel_p1 = sol_prim[1, 0]
 		vel_p2 = sol_prim[1, 1]
-		c_p1 = sqrt(gamma_mix * r_mix * sol_prim[2, 0])
-		c_p2 = sqrt(gamma_mix * r_mix * sol_prim[2, 1])
+		c_p1 = np.sqrt(gamma_mix * r_mix * sol_prim[2, 0])
+		c_p2 = np.sqrt(gamma_mix * r_mix * sol_prim[2, 1])
 
 		# interpolate outgoing Riemann invariant
 		# negative sign on velocity is to account for flux/boundary normal directions
@@ -67,7 +67,7 @@ class SolutionInlet(SolutionBoundary):
 		rad = b_val**2 - 4.0 * a_val * c_val
 
 		# check for non-physical solution (usually caused by reverse flow)
-		if rad < 0.0:
+		if np.any(rad < 0.0):
 			print("a_val: " + str(a_val))
 			print("b_val: " + str(b_val))
 			print("c_val: " + str(c_val))
@@ -76,23 +76,21 @@ class SolutionInlet(SolutionBoundary):
 
 		# solve quadratic formula, assign Mach number depending on sign/magnitude
 		# if only one positive, select that. If both positive, select smaller
-		rad = sqrt(rad)
+		rad = np.sqrt(rad)
 		mach_1 = (-b_val - rad) / (2.0 * a_val)
 		mach_2 = (-b_val + rad) / (2.0 * a_val)
-		if (mach_1 > 0) and (mach_2 > 0):
-			mach_bound = min(mach_1, mach_2)
-		elif (mach_1 <= 0) and (mach_2 <= 0):
+		if np.any((mach_1 <= 0) & (mach_2 <= 0)):
 			raise ValueError("Non-physical Mach number at inlet")
-		else:
-			mach_bound = max(mach_1, mach_2)
+		mach_bound = np.where((mach_1 > 0) & (mach_2 > 0),
+								np.minimum(mach_1, mach_2), np.maximum(mach_1, mach_2))
 
 		# compute exterior state
 		temp_bound = self.temp / (1.0 + gamma_mix_m1 / 2.0 * mach_bound**2)
-		self.sol_prim[2, 0] = temp_bound
-		self.sol_prim[0, 0] = \
-			self.press * pow(temp_bound / self.temp, gamma_mix / gamma_mix_m1)
-		c_bound = sqrt(gamma_mix * r_mix * temp_bound)
-		self.sol_prim[1, 0] = mach_bound * c_bound
+		self.sol_prim[2, :] = temp_bound
+		self.sol_prim[0, :] = \
+			self.press * np.power(temp_bound / self.temp, gamma_mix / gamma_mix_m1)
+		c_bound = np.sqrt(gamma_mix * r_mix * temp_bound)
+		self.sol_prim[1, :] = mach_bound * c_bound
 
 	def calc_full_state_bc(self, solver, sol_prim=None, sol_cons=None):
 		"""
@@ -105,17 +103,18 @@ class SolutionInlet(SolutionBoundary):
 		temp_bound = self.temp
 
 		# perturbation
+		# not in-place, as fixed properties may be per-member arrays
 		if self.pert_type == "pressure":
-			press_bound *= (1.0 + self.calc_pert(solver.sol_time))
+			press_bound = press_bound * (1.0 + self.calc_pert(solver.sol_time))
 		elif self.pert_type == "velocity":
-			vel_bound *= (1.0 + self.calc_pert(solver.sol_time))
+			vel_bound = vel_bound * (1.0 + self.calc_pert(solver.sol_time))
 		elif self.pert_type == "temperature":
-			press_bound *= (1.0 + self.calc_pert(solver.sol_time))
+			press_bound = press_bound * (1.0 + self.calc_pert(solver.sol_time))
 
 		# compute ghost cell state
-		self.sol_prim[0, 0] = press_bound
-		self.sol_prim[1, 0] = vel_bound
-		self.sol_prim[2, 0] = temp_bound
+		self.sol_prim[0, :] = press_bound
+		self.sol_prim[1, :] = vel_bound
+		self.sol_prim[2, :] = temp_bound
 
 	def calc_mean_flow_bc(self, solver, sol_prim=None, sol_cons=None):
 		"""
@@ -134,7 +133,7 @@ class SolutionInlet(SolutionBoundary):
 		rho_cp_mean = self.rho
 
 		if self.pert_type == "pressure":
-			press_up *= (1.0 + self.calc_pert(solver.sol_time))
+			press_up = press_up * (1.0 + self.calc_pert(solver.sol_time))
 
 		# interior quantities
 		press_in = sol_prim[0, :2]
@@ -154,6 +153,6 @@ class SolutionInlet(SolutionBoundary):
 
 		# compute exterior state
 		press_bound = (press_up - w_3_bound * rho_c_mean) / 2.0
-		self.sol_prim[0, 0] = press_bound
-		self.sol_prim[1, 0] = (press_up - press_bound) / rho_c_mean
-		self.sol_prim[2, 0] = temp_up + (press_bound - press_up) / rho_cp_mean
+		self.sol_prim[0, :] = press_bound
+		self.sol_prim[1, :] = (press_up - press_bound) / rho_c_mean
+		self.sol_prim[2, :] = temp_up + (press_bound - press_up) / rho_cp_mean
@@ -1,4 +1,4 @@
-from math import pow, sqrt
+import numpy as np
 
 from perform.solution.solution_boundary.solution_boundary import SolutionBoundary
 
@@ -36,11 +36,11 @@ class SolutionOutlet(SolutionBoundary):
 
 		press_bound = self.press
 		if self.pert_type == "pressure":
-			press_bound *= (1.0 + self.calc_pert(solver.sol_time))
+			press_bound = press_bound * (1.0 + self.calc_pert(solver.sol_time))
 
 		# chemical composition assumed constant near boundary
-		r_mix = self.r_mix[0]
-		gamma_mix = self.gamma_mix[0]
+		r_mix = self.r_mix
+		gamma_mix = self.gamma_mix
 		gamma_mix_m1 = gamma_mix - 1.0
 
 		# calculate interior state
@@ -52,10 +52,10 @@ class SolutionOutlet(SolutionBoundary):
 		vel_p2 = sol_prim[1, -2]
 
 		# outgoing characteristics information
-		s_p1 = press_p1 / pow(rho_p1, gamma_mix)
-		s_p2 = press_p2 / pow(rho_p2, gamma_mix)
-		c_p1 = sqrt(gamma_mix * r_mix * sol_prim[2, -1])
-		c_p2 = sqrt(gamma_mix * r_mix * sol_prim[2, -2])
+		s_p1 = press_p1 / np.power(rho_p1, gamma_mix)
+		s_p2 = press_p2 / np.power(rho_p2, gamma_mix)
+		c_p1 = np.sqrt(gamma_mix * r_mix * sol_prim[2, -1])
+		c_p2 = np.sqrt(gamma_mix * r_mix * sol_prim[2, -2])
 		j_p1 = vel_p1 + 2.0 * c_p1 / gamma_mix_m1
 		j_p2 = vel_p2 + 2.0 * c_p2 / gamma_mix_m1
 
@@ -71,11 +71,11 @@ class SolutionOutlet(SolutionBoundary):
 							+ "required for spatial order " + str(solver.space_order))
 
 		# compute exterior state
-		self.sol_prim[0, 0] = press_bound
-		rho_bound = pow((press_bound / s), (1.0 / gamma_mix))
-		c_bound = sqrt(gamma_mix * press_bound / rho_bound)
-		self.sol_prim[1, 0] = j - 2.0 * c_bound / gamma_mix_m1
-		self.sol_prim[2, 0] = press_bound / (r_mix * rho_bound)
+		self.sol_prim[0, :] = press_bound
+		rho_bound = np.power((press_bound / s), (1.0 / gamma_mix))
+		c_bound = np.sqrt(gamma_mix * press_bound / rho_bound)
+		self.sol_prim[1, :] = j - 2.0 * c_bound / gamma_mix_m1
+		self.sol_prim[2, :] = press_bound / (r_mix * rho_bound)
 
 	def calc_mean_flow_bc(self, solver, sol_prim=None, sol_cons=None):
 		"""
@@ -91,7 +91,7 @@ class SolutionOutlet(SolutionBoundary):
 		press_back = self.press
 
 		if self.pert_type == "pressure":
-			press_back *= (1.0 + self.calc_pert(solver.sol_time))
+			press_back = press_back * (1.0 + self.calc_pert(solver.sol_time))
 
 		# interior quantities
 		press_out = sol_prim[0, -2:]
@@ -119,7 +119,7 @@ class SolutionOutlet(SolutionBoundary):
 
 		# compute exterior state
 		press_bound = (w_2_bound * rho_c_mean + press_back) / 2.0
-		self.sol_prim[0, 0] = press_bound
-		self.sol_prim[1, 0] = (press_bound - press_back) / rho_c_mean
-		self.sol_prim[2, 0] = w_1_bound + press_bound / rho_cp_mean
-		self.sol_prim[3:, 0] = w_4_bound
+		self.sol_prim[0, :] = press_bound
+		self.sol_prim[1, :] = (press_bound - press_back) / rho_c_mean
+		self.sol_prim[2, :] = w_1_bound + press_bound / rho_cp_mean
+		self.sol_prim[3:, :] = w_4_bound
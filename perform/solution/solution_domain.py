@@ -1,5 +1,3 @@
-import os
-
 import numpy as np
 from scipy.sparse.linalg import spsolve
 from scipy.linalg import solve
@@ -11,6 +9,7 @@ from perform.solution.solution_phys import SolutionPhys
 from perform.solution.solution_interior import SolutionInterior
 from perform.solution.solution_boundary.solution_inlet import SolutionInlet
 from perform.solution.solution_boundary.solution_outlet import SolutionOutlet
+from perform.solution.probe_monitor import ProbeMonitor
 from perform.space_schemes import calc_rhs
 from perform.jacobians import calc_d_res_d_sol_prim
 from perform.time_integrator import get_time_integrator
@@ -24,16 +23,20 @@ class SolutionDomain:
 	Container class for interior and boundary physical solutions
 	"""
 
-	def __init__(self, solver):
+	def __init__(self, solver, gas_dict=None, sol_prim_init=None):
 
 		param_dict = solver.param_dict
 
 		# time integrator
 		self.time_integrator = get_time_integrator(solver.time_scheme, param_dict)
+		if self.time_integrator.time_type == "exponential":
+			raise ValueError("Exponential integrators require a low-dimensional RHS Jacobian,"
+							+ " please set time_scheme in rom_params.inp instead")
 
 		# gas model
-		gas_file = str(param_dict["gas_file"])
-		gas_dict = read_input_file(gas_file)
+		if gas_dict is None:
+			gas_file = str(param_dict["gas_file"])
+			gas_dict = read_input_file(gas_file)
 		gas_type = catch_input(gas_dict, "gas_type", "cpg")
 		if gas_type == "cpg":
 			self.gas_model = CaloricallyPerfectGas(gas_dict)
@@ -41,26 +44,41 @@ class SolutionDomain:
 			raise ValueError("Ivalid choice of gas_type: " + gas_type)
 		gas = self.gas_model
 
+		# ensemble members are stacked along the cell axis,
+		# 	each with its own inlet and outlet ghost cell
+		self.num_members = solver.num_members
+		if self.num_members > 1:
+			assert (self.time_integrator.time_type == "explicit"), \
+				"Ensemble runs are only supported for explicit time integrators"
+
 		# solution
-		sol_prim_init = get_initial_conditions(self, solver)
+		if sol_prim_init is None:
+			sol_prim_init = get_initial_conditions(self, solver)
+		else:
+			assert (sol_prim_init.shape[0] == self.gas_model.num_eqs), \
+				("Incorrect sol_prim_init num_eqs: " + str(sol_prim_init.shape[0]))
+			solver.sol_time = catch_input(param_dict, "sol_time_init", 0.0)
+		if (self.num_members > 1) and (sol_prim_init.shape[1] == solver.mesh.num_cells):
+			sol_prim_init = np.tile(sol_prim_init, (1, self.num_members))
 		self.sol_int = SolutionInterior(gas, sol_prim_init,
 										solver, self.time_integrator)
 		self.sol_inlet = SolutionInlet(gas, solver)
 		self.sol_outlet = SolutionOutlet(gas, solver)
 
 		# average solution for Roe scheme
+		num_faces = (solver.mesh.num_cells + 1) * self.num_members
 		if solver.space_scheme == "roe":
-			ones_prof = np.ones((self.gas_model.num_eqs, self.sol_int.num_cells + 1),
+			ones_prof = np.ones((self.gas_model.num_eqs, num_faces),
 								dtype=REAL_TYPE)
-			self.sol_ave = SolutionPhys(gas, self.sol_int.num_cells + 1,
+			self.sol_ave = SolutionPhys(gas, num_faces,
 										sol_prim_in=ones_prof)
 
 		# for flux calculations
-		ones_prof = np.ones((self.gas_model.num_eqs, self.sol_int.num_cells + 1),
+		ones_prof = np.ones((self.gas_model.num_eqs, num_faces),
 							dtype=REAL_TYPE)
-		self.sol_left = SolutionPhys(gas, self.sol_int.num_cells + 1,
+		self.sol_left = SolutionPhys(gas, num_faces,
 										sol_prim_in=ones_prof)
-		self.sol_right = SolutionPhys(gas, self.sol_int.num_cells + 1,
+		self.sol_right = SolutionPhys(gas, num_faces,
 										sol_prim_in=ones_prof)
 
 		# to avoid repeated concatenation of ghost cell states
@@ -74,56 +92,53 @@ class SolutionDomain:
 		self.probe_locs = catch_list(param_dict, "probe_locs", [None])
 		self.probe_vars = catch_list(param_dict, "probe_vars", [None])
 		if (self.probe_locs[0] is not None) and (self.probe_vars[0] is not None):
-			self.num_probes = len(self.probe_locs)
-			self.num_probe_vars = len(self.probe_vars)
-			self.probe_vals = np.zeros((self.num_probes, self.num_probe_vars,
-										solver.num_steps), dtype=REAL_TYPE)
-
-			# get probe locations
-			self.probe_idxs = [None] * self.num_probes
-			self.probe_secs = [None] * self.num_probes
-			for idx, probe_loc in enumerate(self.probe_locs):
-				if probe_loc > solver.mesh.x_right:
-					self.probe_secs[idx] = "outlet"
-				elif (probe_loc < solver.mesh.x_left):
-					self.probe_secs[idx] = "inlet"
-				else:
-					self.probe_secs[idx] = "interior"
-					self.probe_idxs[idx] = np.abs(solver.mesh.x_cell - probe_loc).argmin()
-
-			assert (not ((("outlet" in self.probe_secs) or ("inlet" in self.probe_secs))
-						and (("source" in self.probe_vars) or ("rhs" in self.probe_vars)))), \
-						"Cannot probe source or rhs in inlet/outlet"
-
+			self.probe_monitor = ProbeMonitor(self, solver, self.probe_locs, self.probe_vars)
+			self.num_probes = self.probe_monitor.num_probes
+			self.num_probe_vars = self.probe_monitor.num_probe_vars
 		else:
+			self.probe_monitor = None
 			self.num_probes = 0
 
+		# set for domain decomposition, see perform.decomposition
+		self.halo_exchange = None
+
 		# copy this for use with plotting functions
 		solver.num_probes = self.num_probes
 		solver.probe_vars = self.probe_vars
 
-		# TODO: include initial conditions in probe_vals, time_vals
-		self.time_vals = \
-			np.linspace(solver.dt * (solver.time_iter),
-				solver.dt * (solver.time_iter - 1 + solver.num_steps),
-				solver.num_steps, dtype=REAL_TYPE)
+		# per-member offsets into interior, face, and full (with ghost cells) arrays
+		num_cells = solver.mesh.num_cells
+		int_offsets = num_cells * np.arange(self.num_members)
+		face_offsets = (num_cells + 1) * np.arange(self.num_members)
+		full_offsets = (num_cells + 2) * np.arange(self.num_members)
 
 		# for compatability with hyper-reduction
 		# are overwritten if actually using hyper-reduction
-		self.num_samp_cells = solver.mesh.num_cells
-		self.num_flux_faces = solver.mesh.num_cells + 1
-		self.num_grad_cells = solver.mesh.num_cells
-		self.direct_samp_idxs = np.arange(0, solver.mesh.num_cells)
-		self.flux_samp_left_idxs = np.arange(0, solver.mesh.num_cells + 1)
-		self.flux_samp_right_idxs = np.arange(1, solver.mesh.num_cells + 2)
-		self.grad_idxs = np.arange(1, solver.mesh.num_cells + 1)
-		self.grad_neigh_idxs = np.arange(0, solver.mesh.num_cells + 2)
-		self.grad_neigh_extract = np.arange(1, solver.mesh.num_cells + 1)
-		self.flux_left_extract = np.arange(1, solver.mesh.num_cells + 1)
-		self.flux_right_extract = np.arange(0, solver.mesh.num_cells)
-		self.grad_left_extract = np.arange(0, solver.mesh.num_cells)
-		self.grad_right_extract = np.arange(0, solver.mesh.num_cells)
-		self.flux_rhs_idxs = np.arange(0, solver.mesh.num_cells)
+		self.num_samp_cells = num_cells * self.num_members
+		self.num_flux_faces = (num_cells + 1) * self.num_members
+		self.num_grad_cells = num_cells * self.num_members
+		self.direct_samp_idxs = np.arange(0, self.num_samp_cells)
+		self.flux_samp_left_idxs = stack_member_idxs(np.arange(0, num_cells + 1), full_offsets)
+		self.flux_samp_right_idxs = stack_member_idxs(np.arange(1, num_cells + 2), full_offsets)
+		self.grad_idxs = stack_member_idxs(np.arange(1, num_cells + 1), full_offsets)
+		self.grad_neigh_idxs = np.arange(0, (num_cells + 2) * self.num_members)
+		self.grad_neigh_extract = stack_member_idxs(np.arange(1, num_cells + 1), full_offsets)
+		self.flux_left_extract = stack_member_idxs(np.arange(1, num_cells + 1), face_offsets)
+		self.flux_right_extract = stack_member_idxs(np.arange(0, num_cells), face_offsets)
+		self.grad_left_extract = np.arange(0, self.num_grad_cells)
+		self.grad_right_extract = np.arange(0, self.num_grad_cells)
+		self.flux_rhs_idxs = stack_member_idxs(np.arange(0, num_cells), face_offsets)
+		self.jacob_left_samp = np.arange(1, num_cells)
+		self.jacob_right_samp = np.arange(0, num_cells - 1)
+
+		# ghost cell and interior locations in sol_prim_full/sol_cons_full
+		self.full_inlet_idxs = full_offsets
+		self.full_int_idxs = stack_member_idxs(np.arange(1, num_cells + 1), full_offsets)
+		self.full_outlet_idxs = full_offsets + num_cells + 1
+
+		# interior cells adjacent to boundaries, in [2, num_members] order
+		self.inlet_adj_idxs = np.arange(0, 2)[:, None] + int_offsets[None, :]
+		self.outlet_adj_idxs = np.arange(num_cells - 2, num_cells)[:, None] + int_offsets[None, :]
 
 	def fill_sol_full(self):
 		"""
@@ -134,25 +149,30 @@ class SolutionDomain:
 		sol_inlet = self.sol_inlet
 		sol_outlet = self.sol_outlet
 
-		idx_in = sol_inlet.num_cells
-		idx_int = idx_in + sol_int.num_cells
-
 		# sol_prim_full
-		self.sol_prim_full[:, :idx_in] = sol_inlet.sol_prim.copy()
-		self.sol_prim_full[:, idx_in:idx_int] = sol_int.sol_prim.copy()
-		self.sol_prim_full[:, idx_int:] = sol_outlet.sol_prim.copy()
+		self.sol_prim_full[:, self.full_inlet_idxs] = sol_inlet.sol_prim
+		self.sol_prim_full[:, self.full_int_idxs] = sol_int.sol_prim
+		self.sol_prim_full[:, self.full_outlet_idxs] = sol_outlet.sol_prim
 
 		# sol_cons_full
-		self.sol_cons_full[:, :idx_in] = sol_inlet.sol_cons.copy()
-		self.sol_cons_full[:, idx_in:idx_int] = sol_int.sol_cons.copy()
-		self.sol_cons_full[:, idx_int:] = sol_outlet.sol_cons.copy()
+		self.sol_cons_full[:, self.full_inlet_idxs] = sol_inlet.sol_cons
+		self.sol_cons_full[:, self.full_int_idxs] = sol_int.sol_cons
+		self.sol_cons_full[:, self.full_outlet_idxs] = sol_outlet.sol_cons
+
+	def get_member_view(self, sol):
+		"""
+		View interior array of shape [num_vars, num_members * num_cells]
+		as array of shape [num_members, num_vars, num_cells]
+		"""
+
+		return sol.reshape((sol.shape[0], self.num_members, -1)).transpose((1, 0, 2))
 
 	def advance_iter(self, solver):
 		"""
 		Advance physical solution forward one time iteration
 		"""
 
-		if not solver.run_steady:
+		if (not solver.run_steady) and solver.verbose:
 			print("Iteration " + str(solver.iter))
 
 		for self.time_integrator.subiter in range(self.time_integrator.subiter_max):
@@ -211,6 +231,11 @@ class SolutionDomain:
 
 			d_sol = self.time_integrator.solve_sol_change(sol_int.rhs)
 			sol_int.sol_cons = sol_int.sol_hist_cons[0] + d_sol
+
+			# overwrite halo cells with neighboring subdomain solutions
+			if self.halo_exchange is not None:
+				self.halo_exchange(sol_int.sol_cons)
+
 			sol_int.update_state(from_cons=True)
 
 	def calc_boundary_cells(self, solver):
@@ -219,11 +244,11 @@ class SolutionDomain:
 		"""
 
 		self.sol_inlet.calc_boundary_state(solver,
-											sol_prim=self.sol_int.sol_prim,
-											sol_cons=self.sol_int.sol_cons)
+											sol_prim=self.sol_int.sol_prim[:, self.inlet_adj_idxs],
+											sol_cons=self.sol_int.sol_cons[:, self.inlet_adj_idxs])
 		self.sol_outlet.calc_boundary_state(solver,
-											sol_prim=self.sol_int.sol_prim,
-											sol_cons=self.sol_int.sol_cons)
+											sol_prim=self.sol_int.sol_prim[:, self.outlet_adj_idxs],
+											sol_cons=self.sol_int.sol_cons[:, self.outlet_adj_idxs])
 
 	def write_iter_outputs(self, solver):
 		"""
@@ -236,7 +261,7 @@ class SolutionDomain:
 
 		# update probe data
 		if self.num_probes > 0:
-			self.update_probes(solver)
+			self.probe_monitor.update_probes(solver)
 
 		# update snapshot data (not written if running steady)
 		if not solver.run_steady:
@@ -270,79 +295,16 @@ class SolutionDomain:
 
 		if not solver.run_steady:
 			self.sol_int.write_snapshots(solver, solver.solve_failed)
+			if solver.pod_out:
+				self.sol_int.write_pod(solver)
 
 		if self.num_probes > 0:
-			self.write_probes(solver)
+			self.probe_monitor.write_probes(solver)
 
-	def update_probes(self, solver):
-		"""
-		Update probe storage
-		"""
-
-		# TODO: throw error for source probe in ghost cells
-
-		for probe_iter, probe_idx in enumerate(self.probe_idxs):
 
-			probe_sec = self.probe_secs[probe_iter]
-			if probe_sec == "inlet":
-				sol_prim_probe = self.sol_inlet.sol_prim[:, 0]
-				sol_cons_probe = self.sol_inlet.sol_cons[:, 0]
-			elif probe_sec == "outlet":
-				sol_prim_probe = self.sol_outlet.sol_prim[:, 0]
-				sol_cons_probe = self.sol_outlet.sol_cons[:, 0]
-			else:
-				sol_prim_probe = self.sol_int.sol_prim[:, probe_idx]
-				sol_cons_probe = self.sol_int.sol_cons[:, probe_idx]
-				sol_source_probe = self.sol_int.source[:, probe_idx]
-
-			try:
-				probe = []
-				for var_str in self.probe_vars:
-					if var_str == "pressure":
-						probe.append(sol_prim_probe[0])
-					elif var_str == "velocity":
-						probe.append(sol_prim_probe[1])
-					elif var_str == "temperature":
-						probe.append(sol_prim_probe[2])
-					elif var_str == "source":
-						probe.append(sol_source_probe[0])
-					elif var_str == "density":
-						probe.append(sol_cons_probe[0])
-					elif var_str == "momentum":
-						probe.append(sol_cons_probe[1])
-					elif var_str == "energy":
-						probe.append(sol_cons_probe[2])
-					elif var_str == "species":
-						probe.append(sol_prim_probe[3])
-					elif var_str[:7] == "species":
-						spec_idx = int(var_str[7:])
-						probe.append(sol_prim_probe[3 + spec_idx - 1])
-					elif var_str[:15] == "density-species":
-						spec_idx = int(var_str[15:])
-						probe.append(sol_cons_probe[3 + spec_idx - 1])
-			except:
-				raise ValueError("Invalid probe variable " + str(var_str))
-
-			self.probe_vals[probe_iter, :, solver.iter - 1] = probe
-
-	def write_probes(self, solver):
-		"""
-		Save probe data to disk
-		"""
-
-		probe_file_base_name = "probe"
-		for vis_var in self.probe_vars:
-			probe_file_base_name += "_" + vis_var
-
-		for probe_num in range(self.num_probes):
-
-			# account for failed simulations
-			time_out = self.time_vals[:solver.iter]
-			probe_out = self.probe_vals[probe_num, :, :solver.iter]
-
-			probe_file_name = (probe_file_base_name + "_" + str(probe_num + 1)
-								+ "_" + solver.sim_type + ".npy")
-			probe_file = os.path.join(solver.probe_output_dir, probe_file_name)
+def stack_member_idxs(idxs, offsets):
+	"""
+	Repeat index array for each ensemble member, shifted by per-member offsets
+	"""
 
-			probe_save = np.concatenate((time_out[None, :], probe_out), axis=0)
-			np.save(probe_file, probe_save)
+	return (idxs[None, :] + offsets[:, None]).ravel()
@@ -2,8 +2,11 @@ import os
 
 import numpy as np
 
-from perform.constants import REAL_TYPE, RES_NORM_PRIM_DEFAULT
+from perform.constants import REAL_TYPE, RES_NORM_PRIM_DEFAULT, POD_OUTPUT_DIR_NAME
 from perform.solution.solution_phys import SolutionPhys
+from perform.jacobians import calc_jacob_idxs
+from perform.rom.pod_funcs import IncrementalPOD
+from perform.misc_funcs import mkdir_shallow
 
 
 class SolutionInterior(SolutionPhys):
@@ -12,10 +15,12 @@ class SolutionInterior(SolutionPhys):
 	"""
 
 	def __init__(self, gas, sol_prim_in, solver, time_int):
-		super().__init__(gas, solver.mesh.num_cells, sol_prim_in=sol_prim_in)
+
+		# ensemble members are stacked along the cell axis
+		num_cells = solver.mesh.num_cells * solver.num_members
+		super().__init__(gas, num_cells, sol_prim_in=sol_prim_in)
 
 		gas = self.gas_model
-		num_cells = solver.mesh.num_cells
 
 		self.source = np.zeros((gas.num_species, num_cells), dtype=REAL_TYPE)
 		self.rhs = np.zeros((gas.num_eqs, num_cells), dtype=REAL_TYPE)
@@ -26,11 +31,7 @@ class SolutionInterior(SolutionPhys):
 			self.update_state(from_cons=False)
 
 		# initializing time history
-		self.sol_hist_cons = [self.sol_cons.copy()] * (time_int.time_order + 1)
-		self.sol_hist_prim = [self.sol_prim.copy()] * (time_int.time_order + 1)
-
-		# RHS storage for multi-stage schemes
-		self.rhs_hist = [self.rhs.copy()] * (time_int.time_order + 1)
+		self.reset_sol_hist(time_int)
 
 		# snapshot storage matrices, store initial condition
 		if solver.prim_out:
@@ -51,6 +52,20 @@ class SolutionInterior(SolutionPhys):
 			self.rhs_snap = \
 				np.zeros((gas.num_eqs, num_cells, solver.num_snaps), dtype=REAL_TYPE)
 
+		# POD of each variable group, updated with snapshots instead of storing them
+		if solver.pod_out:
+			if solver.pod_var_idxs is None:
+				solver.pod_var_idxs = [[var_idx] for var_idx in range(gas.num_eqs)]
+			for var_idxs in solver.pod_var_idxs:
+				assert (all([(var_idx >= 0) and (var_idx < gas.num_eqs) for var_idx in var_idxs])), \
+					"pod_var_idxs must be integers in [0, num_eqs - 1]"
+			self.pod_accums = [IncrementalPOD(len(var_idxs), solver.mesh.num_cells, solver.pod_max_modes,
+												cent_type=solver.pod_cent_type,
+												norm_type=solver.pod_norm_type,
+												block_size=solver.pod_block_size)
+								for var_idxs in solver.pod_var_idxs]
+			self.update_pod(solver)
+
 		if (time_int.time_type == "implicit") or (solver.run_steady):
 			# norm normalization constants
 			# TODO: will need a normalization constant for
@@ -66,52 +81,7 @@ class SolutionInterior(SolutionPhys):
 
 			# residual norm storage
 			if time_int.time_type == "implicit":
-
-				self.res = np.zeros((gas.num_eqs, num_cells), dtype=REAL_TYPE)
-				self.res_norm_l2 = 0.0
-				self.res_norm_l1 = 0.0
-				self.res_norm_history = np.zeros((solver.num_steps, 2), dtype=REAL_TYPE)
-
-				if (time_int.dual_time) and (time_int.adapt_dtau):
-					self.srf = np.zeros(num_cells, dtype=REAL_TYPE)
-
-				# CSR matrix indices
-				num_elements = gas.num_eqs**2 * num_cells
-				self.jacob_dim = gas.num_eqs * num_cells
-
-				row_idxs_center = np.zeros(num_elements, dtype=np.int32)
-				col_idxs_center = np.zeros(num_elements, dtype=np.int32)
-				row_idxs_upper = np.zeros(num_elements - gas.num_eqs**2, dtype=np.int32)
-				col_idxs_upper = np.zeros(num_elements - gas.num_eqs**2, dtype=np.int32)
-				row_idxs_lower = np.zeros(num_elements - gas.num_eqs**2, dtype=np.int32)
-				col_idxs_lower = np.zeros(num_elements - gas.num_eqs**2, dtype=np.int32)
-
-				# TODO: definitely a faster way to do this
-				lin_idx_A = 0
-				lin_idx_B = 0
-				lin_idx_C = 0
-				for i in range(gas.num_eqs):
-					for j in range(gas.num_eqs):
-						for k in range(num_cells):
-
-							row_idxs_center[lin_idx_A] = i * num_cells + k
-							col_idxs_center[lin_idx_A] = j * num_cells + k
-							lin_idx_A += 1
-
-							if k < (num_cells - 1):
-								row_idxs_upper[lin_idx_B] = i * num_cells + k
-								col_idxs_upper[lin_idx_B] = j * num_cells + k + 1
-								lin_idx_B += 1
-
-							if k > 0:
-								row_idxs_lower[lin_idx_C] = i * num_cells + k
-								col_idxs_lower[lin_idx_C] = j * num_cells + k - 1
-								lin_idx_C += 1
-
-				self.jacob_row_idxs = \
-					np.concatenate((row_idxs_center, row_idxs_lower, row_idxs_upper))
-				self.jacob_col_idxs = \
-					np.concatenate((col_idxs_center, col_idxs_lower, col_idxs_upper))
+				self.init_implicit(solver, time_int)
 
 			# "steady" convergence measures
 			if solver.run_steady:
@@ -119,6 +89,41 @@ class SolutionInterior(SolutionPhys):
 				self.d_sol_norm_l1 = 0.0
 				self.d_sol_norm_history = np.zeros((solver.num_steps, 2), dtype=REAL_TYPE)
 
+	def init_implicit(self, solver, time_int):
+		"""
+		Allocate residual and residual norm storage and residual Jacobian indices of implicit time integrators
+
+		Called separately by ROMs whose time integrator is implicit while that of the full-order solver is not
+		"""
+
+		gas = self.gas_model
+		num_cells = self.num_cells
+
+		self.res = np.zeros((gas.num_eqs, num_cells), dtype=REAL_TYPE)
+		self.res_norm_l2 = 0.0
+		self.res_norm_l1 = 0.0
+		self.res_norm_history = np.zeros((solver.num_steps, 2), dtype=REAL_TYPE)
+
+		if (time_int.dual_time) and (time_int.adapt_dtau):
+			self.srf = np.zeros(num_cells, dtype=REAL_TYPE)
+
+		# CSR matrix indices, overwritten if using hyper-reduction
+		self.jacob_dim = gas.num_eqs * num_cells
+		self.jacob_row_idxs, self.jacob_col_idxs = \
+			calc_jacob_idxs(gas.num_eqs, num_cells, np.arange(0, num_cells),
+							np.arange(1, num_cells), np.arange(0, num_cells - 1))
+
+	def reset_sol_hist(self, time_int):
+		"""
+		Set time history of solution and RHS function to current state
+		"""
+
+		self.sol_hist_cons = [self.sol_cons.copy()] * (time_int.time_order + 1)
+		self.sol_hist_prim = [self.sol_prim.copy()] * (time_int.time_order + 1)
+
+		# RHS storage for multi-stage schemes
+		self.rhs_hist = [self.rhs.copy()] * (time_int.time_order + 1)
+
 	def update_sol_hist(self):
 		"""
 		Update time history of solution and RHS function
@@ -149,6 +154,42 @@ class SolutionInterior(SolutionPhys):
 			self.source_snap[:, :, store_idx - 1] = self.source
 		if solver.rhs_out:
 			self.rhs_snap[:, :, store_idx - 1] = self.rhs
+		if solver.pod_out:
+			self.update_pod(solver)
+
+	def update_pod(self, solver):
+		"""
+		Add current solution to POD of each variable group,
+		ensemble members are treated as separate snapshots
+		"""
+
+		if solver.pod_var_type == "prim":
+			sol = self.sol_prim
+		else:
+			sol = self.sol_cons
+
+		for var_idxs, pod_accum in zip(solver.pod_var_idxs, self.pod_accums):
+			snaps = np.reshape(sol[var_idxs, :], (len(var_idxs), solver.num_members, solver.mesh.num_cells))
+			pod_accum.add_snapshots(np.transpose(snaps, (0, 2, 1)))
+
+	def write_pod(self, solver):
+		"""
+		Save POD basis, singular values, and standardization profiles of each variable group,
+		with the same file names as utils/genPODBasis.py
+		"""
+
+		pod_output_dir = mkdir_shallow(solver.unsteady_output_dir,
+										POD_OUTPUT_DIR_NAME + "_" + solver.pod_var_type + "_" + solver.sim_type)
+
+		for var_idxs, pod_accum in zip(solver.pod_var_idxs, self.pod_accums):
+			basis, sing_vals, cent_prof, norm_sub_prof, norm_fac_prof = pod_accum.calc_pod()
+
+			suffix = "".join(["_" + str(var_idx) for var_idx in var_idxs]) + ".npy"
+			np.save(os.path.join(pod_output_dir, "centProf" + suffix), cent_prof)
+			np.save(os.path.join(pod_output_dir, "normSubProf" + suffix), norm_sub_prof)
+			np.save(os.path.join(pod_output_dir, "normFacProf" + suffix), norm_fac_prof)
+			np.save(os.path.join(pod_output_dir, "spatialModes" + suffix), basis)
+			np.save(os.path.join(pod_output_dir, "singularValues" + suffix), sing_vals)
 
 	def write_snapshots(self, solver, failed):
 		"""
@@ -166,21 +207,30 @@ class SolutionInterior(SolutionPhys):
 		final_idx = int((solver.iter - 1) / solver.out_interval) + offset
 
 		if solver.prim_out:
-			sol_prim_file = os.path.join(unsteady_output_dir,
-										"solPrim_" + solver.sim_type + ".npy")
-			np.save(sol_prim_file, self.prim_snap[:, :, :final_idx])
+			sol_prim_file = os.path.join(unsteady_output_dir, "solPrim_" + solver.sim_type)
+			self.save_snapshot(solver, sol_prim_file, self.prim_snap[:, :, :final_idx])
 		if solver.cons_out:
-			sol_cons_file = os.path.join(unsteady_output_dir,
-										"solCons_" + solver.sim_type + ".npy")
-			np.save(sol_cons_file, self.cons_snap[:, :, :final_idx])
+			sol_cons_file = os.path.join(unsteady_output_dir, "solCons_" + solver.sim_type)
+			self.save_snapshot(solver, sol_cons_file, self.cons_snap[:, :, :final_idx])
 		if solver.source_out:
-			source_file = os.path.join(unsteady_output_dir,
-										"source_" + solver.sim_type + ".npy")
-			np.save(source_file, self.source_snap[:, :, :final_idx - 1])
+			source_file = os.path.join(unsteady_output_dir, "source_" + solver.sim_type)
+			self.save_snapshot(solver, source_file, self.source_snap[:, :, :final_idx - 1])
 		if solver.rhs_out:
-			sol_rhs_file = os.path.join(unsteady_output_dir,
-										"solRHS_" + solver.sim_type + ".npy")
-			np.save(sol_rhs_file, self.rhs_snap[:, :, :final_idx - 1])
+			sol_rhs_file = os.path.join(unsteady_output_dir, "solRHS_" + solver.sim_type)
+			self.save_snapshot(solver, sol_rhs_file, self.rhs_snap[:, :, :final_idx - 1])
+
+	def save_snapshot(self, solver, file_base, snap):
+		"""
+		Save single snapshot matrix, split into one file per ensemble member
+		"""
+
+		if solver.num_members == 1:
+			np.save(file_base + ".npy", snap)
+		else:
+			num_cells = solver.mesh.num_cells
+			for member_idx in range(solver.num_members):
+				np.save(file_base + "_member" + str(member_idx + 1) + ".npy",
+						snap[:, member_idx * num_cells:(member_idx + 1) * num_cells, :])
 
 	def write_restart_file(self, solver):
 		"""
@@ -249,11 +299,12 @@ class SolutionInterior(SolutionPhys):
 
 		norm_l2, norm_l1 = self.calc_norms(d_sol, solver.res_norm_prim)
 
-		norm_out_l2 = np.log10(norm_l2)
-		norm_out_l1 = np.log10(norm_l1)
-		out_string = (("%8i:   L2: %18.14f,   L1: %18.14f")
-						% (solver.time_iter, norm_out_l2, norm_out_l1))
-		print(out_string)
+		if solver.verbose:
+			norm_out_l2 = np.log10(norm_l2)
+			norm_out_l1 = np.log10(norm_l1)
+			out_string = (("%8i:   L2: %18.14f,   L1: %18.14f")
+							% (solver.time_iter, norm_out_l2, norm_out_l1))
+			print(out_string)
 
 		self.d_sol_norm_l2 = norm_l2
 		self.d_sol_norm_l1 = norm_l1
@@ -270,7 +321,7 @@ class SolutionInterior(SolutionPhys):
 		norm_l2, norm_l1 = self.calc_norms(self.res, solver.res_norm_prim)
 
 		# don't print for "steady" solve
-		if not solver.run_steady:
+		if (not solver.run_steady) and solver.verbose:
 			norm_out_l2 = np.log10(norm_l2)
 			norm_out_l1 = np.log10(norm_l1)
 			out_string = ((str(subiter + 1) + ":\tL2: %18.14f, \tL1: %18.14f")
@@ -6,29 +6,35 @@ from perform.constants import REAL_TYPE, R_UNIV
 from perform.higher_order_funcs import calc_cell_gradients
 
 
-def calc_rhs(sol_domain, solver):
+def calc_rhs(sol_domain, solver, time_integrator=None):
 	"""
 	Compute rhs function
+
+	time_integrator defaults to that of sol_domain, ROMs may provide their own
 	"""
 
+	if time_integrator is None:
+		time_integrator = sol_domain.time_integrator
+
 	sol_int = sol_domain.sol_int
 	sol_inlet = sol_domain.sol_inlet
 	sol_outlet = sol_domain.sol_outlet
 	sol_prim_full = sol_domain.sol_prim_full
 	sol_cons_full = sol_domain.sol_cons_full
 
-	# compute ghost cell state (if adjacent cell is sampled)
+	# compute ghost cell state
+	# always computed, as ghost cells may be in the gradient stencil
+	# 	of a sampled cell even if the adjacent cell is not sampled
 	# TODO: update this after higher-order contribution?
 	# TODO: adapt pass to calc_boundary_state() depending on space scheme
 	# TODO: assign more than just one ghost cell for higher-order schemes
-	if (sol_domain.direct_samp_idxs[0] == 0):
-		sol_inlet.calc_boundary_state(solver,
-										sol_prim=sol_int.sol_prim[:, :2],
-										sol_cons=sol_int.sol_cons[:, :2])
-	if (sol_domain.direct_samp_idxs[-1] == (solver.mesh.num_cells - 1)):
-		sol_outlet.calc_boundary_state(solver,
-										sol_prim=sol_int.sol_prim[:, -2:],
-										sol_cons=sol_int.sol_cons[:, -2:])
+	# adjacent interior states are passed in [num_eqs, 2, num_members] order
+	sol_inlet.calc_boundary_state(solver,
+									sol_prim=sol_int.sol_prim[:, sol_domain.inlet_adj_idxs],
+									sol_cons=sol_int.sol_cons[:, sol_domain.inlet_adj_idxs])
+	sol_outlet.calc_boundary_state(solver,
+									sol_prim=sol_int.sol_prim[:, sol_domain.outlet_adj_idxs],
+									sol_cons=sol_int.sol_cons[:, sol_domain.outlet_adj_idxs])
 
 	sol_domain.fill_sol_full()  # fill sol_prim_full and sol_cons_full
 
@@ -51,7 +57,7 @@ def calc_rhs(sol_domain, solver):
 		sol_right.calc_state_from_prim(calc_r=True, calc_cp=True)
 
 	# compute fluxes
-	flux = calc_inv_flux(sol_domain, solver)
+	flux = calc_inv_flux(sol_domain, solver, time_integrator)
 	if (solver.visc_scheme > 0):
 		visc_flux = calc_visc_flux(sol_domain, solver)
 		flux -= visc_flux
@@ -68,9 +74,9 @@ def calc_rhs(sol_domain, solver):
 			sol_int.source[:, sol_domain.direct_samp_idxs]
 
 
-def calc_inv_flux(sol_domain, solver):
+def calc_inv_flux(sol_domain, solver, time_integrator):
 	"""
-	Compute inviscid fluxes
+	Compute inviscid fluxes, and maximum wave speed if time_integrator adapts dtau
 	"""
 
 	# TODO: generalize to other flux schemes, expand beyond Roe flux
@@ -138,11 +144,12 @@ def calc_inv_flux(sol_domain, solver):
 	flux_right[3:, :] = sol_cons_right[3:, :] * sol_prim_right[[1], :]
 
 	# Maximum wave speed for adapting dtau, if needed
-	# TODO: need to adaptively size this for hyper-reduction
-	if (sol_domain.time_integrator.adapt_dtau):
+	# only updated for sampled cells, from their left and right faces
+	if (time_integrator.adapt_dtau):
 		srf = np.maximum(sol_ave.sol_prim[1, :] + sol_ave.c,
 						sol_ave.sol_prim[1, :] - sol_ave.c)
-		sol_domain.sol_int.srf = np.maximum(srf[:-1], srf[1:])
+		sol_domain.sol_int.srf[sol_domain.direct_samp_idxs] = \
+			np.maximum(srf[sol_domain.flux_rhs_idxs], srf[sol_domain.flux_rhs_idxs + 1])
 
 	# Dissipation term
 	d_sol_prim = sol_prim_left - sol_prim_right
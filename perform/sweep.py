@@ -0,0 +1,238 @@
+import os
+import argparse
+import contextlib
+import itertools
+import multiprocessing
+import shutil
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import time
+
+import numpy as np
+
+import perform.constants as const
+from perform.input_funcs import read_input_file, catch_input, parse_line
+from perform.misc_funcs import blas_thread_env
+
+
+class SweepSolver:
+	"""
+	Container class for parametric sweep parameters
+	"""
+
+	def __init__(self, sweep_dir):
+
+		self.sweep_dir = sweep_dir
+		param_file = os.path.join(self.sweep_dir, const.SWEEP_INPUTS)
+		param_dict = read_input_file(param_file)
+		self.param_dict = param_dict
+
+		# base case, copied to every case working directory
+		self.base_dir = os.path.expanduser(str(param_dict["base_dir"]))
+		self.base_param_file = os.path.join(self.base_dir, const.PARAM_INPUTS)
+		assert (os.path.isfile(self.base_param_file)), \
+			"Could not find base case " + const.PARAM_INPUTS + " at " + self.base_param_file
+		self.base_rom_file = os.path.join(self.base_dir, const.ROM_INPUTS)
+
+		# parallelism
+		self.num_workers = catch_input(param_dict, "num_workers", 1)
+		self.blas_threads = catch_input(param_dict, "blas_threads", 1)
+		assert (self.num_workers > 0), "num_workers must be a positive integer"
+		assert (self.blas_threads > 0), "blas_threads must be a positive integer"
+
+		# count number of swept parameters
+		self.sweep_vars = []
+		self.sweep_vals = []
+		while ("sweep_var_" + str(len(self.sweep_vars) + 1)) in param_dict:
+			var_num = str(len(self.sweep_vars) + 1)
+			assert (("sweep_vals_" + var_num) in param_dict), \
+				"Must provide sweep_vals_" + var_num + " for sweep_var_" + var_num
+			self.sweep_vars.append(str(param_dict["sweep_var_" + var_num]))
+			self.sweep_vals.append(list(param_dict["sweep_vals_" + var_num]))
+		assert (len(self.sweep_vars) > 0), "Must provide at least one sweep_var_X"
+
+		# "grid" takes the Cartesian product of all sweep_vals_X,
+		# 	"list" takes the ith entry of every sweep_vals_X for the ith case
+		self.sweep_type = catch_input(param_dict, "sweep_type", "grid")
+		if self.sweep_type == "grid":
+			self.case_vals = list(itertools.product(*self.sweep_vals))
+		elif self.sweep_type == "list":
+			num_cases = len(self.sweep_vals[0])
+			for var_idx, vals in enumerate(self.sweep_vals):
+				assert (len(vals) == num_cases), \
+					("All sweep_vals_X must have the same length for sweep_type = \"list\" ("
+					+ self.sweep_vars[var_idx] + ": " + str(len(vals))
+					+ " != " + str(num_cases) + ")")
+			self.case_vals = list(zip(*self.sweep_vals))
+		else:
+			raise ValueError("Invalid choice of sweep_type: " + self.sweep_type)
+
+		self.num_cases = len(self.case_vals)
+		self.case_string = "case_%0" + str(len(str(self.num_cases))) + "d"
+		self.case_dirs = [None] * self.num_cases
+
+	def make_case_dirs(self):
+		"""
+		Materialize case working directories with overridden solver parameters
+		"""
+
+		for case_idx, vals in enumerate(self.case_vals):
+
+			case_dir = os.path.join(self.sweep_dir, self.case_string % (case_idx + 1))
+			if not os.path.isdir(case_dir):
+				os.mkdir(case_dir)
+
+			overrides = dict(zip(self.sweep_vars, vals))
+			# sweeps run headless
+			overrides["vis_show"] = False
+
+			write_param_file(self.base_param_file,
+							os.path.join(case_dir, const.PARAM_INPUTS),
+							overrides)
+			if os.path.isfile(self.base_rom_file):
+				shutil.copyfile(self.base_rom_file, os.path.join(case_dir, const.ROM_INPUTS))
+
+			self.case_dirs[case_idx] = case_dir
+
+	def run(self):
+		"""
+		Run all cases in a process pool, and write sweep summary
+		"""
+
+		self.make_case_dirs()
+
+		print("Running " + str(self.num_cases) + " cases on "
+				+ str(self.num_workers) + " workers")
+
+		results = [None] * self.num_cases
+		time_start = time()
+		mp_context = multiprocessing.get_context("spawn")
+		# workers are spawned as cases are submitted
+		with ProcessPoolExecutor(max_workers=self.num_workers, mp_context=mp_context) as executor:
+			with blas_thread_env(self.blas_threads):
+				futures = {executor.submit(run_case, case_dir): case_idx
+							for case_idx, case_dir in enumerate(self.case_dirs)}
+			for future in as_completed(futures):
+				case_idx = futures[future]
+				results[case_idx] = future.result()
+				print((self.case_string % (case_idx + 1)) + ": "
+						+ results[case_idx]["status"]
+						+ (" (%.4f s)" % results[case_idx]["runtime"]))
+
+		runtime = time() - time_start
+		print("Sweep finished in %.8f seconds" % runtime)
+
+		self.write_summary(results, runtime)
+
+		return results
+
+	def write_summary(self, results, runtime):
+		"""
+		Write per-case status and timing to ASCII file
+		"""
+
+		summary_file = os.path.join(self.sweep_dir, const.SWEEP_SUMMARY_FILE)
+		with open(summary_file, "w") as f:
+			f.write("# sweep wall time: %.8f s, workers: %i, blas_threads: %i\n"
+					% (runtime, self.num_workers, self.blas_threads))
+			f.write("# case status iters runtime " + " ".join(self.sweep_vars) + "\n")
+			for case_idx, result in enumerate(results):
+				val_strings = [format_param_value(val).replace(" ", "")
+								for val in self.case_vals[case_idx]]
+				f.write(("%s %s %i %18.8f " % (self.case_string % (case_idx + 1),
+						result["status"], result["iters"], result["runtime"]))
+						+ " ".join(val_strings) + "\n")
+
+
+def format_param_value(val):
+	"""
+	Format parameter value as text readable by read_input_file
+	"""
+
+	if isinstance(val, np.ndarray):
+		return repr(val.tolist())
+	elif isinstance(val, np.generic):
+		return repr(val.item())
+	else:
+		return repr(val)
+
+
+def write_param_file(base_file, out_file, overrides):
+	"""
+	Copy base input file, replacing or appending overridden parameters
+	"""
+
+	with open(base_file) as f:
+		contents = f.readlines()
+
+	written = set()
+	out_lines = []
+	for line in contents:
+		try:
+			key, _ = parse_line(line)
+		except Exception:
+			out_lines.append(line)
+			continue
+
+		if key in overrides:
+			out_lines.append(key + " = " + format_param_value(overrides[key]) + "\n")
+			written.add(key)
+		else:
+			out_lines.append(line)
+
+	if (len(out_lines) > 0) and (not out_lines[-1].endswith("\n")):
+		out_lines[-1] += "\n"
+	for key, val in overrides.items():
+		if key not in written:
+			out_lines.append(key + " = " + format_param_value(val) + "\n")
+
+	with open(out_file, "w") as f:
+		f.writelines(out_lines)
+
+
+def run_case(case_dir):
+	"""
+	Run a single sweep case, logging solver output to the case directory
+	"""
+
+	# imported here to avoid loading solver modules in the sweep parent process
+	from perform.driver import solve
+
+	result = {"status": "success", "iters": 0, "runtime": 0.0}
+	log_file = os.path.join(case_dir, const.SWEEP_LOG_FILE)
+	time_start = time()
+	with open(log_file, "w") as f, contextlib.redirect_stdout(f):
+		try:
+			solver = solve(case_dir)
+			result["iters"] = solver.iter
+			if solver.solve_failed:
+				result["status"] = "failed"
+		except Exception:
+			print(traceback.format_exc())
+			print("Execution failed")
+			result["status"] = "error"
+	result["runtime"] = time() - time_start
+
+	return result
+
+
+def main():
+
+	# Read sweep directory input
+	parser = argparse.ArgumentParser(description="Read sweep directory")
+	parser.add_argument('sweep_dir', type=str,
+						default="./", help="sweep directory, containing " + const.SWEEP_INPUTS)
+	sweep_dir = os.path.expanduser(parser.parse_args().sweep_dir)
+	assert (os.path.isdir(sweep_dir)), \
+		"Given sweep directory does not exist"
+
+	sweep = SweepSolver(sweep_dir)
+	sweep.run()
+
+
+if __name__ == "__main__":
+	try:
+		main()
+	except:
+		print(traceback.format_exc())
+		print("Execution failed")
@@ -14,27 +14,36 @@ class SystemSolver:
 	Container class for solver parameters
 	"""
 
-	def __init__(self, working_dir):
+	def __init__(self, working_dir, param_dict=None, mesh_dict=None):
 
-		# input parameters from solverParams.inp
+		# input parameters from solverParams.inp, if not provided
 		self.working_dir = working_dir
-		param_file = os.path.join(self.working_dir, const.PARAM_INPUTS)
-		param_dict = read_input_file(param_file)
+		if param_dict is None:
+			param_file = os.path.join(self.working_dir, const.PARAM_INPUTS)
+			param_dict = read_input_file(param_file)
 		self.param_dict = param_dict
 
 		# Make output directories
-		self.unsteady_output_dir = mkdir_shallow(self.working_dir,
-												const.UNSTEADY_OUTPUT_DIR_NAME)
-		self.probe_output_dir = mkdir_shallow(self.working_dir,
-												const.PROBE_OUTPUT_DIR_NAME)
-		self.image_output_dir = mkdir_shallow(self.working_dir,
-												const.IMAGE_OUTPUT_DIR_NAME)
-		self.restart_output_dir = mkdir_shallow(self.working_dir,
-												const.RESTART_OUTPUT_DIR_NAME)
+		# no working directory is given for in-memory simulations
+		if self.working_dir is not None:
+			self.unsteady_output_dir = mkdir_shallow(self.working_dir,
+													const.UNSTEADY_OUTPUT_DIR_NAME)
+			self.probe_output_dir = mkdir_shallow(self.working_dir,
+													const.PROBE_OUTPUT_DIR_NAME)
+			self.image_output_dir = mkdir_shallow(self.working_dir,
+													const.IMAGE_OUTPUT_DIR_NAME)
+			self.restart_output_dir = mkdir_shallow(self.working_dir,
+													const.RESTART_OUTPUT_DIR_NAME)
+		else:
+			self.unsteady_output_dir = None
+			self.probe_output_dir = None
+			self.image_output_dir = None
+			self.restart_output_dir = None
 
 		# spatial domain
-		mesh_file = str(param_dict["mesh_file"])
-		mesh_dict = read_input_file(mesh_file)
+		if mesh_dict is None:
+			mesh_file = str(param_dict["mesh_file"])
+			mesh_dict = read_input_file(mesh_file)
 		self.mesh = Mesh(mesh_dict)
 
 		# initial condition file
@@ -71,8 +80,8 @@ class SystemSolver:
 			self.restart_iter = 1
 		self.init_from_restart = catch_input(param_dict, "init_from_restart", False)
 
-		if (self.init_file is None) and (not self.init_from_restart):
-			self.ic_params_file = str(param_dict["ic_params_file"])
+		# not required if initial condition is provided directly
+		self.ic_params_file = catch_input(param_dict, "ic_params_file", None)
 
 		# unsteady output
 		self.out_interval = catch_input(param_dict, "out_interval", 1)
@@ -84,10 +93,23 @@ class SystemSolver:
 		assert (self.out_interval > 0), "out_interval must be a positive integer"
 		self.num_snaps = int(self.num_steps / self.out_interval)
 
+		# POD basis accumulated from snapshots during the run
+		self.pod_out = catch_input(param_dict, "pod_out", False)
+		if self.pod_out:
+			self.pod_var_type = catch_input(param_dict, "pod_var_type", "cons")
+			assert (self.pod_var_type in ["prim", "cons"]), \
+				"pod_var_type must be \"prim\" or \"cons\""
+			self.pod_var_idxs = catch_input(param_dict, "pod_var_idxs", None)
+			self.pod_cent_type = catch_input(param_dict, "pod_cent_type", "initCond")
+			self.pod_norm_type = catch_input(param_dict, "pod_norm_type", "l2")
+			self.pod_max_modes = catch_input(param_dict, "pod_max_modes", const.POD_MAX_MODES_DEFAULT)
+			self.pod_block_size = catch_input(param_dict, "pod_block_size", const.POD_BLOCK_SIZE_DEFAULT)
+
 		# misc
 		self.vel_add = catch_input(param_dict, "vel_add", 0.0)
 		self.res_norm_prim = catch_input(param_dict, "res_norm_prim", [None])
 		self.source_on = catch_input(param_dict, "source_on", True)
+		self.verbose = catch_input(param_dict, "verbose", True)
 		self.solve_failed = False
 
 		# visualization
@@ -101,3 +123,30 @@ class SystemSolver:
 		else:
 			self.sim_type = "ROM"
 			self.rom_inputs = os.path.join(self.working_dir, const.ROM_INPUTS)
+
+		# ensemble members, advanced simultaneously
+		# ensemble_vals_X holds one boundary parameter value per member
+		self.ensemble_vars = []
+		self.ensemble_vals = {}
+		while ("ensemble_var_" + str(len(self.ensemble_vars) + 1)) in param_dict:
+			var_num = str(len(self.ensemble_vars) + 1)
+			assert (("ensemble_vals_" + var_num) in param_dict), \
+				"Must provide ensemble_vals_" + var_num + " for ensemble_var_" + var_num
+			var_name = str(param_dict["ensemble_var_" + var_num])
+			assert (var_name in const.ENSEMBLE_VARS), \
+				("Invalid ensemble_var_" + var_num + ": " + var_name
+				+ ", must be one of " + str(const.ENSEMBLE_VARS))
+			self.ensemble_vars.append(var_name)
+			self.ensemble_vals[var_name] = \
+				np.asarray(param_dict["ensemble_vals_" + var_num], dtype=const.REAL_TYPE)
+
+		if len(self.ensemble_vars) > 0:
+			self.num_members = self.ensemble_vals[self.ensemble_vars[0]].shape[0]
+			for var_name in self.ensemble_vars:
+				assert (self.ensemble_vals[var_name].shape[0] == self.num_members), \
+					("All ensemble_vals_X must have the same length ("
+					+ var_name + ": " + str(self.ensemble_vals[var_name].shape[0])
+					+ " != " + str(self.num_members) + ")")
+			assert (not self.calc_rom), "Ensemble runs are not supported for ROMs"
+		else:
+			self.num_members = 1
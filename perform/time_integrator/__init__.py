@@ -6,6 +6,9 @@ from perform.time_integrator.explicit_integrator import (
 from perform.time_integrator.implicit_integrator import (
 	BDF
 )
+from perform.time_integrator.exponential_integrator import (
+	ExpRosenbrockEuler
+)
 
 
 def get_time_integrator(time_scheme, param_dict):
@@ -21,6 +24,8 @@ def get_time_integrator(time_scheme, param_dict):
 		time_integrator = SSPRK3(param_dict)
 	elif (time_scheme == "jameson_low_store"):
 		time_integrator = JamesonLowStore(param_dict)
+	elif (time_scheme == "exp_euler"):
+		time_integrator = ExpRosenbrockEuler(param_dict)
 	else:
 		raise ValueError("Invalid choice of time_scheme: " + time_scheme)
 
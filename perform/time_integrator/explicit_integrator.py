@@ -157,10 +157,3 @@ class JamesonLowStore(RKExplicit):
 		self.rk_c_vals = np.zeros(time_order, dtype=REAL_TYPE)
 
 # ----- End Runge-Kutta integrators -----
-
-# TODO: Add "integrator" for ROM models that just
-# 	update from one state to the next,
-# 	presumably calls some generic update method.
-# 	This way, can still have a code history for
-# 	methods that need the history but don't
-# 	need numerical time integration (e.g. TCN)
@@ -0,0 +1,56 @@
+import time
+
+import numpy as np
+from scipy.linalg import expm
+
+from perform.constants import REAL_TYPE
+from perform.time_integrator.time_integrator import TimeIntegrator
+
+
+class ExponentialIntegrator(TimeIntegrator):
+	"""
+	Base class for exponential time integrators
+
+	Integrates a linearization of the RHS exactly, and requires the RHS Jacobian
+	Only intended for low-dimensional systems, for which the matrix exponential is cheap
+	"""
+
+	def __init__(self, param_dict):
+
+		super().__init__(param_dict)
+
+		self.time_type = "exponential"
+		self.dual_time = False
+		self.adapt_dtau = False
+
+
+class ExpRosenbrockEuler(ExponentialIntegrator):
+	"""
+	Exponential Rosenbrock-Euler scheme, u_{n+1} = u_n + dt * phi_1(dt * J_n) * f(u_n)
+	Exact for linear systems, and second-order accurate otherwise
+	"""
+
+	def __init__(self, param_dict):
+
+		self.subiter_max = 1
+
+		super().__init__(param_dict)
+
+		if (self.time_order != 2):
+			print("exp_euler is second-order accurate, "
+					+ "but you set time_order = " + str(self.time_order))
+			print("Continuing, set time_order = 2 to get rid of this warning")
+			time.sleep(0.5)
+
+	def solve_sol_change(self, rhs, rhs_jacob):
+		"""
+		Change in solution, from the matrix exponential of the augmented matrix
+		dt * [[J, f], [0, 0]], whose last column holds dt * phi_1(dt * J) * f
+		"""
+
+		dim = rhs.shape[0]
+		aug_mat = np.zeros((dim + 1, dim + 1), dtype=REAL_TYPE)
+		aug_mat[:dim, :dim] = rhs_jacob
+		aug_mat[:dim, dim] = rhs
+
+		return expm(self.dt * aug_mat)[:dim, dim]
@@ -45,9 +45,10 @@ class ProbePlot(Visualization):
 		for vis_var in self.vis_vars:
 			assert (vis_var in probe_vars), "Must probe " + vis_var + " to plot it"
 
-	def plot(self, probe_vals, time_vals, iter_num, line_style, first_plot):
+	def plot(self, probe_hist, line_style, first_plot):
 		"""
 		Draw and display probe plot
+		probe_hist is the time history of this probe, with time in the first row
 		Since shape of plotted data changes every time, can't use set_data
 		As a result, probe plotting can be pretty slow
 		"""
@@ -74,8 +75,8 @@ class ProbePlot(Visualization):
 
 				ax_var.cla()
 
-				y_data = self.getYData(probe_vals, self.vis_vars[lin_idx], iter_num)
-				x_data = time_vals[:iter_num]
+				y_data = self.getYData(probe_hist, self.vis_vars[lin_idx])
+				x_data = probe_hist[0, :]
 
 				self.ax_line[lin_idx], = ax_var.plot(x_data, y_data, line_style)
 
@@ -89,11 +90,11 @@ class ProbePlot(Visualization):
 			self.fig.tight_layout()
 		self.fig.canvas.draw()
 
-	def getYData(self, probe_vals, var_str, iter_num):
+	def getYData(self, probe_hist, var_str):
 
-		# data extraction of probes is done in solDomain
+		# data extraction of probes is done in ProbeMonitor
 		var_idx = np.squeeze(np.argwhere(self.probe_vars == var_str)[0])
-		y_data = probe_vals[self.probe_num, var_idx, :iter_num]
+		y_data = probe_hist[var_idx + 1, :]
 
 		return y_data
 
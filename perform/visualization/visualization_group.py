@@ -108,12 +108,16 @@ class VisualizationGroup:
 
 				# draw and save plots
 				if vis.vis_type == "field":
-					vis.plot(sol_domain.sol_int.sol_prim, sol_domain.sol_int.sol_cons,
-							sol_domain.sol_int.source, sol_domain.sol_int.rhs,
+					# only first member is plotted for ensemble runs
+					num_cells = solver.mesh.num_cells
+					vis.plot(sol_domain.sol_int.sol_prim[:, :num_cells],
+							sol_domain.sol_int.sol_cons[:, :num_cells],
+							sol_domain.sol_int.source[:, :num_cells],
+							sol_domain.sol_int.rhs[:, :num_cells],
 							sol_domain.gas_model, solver.mesh.x_cell, 'b-', first_plot)
 				elif vis.vis_type == "probe":
-					vis.plot(sol_domain.probe_vals, sol_domain.time_vals,
-							solver.iter, 'b-', first_plot)
+					probe_hist = sol_domain.probe_monitor.get_probe_history(vis.probe_num)
+					vis.plot(probe_hist, 'b-', first_plot)
 				else:
 					raise ValueError("Invalid vis_type:" + str(vis.vis_type))
 				if self.vis_save:
@@ -122,6 +126,17 @@ class VisualizationGroup:
 				if self.vis_show:
 					vis.fig.canvas.flush_events()
 
+	def close_plots(self):
+		"""
+		Close all figures, so that figure numbers can be reused by later runs
+		"""
+
+		if not self.vis_draw:
+			return
+
+		for vis in self.vis_list:
+			plt.close(vis.fig)
+
 	# def movePlots(self):
 	# 	"""
 	# 	Resizes and moves plots to positions in the window for better viewing
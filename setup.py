@@ -16,6 +16,8 @@ setup(
 	long_description = readme,
 	license = license,
 	install_requires = ['numpy', 'scipy', 'matplotlib'],
-	entry_points = {'console_scripts': ['perform = perform.driver:main']},
+	entry_points = {'console_scripts': ['perform = perform.driver:main',
+										'perform-sweep = perform.sweep:main',
+										'perform-parallel = perform.decomposition:main']},
 	python_requires = ">=3.6",
 )
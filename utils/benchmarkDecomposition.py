@@ -0,0 +1,96 @@
+import numpy as np
+import os
+import warnings
+
+import perform.constants as const
+from perform.input_funcs import read_input_file
+from perform.system_solver import SystemSolver
+from perform.solution.solution_domain import SolutionDomain
+from perform.decomposition import DomainDecomposition, solve_decomposed
+
+##### BEGIN USER INPUT #####
+
+workingDir 		= "~/path/to/working/dir"	# explicit time integrator, no probes or restart files
+numSubdomains 	= [1, 2, 4, 8, 16, 32]		# first entry is the reference for speedup/efficiency
+numRepeats 		= 3							# fastest of numRepeats runs is reported
+
+# before timing, final decomposed solutions are checked against the serial solution
+# 	with these solver_params.inp overrides, e.g. bulk velocity or boundary perturbations
+checkParams 	= {"vel_add": 10.0}
+checkTol 		= 1.0e-12					# maximum difference in conservative state, relative to max. of each variable
+
+outFile 		= "scaling_decomposition.dat"	# written to workingDir
+
+##### END USER INPUT #####
+
+workingDir = os.path.expanduser(workingDir)
+
+def solveFinal(numSub):
+	"""
+	Final conservative state with checkParams overrides, serial if numSub is None
+	"""
+
+	paramDict = read_input_file(os.path.join(workingDir, const.PARAM_INPUTS))
+	paramDict.update(checkParams)
+
+	with warnings.catch_warnings():
+		warnings.filterwarnings("error")
+
+		solver = SystemSolver(workingDir, param_dict=paramDict)
+		solDomain = SolutionDomain(solver)
+
+		if numSub is None:
+			for solver.iter in range(1, solver.num_steps + 1):
+				solDomain.advance_iter(solver)
+				solver.time_iter += 1
+				solver.sol_time += solver.dt
+		else:
+			DomainDecomposition(solDomain, solver, numSub).run()
+			assert (not solver.solve_failed), "Check solve failed for " + str(numSub) + " subdomains"
+
+	return solDomain.sol_int.sol_cons.copy()
+
+def main():
+
+	numCPUs = os.cpu_count()
+	if max(numSubdomains) > numCPUs:
+		print("WARNING: only " + str(numCPUs) + " CPUs available, "
+				+ "results for more subdomains will be oversubscribed")
+
+	# decomposed and serial solutions must agree
+	solSerial = solveFinal(None)
+	for numSub in numSubdomains:
+		relDiff = np.amax(np.amax(np.abs(solveFinal(numSub) - solSerial), axis=1)
+							/ np.amax(np.abs(solSerial), axis=1))
+		print("%i subdomains, max. relative difference from serial: %.4e" % (numSub, relDiff))
+		assert (relDiff <= checkTol), \
+			("Decomposed solution with " + str(numSub) + " subdomains differs from serial solution ("
+			+ str(relDiff) + " > " + str(checkTol) + ")")
+
+	# time stepping wall time, excluding process startup and setup
+	runtimes = np.zeros(len(numSubdomains), dtype=np.float64)
+	for countIdx, numSub in enumerate(numSubdomains):
+		runtimeRepeats = np.zeros(numRepeats, dtype=np.float64)
+		for repeatIdx in range(numRepeats):
+			solver, runtimeRepeats[repeatIdx] = solve_decomposed(workingDir, numSub)
+			assert (not solver.solve_failed), "Solve failed for " + str(numSub) + " subdomains"
+		runtimes[countIdx] = np.amin(runtimeRepeats)
+
+	# strong scaling relative to first entry
+	speedup = runtimes[0] / runtimes
+	efficiency = speedup * numSubdomains[0] / np.array(numSubdomains, dtype=np.float64)
+
+	header = "%12s %18s %12s %12s" % ("subdomains", "runtime (s)", "speedup", "efficiency")
+	print(header)
+	with open(os.path.join(workingDir, outFile), "w") as f:
+		f.write("# cells: " + str(solver.mesh.num_cells) + ", steps: " + str(solver.num_steps)
+				+ ", CPUs: " + str(numCPUs) + "\n")
+		f.write("#" + header[1:] + "\n")
+		for countIdx, numSub in enumerate(numSubdomains):
+			line = "%12i %18.8f %12.4f %12.4f" % (numSub, runtimes[countIdx],
+												speedup[countIdx], efficiency[countIdx])
+			print(line)
+			f.write(line + "\n")
+
+if __name__ == "__main__":
+	main()
@@ -3,10 +3,12 @@ from numpy.linalg import svd
 import pdb
 import os
 
+from perform.rom.pod_funcs import randomized_svd, IncrementalSVD, get_col_chunks, calc_pod_multi_run
+
 ##### BEGIN USER INPUT #####
 
 dataDir 	= "~/path/to/data/dir"
-dataFile 	= "solCons_FOM.npy"
+dataFile 	= "solCons_FOM.npy"	# may be a list of files from several runs for svdType = "tsqr"
 iterStart 	= 0 		# zero-indexed starting index for snapshot array
 iterEnd 	= 700		# zero-indexed ending index for snapshot array
 iterSkip 	= 1
@@ -19,6 +21,18 @@ varIdxs 	= [[0],[1],[2],[3]]
 
 maxModes 	= 700
 
+# "full" loads all snapshots of a group and computes the exact SVD
+# "randomized" and "incremental" read chunkSize snapshots at a time,
+# 	and only hold O(nCells * maxModes) arrays in memory
+# "tsqr" computes the exact SVD of snapshots from all runs in dataFile,
+# 	loading one run and group at a time in each of numProcs worker processes
+svdType 	= "full"		# accepts "full", "randomized", "incremental", and "tsqr"
+chunkSize 	= 100			# snapshots per chunk for "randomized" and "incremental"
+oversamp 	= 10			# oversampling modes for "randomized"
+powerIters 	= 2				# power iterations for "randomized"
+numProcs 	= 1				# worker processes for "tsqr"
+blasThreads = 1				# BLAS threads per worker process for "tsqr"
+
 writeRightEvecs = False
 
 basisOutDir = "podData_prim_press_vel_temp_mf_samp1"
@@ -30,52 +44,98 @@ if not os.path.isdir(outDir): os.mkdir(outDir)
 
 def main():
 
-	# load data
+	# all runs and groups are decomposed together
+	if (svdType == "tsqr"):
+		if isinstance(dataFile, str):
+			dataFiles = [dataFile]
+		else:
+			dataFiles = dataFile
+		inFiles = [os.path.join(os.path.expanduser(dataDir), runFile) for runFile in dataFiles]
+		results = calc_pod_multi_run(inFiles, varIdxs, maxModes, cent_type=centType, norm_type=normType,
+									snap_slice=slice(iterStart, iterEnd+1, iterSkip),
+									num_procs=numProcs, blas_threads=blasThreads)
+		for varIdxList, (basis, s, centProf, normSubProf, normFacProf) in zip(varIdxs, results):
+			saveData(varIdxList, centProf, normSubProf, normFacProf, basis, s)
+
+		print("POD basis generated!")
+		return
+
+	# memory-map data, snapshots are only read from disk when needed
 	inFile = os.path.join(dataDir, dataFile)
-	snapArr = np.load(inFile)
+	snapArr = np.load(inFile, mmap_mode="r")
 	snapArr = snapArr[:,:,iterStart:iterEnd+1:iterSkip] 	# subsample
 	nVarsTot, nCells, nSnaps = snapArr.shape
 
 	# loop through groups
 	for groupIdx, varIdxList in enumerate(varIdxs):
 
-		groupArr = snapArr[varIdxList,:,:]	# break data array into different variable groups
-		nVars = groupArr.shape[0]
-
-		# center and normalize data 
-		groupArr, centProf = centerData(groupArr)
-		groupArr, normSubProf, normFacProf = normalizeData(groupArr)		
-
+		nVars = len(varIdxList)
 		minDim = min(nCells*nVars, nSnaps)
 		modesOut = min(minDim, maxModes)
 
-		# compute SVD 
-		groupArr = np.reshape(groupArr, (-1, groupArr.shape[-1]), order="C")
-		U, s, VT = svd(groupArr)
+		if (svdType == "full"):
+			groupArr = np.array(snapArr[varIdxList,:,:])	# break data array into different variable groups
+
+			# center and normalize data 
+			groupArr, centProf = centerData(groupArr)
+			groupArr, normSubProf, normFacProf = normalizeData(groupArr)		
+
+			# compute SVD 
+			groupArr = np.reshape(groupArr, (-1, groupArr.shape[-1]), order="C")
+			U, s, VT = svd(groupArr, full_matrices=False)
+
+		else:
+			centProf, normSubProf, normFacProf = calcStandardizationChunked(snapArr, varIdxList)
+
+			# centered and normalized snapshots start:end of group
+			def getChunk(start, end):
+				groupArr = np.array(snapArr[varIdxList,:,start:end], dtype=np.float64)
+				groupArr = (groupArr - centProf[:,:,None] - normSubProf[:,:,None]) / normFacProf[:,:,None]
+				return np.reshape(groupArr, (-1, end - start), order="C")
+
+			if (svdType == "randomized"):
+				U, s = randomized_svd(getChunk, nVars*nCells, nSnaps, modesOut, chunk_size=chunkSize,
+										oversamp=oversamp, num_power_iters=powerIters)
+
+			elif (svdType == "incremental"):
+				incSVD = IncrementalSVD(modesOut)
+				for start, end in get_col_chunks(nSnaps, chunkSize):
+					incSVD.update(getChunk(start, end))
+				U, s = incSVD.basis, incSVD.sing_vals
+
+			else:
+				raise ValueError("Invalid svdType input: "+str(svdType))
+
 		U = np.reshape(U, (nVars, nCells, U.shape[-1]), order="C")
 		basis = U[:,:,:modesOut] # truncate modes
 
-		# suffix for output files
-		suffix = ""
-		for varIdx in varIdxList:
-			suffix += "_" + str(varIdx)
-		suffix += ".npy"	
-
-		# save data to disk
-		centFile 		= os.path.join(outDir, "centProf")
-		normSubFile 	= os.path.join(outDir, "normSubProf")
-		normFacFile 	= os.path.join(outDir, "normFacProf")
-		spatialModeFile = os.path.join(outDir, "spatialModes")
-		singValsFile	= os.path.join(outDir, "singularValues")
-
-		np.save(centFile+suffix, centProf)
-		np.save(normSubFile+suffix, normSubProf)
-		np.save(normFacFile+suffix, normFacProf)
-		np.save(spatialModeFile+suffix, basis)
-		np.save(singValsFile+suffix, s)
+		saveData(varIdxList, centProf, normSubProf, normFacProf, basis, s)
 
 	print("POD basis generated!")
 
+# save POD data of a group to disk
+def saveData(varIdxList, centProf, normSubProf, normFacProf, basis, s):
+
+	# suffix for output files
+	suffix = ""
+	for varIdx in varIdxList:
+		suffix += "_" + str(varIdx)
+	suffix += ".npy"	
+
+	# save data to disk
+	centFile 		= os.path.join(outDir, "centProf")
+	normSubFile 	= os.path.join(outDir, "normSubProf")
+	normFacFile 	= os.path.join(outDir, "normFacProf")
+	spatialModeFile = os.path.join(outDir, "spatialModes")
+	singValsFile	= os.path.join(outDir, "singularValues")
+
+	np.save(centFile+suffix, centProf)
+	np.save(normSubFile+suffix, normSubProf)
+	np.save(normFacFile+suffix, normFacProf)
+	np.save(spatialModeFile+suffix, basis)
+	np.save(singValsFile+suffix, s)
+
+
 # center training data
 def centerData(dataArr):
 
@@ -95,6 +155,55 @@ def centerData(dataArr):
 	return dataArr, np.squeeze(centProf, axis=-1)
 
 
+# compute centering and normalization profiles, reading snapArr in chunks
+def calcStandardizationChunked(snapArr, varIdxList):
+
+	nSnaps = snapArr.shape[-1]
+	nCells = snapArr.shape[1]
+	chunks = get_col_chunks(nSnaps, chunkSize)
+
+	# center around the initial condition
+	if (centType == "initCond"):
+		centProf = np.array(snapArr[varIdxList,:,0], dtype=np.float64)
+
+	# center around the sample mean
+	elif (centType == "mean"):
+		centProf = np.zeros((len(varIdxList), nCells), dtype=np.float64)
+		for start, end in chunks:
+			centProf += np.sum(snapArr[varIdxList,:,start:end], axis=2)
+		centProf /= nSnaps
+
+	else:
+		raise ValueError("Invalid centType input: "+str(centType))
+
+	onesProf = np.ones((len(varIdxList), nCells), dtype = np.float64)
+
+	# normalize by  (X - min(X)) / (max(X) - min(X)) 
+	if (normType == "minmax"):
+		minVals = np.full(len(varIdxList), np.inf)
+		maxVals = np.full(len(varIdxList), -np.inf)
+		for start, end in chunks:
+			chunk = snapArr[varIdxList,:,start:end] - centProf[:,:,None]
+			minVals = np.minimum(minVals, np.amin(chunk, axis=(1,2)))
+			maxVals = np.maximum(maxVals, np.amax(chunk, axis=(1,2)))
+		normSubProf = minVals[:,None] * onesProf
+		normFacProf = (maxVals - minVals)[:,None] * onesProf
+
+	# normalize by L2 norm sqaured of each variable
+	elif (normType == "l2"):
+		sumSq = np.zeros(len(varIdxList), dtype=np.float64)
+		for start, end in chunks:
+			chunk = snapArr[varIdxList,:,start:end] - centProf[:,:,None]
+			sumSq += np.sum(np.square(chunk), axis=(1,2))
+		normFacProf = (sumSq / (nCells * nSnaps))[:,None] * onesProf
+		normSubProf = 0.0 * onesProf
+
+	else: 
+		raise ValueError("Invalid normType input: "+str(normType))
+
+	return centProf, normSubProf, normFacProf
+
+
 # normalize training data
 def normalizeData(dataArr):
 
@@ -0,0 +1,137 @@
+import numpy as np
+from scipy.integrate import solve_ivp
+import os
+
+from perform.rom.reduced_op_funcs import fit_reduced_ops, expand_quad_op, calc_reduced_rhs
+
+##### BEGIN USER INPUT #####
+
+dataDir 	= "~/path/to/data/dir"
+dataFile 	= "solCons_FOM.npy"
+rhsFile 	= ""		# "solRHS_FOM.npy" to fit to RHS snapshots, "" to use finite differences of dataFile
+iterStart 	= 0 		# zero-indexed starting index for snapshot array
+iterEnd 	= 700		# zero-indexed ending index for snapshot array
+iterSkip 	= 1
+snapDt 		= 1.0e-8	# physical time between snapshots in dataFile, i.e. dt * out_interval
+
+# "continuous" fits dq/dt = c + A * q + H * (q x q), for linear_galerkin_proj with reduced_ops = True
+# "dmd" fits q_{n+1} = c + A * q_n, for linear_dmd
+# "quad_reg" fits q_{n+1} - q_n = c + A * q_n + H * (q_n x q_n), for linear_quad_reg
+# discrete operators ("dmd", "quad_reg") advance one snapshot interval, which must equal the ROM dt
+opType 		= "continuous"
+
+# POD data of the conservative variables generated by genPODBasis.py
+podDir 		= "~/path/to/data/dir/podData_cons"
+varIdxs 	= [0,1,2,3]		# must include all variables, as a single model is required
+latentDim 	= 10
+
+# Tikhonov regularization weights of the linear and quadratic operators (regQuad unused for "dmd")
+# every pair is tried, and the operators which best reproduce the training trajectory are kept
+# weights scale with the squared magnitude of the codes, so wide ranges are recommended
+regLin 		= [1.0e-2, 1.0e0, 1.0e2, 1.0e4, 1.0e6]
+regQuad 	= [1.0e2, 1.0e4, 1.0e6, 1.0e8, 1.0e10]
+
+outFile 	= "reducedOps.npz"		# saved in podDir, use as reduced_ops_files entry of rom_params.inp
+
+##### END USER INPUT #####
+
+def main():
+
+	dataPath = os.path.expanduser(dataDir)
+	podPath = os.path.expanduser(podDir)
+
+	# load POD data
+	suffix = ""
+	for varIdx in varIdxs:
+		suffix += "_" + str(varIdx)
+	suffix += ".npy"
+	basis = np.load(os.path.join(podPath, "spatialModes" + suffix))[:,:,:latentDim]
+	centProf = np.load(os.path.join(podPath, "centProf" + suffix))
+	normSubProf = np.load(os.path.join(podPath, "normSubProf" + suffix))
+	normFacProf = np.load(os.path.join(podPath, "normFacProf" + suffix))
+	assert (basis.shape[-1] == latentDim), "Basis has fewer than latentDim modes"
+	basis = np.reshape(basis, (-1, latentDim), order="C")
+
+	# project snapshots onto basis, as done by linear ROMs
+	snapArr = np.load(os.path.join(dataPath, dataFile), mmap_mode="r")
+	snapArr = np.array(snapArr[varIdxs,:,iterStart:iterEnd+1:iterSkip], dtype=np.float64)
+	snapArr = (snapArr - centProf[:,:,None] - normSubProf[:,:,None]) / normFacProf[:,:,None]
+	codes = basis.T @ np.reshape(snapArr, (-1, snapArr.shape[-1]), order="C")
+
+	assert (opType in ["continuous", "dmd", "quad_reg"]), "Invalid opType input: "+str(opType)
+	if (opType == "dmd"):
+		regQuadVals = [0.0]
+	else:
+		regQuadVals = regQuad
+
+	# regression targets: next codes, code increments, or time derivatives of codes
+	if (opType == "dmd"):
+		targets = codes[:,1:]
+		codes = codes[:,:-1]
+	elif (opType == "quad_reg"):
+		targets = codes[:,1:] - codes[:,:-1]
+		codes = codes[:,:-1]
+	elif (rhsFile == ""):
+		targets = np.gradient(codes, snapDt * iterSkip, axis=1, edge_order=2)
+	else:
+		# RHS snapshots do not include the RHS of the final snapshot
+		rhsArr = np.load(os.path.join(dataPath, rhsFile), mmap_mode="r")
+		rhsArr = np.array(rhsArr[varIdxs,:,iterStart:iterEnd+1:iterSkip], dtype=np.float64)
+		rhsArr = rhsArr / normFacProf[:,:,None]
+		targets = basis.T @ np.reshape(rhsArr, (-1, rhsArr.shape[-1]), order="C")
+		codes = codes[:,:targets.shape[-1]]
+
+	# select regularization by integrating reduced model over training snapshots
+	times = np.arange(codes.shape[-1]) * snapDt * iterSkip
+	bestErr = np.inf
+	for regLinVal in regLin:
+		for regQuadVal in regQuadVals:
+			ops = fit_reduced_ops(codes, targets, reg_lin=regLinVal, reg_quad=regQuadVal,
+									const=True, quad=(opType != "dmd"))
+			stateErr = calcStateErr(ops, codes, times)
+			print("regLin = %.2e, regQuad = %.2e: relative state error %.6e" % (regLinVal, regQuadVal, stateErr))
+			if (stateErr < bestErr):
+				bestErr, bestOps, bestRegs = stateErr, ops, (regLinVal, regQuadVal)
+
+	assert np.isfinite(bestErr), "Reduced model is unstable for all regularization weights, try larger weights"
+	print("Selected regLin = %.2e, regQuad = %.2e" % bestRegs)
+	constOp, linOp, quadOp = bestOps
+
+	np.savez(os.path.join(podPath, outFile), op_type=opType, dt=snapDt * iterSkip,
+				const_op=constOp, lin_op=linOp, quad_op=quadOp)
+
+	print("Reduced operators generated!")
+
+
+# relative error of reduced model trajectory w.r.t. projected snapshots, inf if integration fails
+def calcStateErr(ops, codes, times):
+
+	constOp, linOp, quadOp = ops
+	quadTens = expand_quad_op(quadOp)
+
+	def calcRHS(t, code):
+		return calc_reduced_rhs(code, constOp, linOp, quadTens)[0]
+
+	with np.errstate(all="ignore"):
+		# discrete operators are applied once per snapshot
+		if (opType == "continuous"):
+			sol = solve_ivp(calcRHS, (times[0], times[-1]), codes[:,0], t_eval=times, method="BDF", rtol=1.0e-6)
+			if not sol.success:
+				return np.inf
+			codesPred = sol.y
+		else:
+			codesPred = np.zeros(codes.shape, dtype=np.float64)
+			codesPred[:,0] = codes[:,0]
+			for snapIdx in range(1, codes.shape[-1]):
+				if (opType == "dmd"):
+					codesPred[:,snapIdx] = constOp + linOp @ codesPred[:,snapIdx-1]
+				else:
+					codesPred[:,snapIdx] = codesPred[:,snapIdx-1] + calcRHS(0.0, codesPred[:,snapIdx-1])
+
+		if not np.all(np.isfinite(codesPred)):
+			return np.inf
+		return np.linalg.norm(codesPred - codes) / np.linalg.norm(codes - codes[:,[0]])
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,93 @@
+import numpy as np
+import os
+
+from perform.rom.hyper_reduc_funcs import calc_hyper_reduc_basis, select_samp_cells_qdeim, \
+	select_samp_cells_greedy, add_samp_neighbors
+
+##### BEGIN USER INPUT #####
+
+dataDir 	= "~/path/to/data/dir"
+dataFile 	= "solRHS_FOM.npy"		# RHS snapshots, written with rhsOut = True
+iterStart 	= 0 		# zero-indexed starting index for snapshot array
+iterEnd 	= 700		# zero-indexed ending index for snapshot array
+iterSkip 	= 1
+
+# zero-indexed list of lists for group variables, should match model_var_idxs
+varIdxs 	= [[0,1,2,3]]
+
+# conservative normalization profiles (normFacProf from genPODBasis.py), one per group
+# RHS is scaled by these in the ROM, leave as "" to not normalize
+normFacFiles = ["~/path/to/podData/normFacProf_0_1_2_3.npy"]
+
+hyperReducDim 	= 100		# number of hyper-reduction modes for each group
+numSampCells 	= 200		# total number of sampled cells
+
+sampMethod 		= "qdeim"	# accepts "qdeim" (Q-DEIM cells, then greedy oversampling) and "greedy"
+numNeighbors 	= 0			# number of neighboring cells to add on either side of each sample
+addBoundCells 	= True		# always sample cells adjacent to the inlet and outlet
+
+sampOutDir = "sampData"
+
+##### END USER INPUT #####
+
+dataDir = os.path.expanduser(dataDir)
+outDir = os.path.join(dataDir, sampOutDir)
+if not os.path.isdir(outDir): os.mkdir(outDir)
+
+def main():
+
+	# load data
+	inFile = os.path.join(dataDir, dataFile)
+	snapArr = np.load(inFile)
+	snapArr = snapArr[:,:,iterStart:iterEnd+1:iterSkip] 	# subsample
+	nVarsTot, nCells, nSnaps = snapArr.shape
+
+	# compute hyper-reduction basis for each group
+	groupBases = []
+	for groupIdx, varIdxList in enumerate(varIdxs):
+
+		if normFacFiles[groupIdx] == "":
+			normFacProf = None
+		else:
+			normFacProf = np.load(os.path.expanduser(normFacFiles[groupIdx]))
+
+		basis, s = calc_hyper_reduc_basis(snapArr[varIdxList,:,:], norm_fac_prof=normFacProf,
+											max_modes=hyperReducDim)
+		groupBases.append(basis)
+
+		# suffix for output files
+		suffix = ""
+		for varIdx in varIdxList:
+			suffix += "_" + str(varIdx)
+		suffix += ".npy"
+
+		np.save(os.path.join(outDir, "hyperReducBasis" + suffix), basis)
+		np.save(os.path.join(outDir, "hyperReducSingularValues" + suffix), s)
+
+	# samples are shared by all groups, select from block-diagonal basis of all groups
+	numModesTot = sum([basis.shape[-1] for basis in groupBases])
+	fullBasis = np.zeros((nVarsTot, nCells, numModesTot), dtype=np.float64)
+	modeStart = 0
+	for groupIdx, varIdxList in enumerate(varIdxs):
+		modeEnd = modeStart + groupBases[groupIdx].shape[-1]
+		fullBasis[varIdxList, :, modeStart:modeEnd] = groupBases[groupIdx]
+		modeStart = modeEnd
+
+	if addBoundCells:
+		sampIdxs = np.array([0, nCells - 1], dtype=np.int32)
+	else:
+		sampIdxs = np.zeros(0, dtype=np.int32)
+	if (sampMethod == "qdeim"):
+		sampIdxs = np.union1d(sampIdxs, select_samp_cells_qdeim(fullBasis))
+	elif (sampMethod != "greedy"):
+		raise ValueError("Invalid sampMethod input: " + str(sampMethod))
+	sampIdxs = select_samp_cells_greedy(fullBasis, max(numSampCells, sampIdxs.size), samp_idxs=sampIdxs)
+	sampIdxs = add_samp_neighbors(sampIdxs, nCells, num_neighbors=numNeighbors,
+									add_bound_cells=addBoundCells)
+
+	np.save(os.path.join(outDir, "sampIdxs.npy"), sampIdxs)
+
+	print("Sample mesh generated with " + str(sampIdxs.size) + " of " + str(nCells) + " cells!")
+
+if __name__ == "__main__":
+	main()